@@ -0,0 +1,55 @@
+# -*- coding: UTF-8 -*-
+
+"""
+Import time benchmark: wall time of the first import of the package and of
+the main entry points, each measured in a fresh interpreter.
+
+Usage::
+
+    python benchmarks/import_time.py [--runs 20]
+"""
+
+from argparse import ArgumentParser
+from os import environ, pathsep
+from os.path import dirname, join, realpath
+from statistics import median
+from subprocess import check_output
+from sys import executable
+from typing import List
+
+SOURCE: str = join(dirname(dirname(realpath(__file__))), "src")
+
+STATEMENTS: tuple = (
+    "import coinbase_lib",
+    "import coinbase_lib.exchange",
+    "from coinbase_lib.exchange import OrderBook",
+    "from coinbase_lib.exchange import Products",
+    "from coinbase_lib.exchange import Client",
+)
+
+TEMPLATE: str = "from time import perf_counter; start = perf_counter(); {}; print(perf_counter() - start)"
+
+
+def measure(statement: str, runs: int) -> List[float]:
+    """Import times in milliseconds, one per fresh interpreter."""
+    env: dict = dict(environ)
+    env.update(PYTHONPATH=pathsep.join(filter(None, (SOURCE, environ.get("PYTHONPATH")))))
+
+    return [
+        float(check_output([executable, "-c", TEMPLATE.format(statement)], env=env)) * 1000
+        for _ in range(runs)
+    ]
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=20, help="interpreters started per statement")
+    args = parser.parse_args()
+
+    for statement in STATEMENTS:
+        times: List[float] = measure(statement, args.runs)
+        print(f"{statement:<45} min {min(times):8.2f} ms   median {median(times):8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
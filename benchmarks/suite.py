@@ -0,0 +1,309 @@
+# -*- coding: UTF-8 -*-
+
+"""
+Benchmark suite of the hot paths: request signing, URL building, JSON
+decoding and model building, response cache lookups, and the requests per
+second of the synchronous and asynchronous handlers against a local
+:class:`coinbase_lib.exchange.mock.MockExchange`.
+
+The results are saved as JSON (`benchmarks/results/<label>.json`) so runs
+can be compared between versions. With `--compare`, a benchmark slower than
+the baseline by more than `--threshold` is reported as a regression and the
+exit status is 1.
+
+Usage::
+
+    python benchmarks/suite.py [--only signing,url_join] [--label 1.2.0]
+                               [--compare benchmarks/results/1.1.0.json]
+"""
+
+from argparse import ArgumentParser, Namespace
+from base64 import b64encode
+from asyncio import gather, run
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from json import dump, dumps, load
+from os import makedirs
+from os.path import dirname, join, realpath
+from platform import platform, python_version
+from subprocess import CalledProcessError, DEVNULL, check_output
+from sys import exit
+from time import perf_counter
+from timeit import repeat
+from typing import Callable, Dict, List, Tuple
+
+from coinbase_lib.cache import ResponseCache
+from coinbase_lib.exchange import MockExchange, Products, aio
+from coinbase_lib.exchange.authentication import HMACBase
+from coinbase_lib.exchange.columnar import Trades
+from coinbase_lib.exchange.models import Product, Trade, build
+from coinbase_lib.helpers import URL
+from coinbase_lib.utils import loads
+
+RESULTS: str = join(dirname(realpath(__file__)), "results")
+
+KEY: str = "key"
+PASSPHRASE: str = "passphrase"
+SECRET: str = b64encode(b"0123456789abcdef" * 4).decode()
+
+METHOD: str = "POST"
+PATH: str = "/orders"
+BODY: bytes = b'{"product_id": "BTC-USD", "side": "buy", "type": "limit", "price": "43000.12", "size": "0.001"}'
+
+# a `products` response of 400 products and a `trades` response of 1000 trades:
+PRODUCTS: bytes = dumps([
+    {
+        "id": f"T{index:03d}-USD",
+        "base_currency": f"T{index:03d}",
+        "quote_currency": "USD",
+        "quote_increment": "0.01",
+        "base_increment": "0.00000001",
+        "display_name": f"T{index:03d}/USD",
+        "min_market_funds": "1",
+        "margin_enabled": False,
+        "post_only": False,
+        "limit_only": False,
+        "cancel_only": False,
+        "status": "online",
+        "status_message": "",
+        "trading_disabled": False,
+        "fx_stablecoin": False,
+        "max_slippage_percentage": "0.03000000",
+        "auction_mode": False,
+    }
+    for index in range(400)
+]).encode()
+
+TRADES: bytes = dumps([
+    {
+        "time": f"2024-01-01T00:{index // 60 % 60:02d}:{index % 60:02d}.{index % 1000:03d}Z",
+        "trade_id": 1000000 - index,
+        "price": f"{43000 + index % 100 / 100:.2f}",
+        "size": f"{0.001 * (1 + index % 50):.8f}",
+        "side": "buy" if index % 3 else "sell",
+    }
+    for index in range(1000)
+]).encode()
+
+# name -> `(function, unit, higher is better)`:
+BENCHMARKS: Dict[str, Tuple[Callable[[Namespace], float], str, bool]] = {}
+
+
+def benchmark(unit: str, higher: bool = True) -> Callable:
+    """Register a benchmark function returning its measure in `unit`."""
+    def register(function: Callable) -> Callable:
+        BENCHMARKS[function.__name__] = (function, unit, higher)
+        return function
+    return register
+
+
+def rate(call: Callable, number: int) -> float:
+    """Best of 5 runs, in calls per second."""
+    return number / min(repeat(call, number=number, repeat=5))
+
+
+@benchmark("signatures/s")
+def signing(args: Namespace) -> float:
+    signer: HMACBase = HMACBase(KEY, PASSPHRASE, SECRET)
+    return rate(lambda: signer._get_signature(METHOD, PATH, BODY), args.number)
+
+
+@benchmark("urls/s")
+def url_join(args: Namespace) -> float:
+    url: URL = URL(hostname="api.exchange.coinbase.com", endpoint="products")
+    return rate(lambda: url.join("BTC-USD", "candles"), args.number)
+
+
+@benchmark("payloads/s")
+def decode_products(args: Namespace) -> float:
+    return rate(lambda: loads(PRODUCTS), max(args.number // 1000, 10))
+
+
+@benchmark("payloads/s")
+def build_products(args: Namespace) -> float:
+    payload: list = loads(PRODUCTS)
+    return rate(lambda: build(Product, payload), max(args.number // 1000, 10))
+
+
+@benchmark("payloads/s")
+def decode_trades(args: Namespace) -> float:
+    return rate(lambda: loads(TRADES), max(args.number // 1000, 10))
+
+
+@benchmark("payloads/s")
+def build_trades(args: Namespace) -> float:
+    payload: list = loads(TRADES)
+    return rate(lambda: build(Trade, payload), max(args.number // 1000, 10))
+
+
+@benchmark("payloads/s")
+def columnar_trades(args: Namespace) -> float:
+    payload: list = loads(TRADES)
+    return rate(lambda: Trades.from_payload(payload), max(args.number // 1000, 10))
+
+
+@benchmark("us", higher=False)
+def cache_hit(args: Namespace) -> float:
+    cache: ResponseCache = ResponseCache()
+    cache.set("https://api.exchange.coinbase.com/products/BTC-USD", PRODUCTS, 3600)
+    return 1e6 / rate(lambda: cache.get("https://api.exchange.coinbase.com/products/BTC-USD"), args.number)
+
+
+@benchmark("us", higher=False)
+def cache_miss(args: Namespace) -> float:
+    cache: ResponseCache = ResponseCache()
+    return 1e6 / rate(lambda: cache.get("https://api.exchange.coinbase.com/products/BTC-USD"), args.number)
+
+
+@benchmark("requests/s")
+def sync_cached(args: Namespace) -> float:
+    """A ticker served from the response cache: the full handler path without I/O."""
+    with Products(environment=args.environment, limiter=None) as products:
+        products.get_product("BTC-USD")
+        return rate(lambda: products.get_product("BTC-USD"), max(args.number // 100, 100))
+
+
+@benchmark("requests/s")
+def sync_requests(args: Namespace) -> float:
+    """Uncached tickers sent by `--workers` threads sharing one handler."""
+    with Products(environment=args.environment, limiter=None, cache=False, pool_maxsize=args.workers) as products:
+        products.get_product_ticker("BTC-USD")
+
+        def worker(deadline: float) -> int:
+            count: int = 0
+
+            while perf_counter() < deadline:
+                products.get_product_ticker("BTC-USD")
+                count += 1
+
+            return count
+
+        start: float = perf_counter()
+
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            counts: List[int] = list(executor.map(worker, [start + args.duration] * args.workers))
+
+        return sum(counts) / (perf_counter() - start)
+
+
+@benchmark("requests/s")
+def async_requests(args: Namespace) -> float:
+    """Uncached tickers sent by `--workers` concurrent tasks sharing one handler."""
+    async def main() -> float:
+        async with aio.Products(environment=args.environment, limiter=None, cache=False, max_keepalive=args.workers) as products:
+            await products.get_product_ticker("BTC-USD")
+
+            async def worker(deadline: float) -> int:
+                count: int = 0
+
+                while perf_counter() < deadline:
+                    await products.get_product_ticker("BTC-USD")
+                    count += 1
+
+                return count
+
+            start: float = perf_counter()
+            counts: List[int] = await gather(*(worker(start + args.duration) for _ in range(args.workers)))
+            return sum(counts) / (perf_counter() - start)
+
+    return run(main())
+
+
+def git_label() -> str:
+    """The current commit, or the current time outside a git checkout."""
+    try:
+        return check_output(
+            ["git", "describe", "--always", "--dirty"], cwd=dirname(realpath(__file__)), stderr=DEVNULL
+        ).decode().strip()
+    except (CalledProcessError, OSError):
+        return datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """Print the changes against `baseline`, return the regressed benchmarks."""
+    regressions: List[str] = []
+
+    for name, result in results.items():
+        base: dict = baseline.get(name)
+
+        if base is None:
+            continue
+
+        value, previous = result.get("value"), base.get("value")
+        # positive when faster:
+        change: float = (value / previous if result.get("higher") else previous / value) - 1
+        flag: str = ""
+
+        if change < -threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+
+        print(f"{name:<18} {previous:>14,.2f} -> {value:>14,.2f} {result.get('unit'):<13} {change:+8.1%}{flag}")
+
+    return regressions
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--only", help="comma separated benchmarks to run (defaults to: all)")
+    parser.add_argument("--number", type=int, default=100000, help="calls per run of the micro benchmarks")
+    parser.add_argument("--duration", type=float, default=3, help="seconds per throughput benchmark")
+    parser.add_argument("--workers", type=int, default=8, help="threads or tasks of the throughput benchmarks")
+    parser.add_argument("--latency", type=float, default=0, help="seconds of latency added by the mock server")
+    parser.add_argument("--label", default=None, help="name of the results (defaults to: the git commit)")
+    parser.add_argument("--output", default=None, help="results file (defaults to: results/<label>.json)")
+    parser.add_argument("--compare", default=None, help="baseline results file to compare with")
+    parser.add_argument("--threshold", type=float, default=0.1, help="slowdown reported as a regression")
+    args = parser.parse_args()
+
+    names: List[str] = args.only.split(",") if args.only else list(BENCHMARKS)
+    unknown: List[str] = [name for name in names if name not in BENCHMARKS]
+
+    if len(unknown) > 0:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)} (expected: {', '.join(BENCHMARKS)})")
+
+    label: str = args.label or git_label()
+    results: Dict[str, dict] = {}
+
+    with MockExchange(latency=args.latency) as mock:
+        args.environment = mock.environment
+
+        for name in names:
+            function, unit, higher = BENCHMARKS.get(name)
+            value: float = function(args)
+            results[name] = {"value": value, "unit": unit, "higher": higher}
+            print(f"{name:<18} {value:>14,.2f} {unit}")
+
+    output: str = args.output or join(RESULTS, f"{label}.json")
+    makedirs(dirname(realpath(output)), exist_ok=True)
+
+    with open(output, "w") as file:
+        dump(
+            {
+                "label": label,
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "python": python_version(),
+                "platform": platform(),
+                "options": {name: getattr(args, name) for name in ("number", "duration", "workers", "latency")},
+                "results": results,
+            },
+            file,
+            indent=2
+        )
+
+    print(f"results saved to {output}")
+
+    if args.compare is not None:
+        with open(args.compare) as file:
+            baseline: dict = load(file)
+
+        print(f"\ncompared with {baseline.get('label')}:")
+        regressions: List[str] = compare(results, baseline.get("results", {}), args.threshold)
+
+        if len(regressions) > 0:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,29 @@
 # -*- coding: UTF-8 -*-
+
+from importlib import import_module
+
+# submodules imported on first access:
+_LAZY: tuple = (
+    "aiosessions",
+    "cache",
+    "constants",
+    "endpoints",
+    "exchange",
+    "helpers",
+    "limiter",
+    "metrics",
+    "retry",
+    "sessions",
+    "utils",
+)
+
+
+def __getattr__(name: str):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    return import_module(f".{name}", __name__)
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
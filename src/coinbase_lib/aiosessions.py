@@ -0,0 +1,259 @@
+# -*- coding: UTF-8 -*-
+
+from asyncio import sleep
+from logging import DEBUG, Logger, getLogger
+from time import perf_counter
+from typing import Collection, Tuple, Union
+
+from .cache import ResponseCache
+from .constants import HEADERS, NAME
+from .limiter import RateLimiter
+from .metrics import Metrics
+from .retry import CircuitBreaker, CircuitOpenError, RetryPolicy
+from .utils import missing_dependency
+
+try:
+    from httpx import (
+        AsyncClient,
+        AsyncHTTPTransport,
+        ConnectError,
+        ConnectTimeout,
+        Limits,
+        Request,
+        Response,
+        TransportError,
+    )
+except ImportError as error:  # optional dependency
+    raise missing_dependency("the asynchronous sessions", "httpx", "async") from error
+
+
+class AsyncBaseSession(AsyncClient):
+    """
+    Base asynchronous session.
+
+    All requests share a single connection pool, connections to the same
+    host are kept alive and reused between requests.
+
+    Failed requests are retried following a :class:`.retry.RetryPolicy`,
+    like the synchronous sessions (connection errors are retried by the
+    transport), and `GET` responses are served from a
+    :class:`.cache.ResponseCache` scoped to the session.
+    """
+
+    _log: Logger = getLogger(NAME)
+
+    def __init__(
+            self,
+            retries: int = 3,
+            timeout: int = 30,
+            max_connections: int = 100,
+            max_keepalive: int = 20,
+            debug: bool = False,
+            logger: Logger = None,
+            limiter: RateLimiter = None,
+            http2: bool = False,
+            transport: AsyncHTTPTransport = None,
+            metrics: Metrics = None,
+            backoff: float = 1,
+            breaker: CircuitBreaker = None,
+            cache: Union[bool, ResponseCache] = True
+    ):
+        """
+        :param retries: Total number of retries to allow on connection
+            errors (defaults to: 3).
+        :param timeout: How long to wait for the server to send data before
+            giving up (defaults to: 30).
+        :param max_connections: Maximum number of concurrent connections in
+            the pool (defaults to: 100).
+        :param max_keepalive: Maximum number of idle connections kept alive
+            in the pool (defaults to: 20).
+        :param debug: Set to True to log all requests/responses to/from server
+            (defaults to: `False`).
+        :param logger: The handler to be used for logging. If given, and level
+            is above `DEBUG`, all debug messages will be ignored.
+        :param limiter: Client side rate limiter used to pace requests
+            before every attempt (retries included), for the requests
+            naming their rate limit in the `throttle` extension
+            (defaults to: `None`).
+        :param http2: Multiplex the requests over HTTP/2 connections when the
+            server supports it, requires the optional `h2` package
+            (defaults to: `False`).
+        :param transport: Transport to use instead of a new one, so several
+            sessions share its connection pool (`retries`, the pool limits
+            and `http2` are then ignored).
+        :param metrics: Registry collecting the request metrics
+            (defaults to: `None`).
+        :param backoff: A backoff factor to apply between attempts after the
+            second try (defaults to: 1).
+        :param breaker: Circuit breaker failing fast while the exchange is
+            degraded (see :class:`.retry.CircuitBreaker`, defaults to: `None`).
+        :param cache: Use caching (defaults to: `True`). Either a boolean
+            or the :class:`ResponseCache` to use; the default cache is kept
+            in memory and scoped to this session.
+        """
+        if cache is True:
+            cache: ResponseCache = ResponseCache()
+
+        if cache is False:
+            cache: ResponseCache = None
+
+        if logger is not None:
+            self._log = logger
+
+        limits = Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive
+        )
+
+        if transport is None:
+            transport: AsyncHTTPTransport = AsyncHTTPTransport(
+                retries=retries,
+                limits=limits,
+                http2=http2
+            )
+
+        super(AsyncBaseSession, self).__init__(
+            headers=HEADERS,
+            timeout=timeout,
+            limits=limits,
+            transport=transport,
+        )
+
+        self.limiter: RateLimiter = limiter
+        self.cache: ResponseCache = cache
+        self.metrics: Metrics = metrics
+        self.retry: RetryPolicy = RetryPolicy(total=retries, backoff_factor=backoff, breaker=breaker)
+
+        if debug is True:
+            self.event_hooks["response"] = [self.debug]
+
+    async def send(self, request: Request, **kwargs) -> Response:
+        """Send a request, serving `GET` requests from cache."""
+        if (self.cache is None) or (request.method != "GET") or kwargs.get("stream"):
+            return await self._send(request, **kwargs)
+
+        url: str = str(request.url)
+        ttl: float = self.cache.ttl(url)
+
+        if ttl <= 0:
+            return await self._send(request, **kwargs)
+
+        response: Response = self.cache.get(url)
+
+        if self.metrics is not None:
+            self.metrics.cache(url, hit=response is not None)
+
+        if response is not None:
+            return response
+
+        response: Response = await self._send(request, **kwargs)
+
+        if response.status_code == 200:
+            self.cache.set(url, response, ttl)
+
+        return response
+
+    async def _send(self, request: Request, **kwargs) -> Response:
+        """Send a request over the network, recording its metrics if enabled."""
+        if self.metrics is None:
+            response, _, _ = await self._retry(request, **kwargs)
+            return response
+
+        start: float = perf_counter()
+
+        try:
+            response, retries, throttled = await self._retry(request, **kwargs)
+        except Exception:
+            self.metrics.observe(request.method, str(request.url), None, perf_counter() - start, len(request.content))
+            raise
+
+        self.metrics.observe(
+            request.method,
+            str(request.url),
+            response.status_code,
+            perf_counter() - start,
+            sent=len(request.content),
+            received=len(response.content) if not kwargs.get("stream") else 0,
+            retries=retries,
+            throttled=throttled
+        )
+
+        return response
+
+    async def _retry(self, request: Request, **kwargs) -> Tuple[Response, int, int]:
+        """
+        Send a request, retrying it if allowed, and get the number of
+        retries made and of `429` responses retried.
+        """
+        breaker: CircuitBreaker = self.retry.breaker
+
+        if (breaker is not None) and (not breaker.allow()):
+            raise CircuitOpenError(f"Circuit breaker open! URL: {request.url}")
+
+        throttle: Tuple[str, str] = request.extensions.get("throttle")
+
+        if (self.limiter is not None) and (throttle is not None):
+            await self.limiter.wait(*throttle)
+
+        methods: Collection[str] = self.retry.methods(request.method, request.content)
+        retries: int = 0
+        throttled: int = 0
+
+        while True:
+            try:
+                response: Response = await super(AsyncBaseSession, self).send(request, **kwargs)
+            except TransportError as error:
+                if breaker is not None:
+                    breaker.failure()
+
+                if (
+                        isinstance(error, (ConnectError, ConnectTimeout))
+                        or (request.method not in methods)
+                        or (retries >= self.retry.total)
+                        or ((breaker is not None) and breaker.open)
+                ):
+                    raise
+
+                delay: float = self.retry.backoff(retries + 1)
+            else:
+                # read like the `urllib3` history of the synchronous sessions:
+                response.extensions.update(retries=retries)
+
+                if not self.retry.failed(response.status_code):
+                    if breaker is not None:
+                        breaker.success()
+                    return response, retries, throttled
+
+                if breaker is not None:
+                    breaker.failure()
+
+                if (
+                        (response.status_code not in self.retry.status_forcelist)
+                        or (request.method not in methods)
+                        or (retries >= self.retry.total)
+                        or ((breaker is not None) and breaker.open)
+                ):
+                    return response, retries, throttled
+
+                delay: float = self.retry.backoff(retries + 1, response.headers.get("Retry-After"))
+                throttled += response.status_code == 429
+                await response.aclose()
+
+            retries += 1
+            await sleep(delay)
+
+            if (self.limiter is not None) and (throttle is not None):
+                # every retry takes a token, like the first attempt:
+                await self.limiter.wait(*throttle)
+
+    async def debug(self, response: Response):
+        if not self._log.isEnabledFor(DEBUG):
+            return
+
+        await response.aread()
+        request = response.request
+        self._log.debug(
+            f"{request.method} {request.url}\n"
+            f"< {response.status_code} {response.reason_phrase}\n"
+            f"{response.text}"
+        )
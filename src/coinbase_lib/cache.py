@@ -0,0 +1,186 @@
+# -*- coding: UTF-8 -*-
+
+from collections import OrderedDict
+from hashlib import sha1
+from os import makedirs, replace, remove, listdir
+from os.path import join, exists
+from pickle import dump, load, UnpicklingError, HIGHEST_PROTOCOL
+from tempfile import NamedTemporaryFile
+from threading import Lock
+from time import monotonic, time
+from typing import Any, Callable, Tuple, Union
+
+from .constants import CACHE, ENCODING
+from .utils import encode
+
+__all__ = ["LRUCache", "DiskCache", "ResponseCache"]
+
+
+class LRUCache:
+    """Thread-safe in-memory LRU cache with per entry expiration."""
+
+    def __init__(self, maxsize: int = CACHE.SIZE):
+        """
+        :param maxsize: Maximum number of entries kept in memory.
+        """
+        self.maxsize: int = maxsize
+
+        self._data: OrderedDict = OrderedDict()
+        self._lock: Lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> Any:
+        """Get the value stored for `key` or `None` if missing or expired."""
+        with self._lock:
+            entry: Tuple[float, Any] = self._data.get(key)
+
+            if entry is None:
+                return None
+
+            if entry[0] < monotonic():
+                del self._data[key]
+                return None
+
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: Any, ttl: float):
+        """Store `value` for `key` during `ttl` seconds."""
+        with self._lock:
+            self._data[key] = (monotonic() + ttl, value)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class DiskCache:
+    """
+    File based cache, one pickle file per entry.
+
+    Writes are atomic (write to a temporary file, then rename) so several
+    threads or processes can share the same directory without locking.
+    """
+
+    def __init__(self, path: str = CACHE.NAME):
+        """
+        :param path: The cache directory.
+        """
+        self.path: str = path
+        makedirs(path, exist_ok=True)
+
+    def _file(self, key: str) -> str:
+        return join(self.path, sha1(encode(key, encoding=ENCODING)).hexdigest())
+
+    def get(self, key: str) -> Any:
+        """Get the value stored for `key` or `None` if missing or expired."""
+        return self.entry(key)[1]
+
+    def entry(self, key: str) -> Tuple[float, Any]:
+        """
+        Get the remaining lifetime in seconds and the value stored for `key`
+        or `(0, None)` if missing or expired.
+        """
+        filename: str = self._file(key)
+
+        try:
+            with open(filename, "rb") as handler:
+                expires, value = load(handler)
+        except (OSError, EOFError, UnpicklingError):
+            return 0, None
+
+        remaining: float = expires - time()
+
+        if remaining <= 0:
+            self._remove(filename)
+            return 0, None
+
+        return remaining, value
+
+    def set(self, key: str, value: Any, ttl: float):
+        """Store `value` for `key` during `ttl` seconds."""
+        with NamedTemporaryFile(dir=self.path, delete=False) as handler:
+            dump((time() + ttl, value), handler, protocol=HIGHEST_PROTOCOL)
+        replace(handler.name, self._file(key))
+
+    @staticmethod
+    def _remove(filename: str):
+        try:
+            remove(filename)
+        except OSError:
+            pass
+
+    def clear(self):
+        if exists(self.path):
+            for name in listdir(self.path):
+                self._remove(join(self.path, name))
+
+
+class ResponseCache:
+    """
+    Two layers response cache scoped to a session: an in-memory LRU in
+    front of an optional disk cache.
+
+    The lifetime of every entry is decided by `ttl`, either a fixed number
+    of seconds or a callable receiving the request URL, so each endpoint
+    can have its own policy. Entries with a lifetime of `0` are never
+    stored.
+    """
+
+    def __init__(
+            self,
+            ttl: Union[float, Callable[[str], float]] = CACHE.EXPIRE,
+            maxsize: int = CACHE.SIZE,
+            path: str = None
+    ):
+        """
+        :param ttl: Lifetime of the entries in seconds or a callable
+            returning it for a given URL (defaults to: `CACHE.EXPIRE`).
+        :param maxsize: Maximum number of entries kept in memory
+            (defaults to: `CACHE.SIZE`).
+        :param path: Directory of the disk layer, if any
+            (defaults to: `None`).
+        """
+        self._ttl = ttl
+        self.memory: LRUCache = LRUCache(maxsize)
+        self.disk: DiskCache = DiskCache(path) if path is not None else None
+
+    def __reduce__(self):
+        # the memory layer is not copied, each process starts empty:
+        path: str = self.disk.path if self.disk is not None else None
+        return self.__class__, (self._ttl, self.memory.maxsize, path)
+
+    def ttl(self, url: str) -> float:
+        """Lifetime in seconds of the cached responses for `url`."""
+        if callable(self._ttl):
+            return self._ttl(url)
+        return self._ttl
+
+    def get(self, key: str) -> Any:
+        value: Any = self.memory.get(key)
+
+        if (value is None) and (self.disk is not None):
+            remaining, value = self.disk.entry(key)
+
+            if value is not None:
+                self.memory.set(key, value, remaining)
+
+        return value
+
+    def set(self, key: str, value: Any, ttl: float):
+        self.memory.set(key, value, ttl)
+
+        if self.disk is not None:
+            self.disk.set(key, value, ttl)
+
+    def clear(self):
+        self.memory.clear()
+
+        if self.disk is not None:
+            self.disk.clear()
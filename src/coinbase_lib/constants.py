@@ -1,5 +1,6 @@
 # -*- coding: UTF-8 -*-
 
+from os import getcwd
 from os.path import dirname, realpath, join
 from sys import modules
 from types import ModuleType
@@ -10,8 +11,9 @@ NAME: str = "coinbase"
 # main module:
 MODULE: ModuleType = modules.get("__main__")
 
-# root directory:
-ROOT: str = dirname(realpath(MODULE.__file__))
+# root directory (the working directory when there is no main script,
+# i.e. in a REPL or a process pool worker):
+ROOT: str = dirname(realpath(MODULE.__file__)) if getattr(MODULE, "__file__", None) else getcwd()
 
 # default encoding:
 ENCODING: str = "UTF-8"
@@ -29,6 +31,31 @@ HEADERS: dict = {
 
 class CACHE:
     """Cache settings."""
-    NAME: str = join(ROOT, "cache", NAME),
-    BACKEND: str = "sqlite",
+    NAME: str = join(ROOT, "cache", NAME)
+    SIZE: int = 1024
     EXPIRE: int = 180
+    # historical market data store directory:
+    STORE: str = join(ROOT, "cache", "store")
+
+
+class RETRY:
+    """Retry policy settings."""
+    # statuses retried (rate limited and server side errors):
+    STATUS: tuple = (429, 500, 502, 503, 504)
+    # idempotent methods, always safe to retry (`DELETE` cancels orders):
+    METHODS: tuple = ("GET", "HEAD", "OPTIONS", "DELETE")
+    # random delay added to every backoff, in seconds:
+    JITTER: float = 1.0
+    # longest backoff, in seconds:
+    BACKOFF_MAX: float = 30
+    # consecutive failures opening the circuit breaker:
+    THRESHOLD: int = 5
+    # seconds the circuit stays open before a trial request:
+    RESET: float = 30
+
+
+class METRICS:
+    """Metrics settings."""
+    PREFIX: str = NAME
+    # latency histogram bucket upper bounds, in seconds:
+    BUCKETS: tuple = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
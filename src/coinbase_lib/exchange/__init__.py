@@ -1 +1,68 @@
 # -*- coding: UTF-8 -*-
+
+"""
+Exchange/Pro API.
+
+The public names are imported from their submodule on first access, so
+importing the package doesn't load `requests` (or `httpx`, `websockets`,
+NumPy) until they are needed.
+"""
+
+from importlib import import_module
+
+# public name -> submodule defining it:
+_LAZY: dict = {
+    **{
+        name: ".endpoints" for name in (
+            "Endpoint",
+            "AuthEndpoint",
+            "Time",
+            "Accounts",
+            "AddressBook",
+            "CoinbaseAccounts",
+            "Conversions",
+            "Currencies",
+            "Deposits",
+            "PaymentMethods",
+            "Transfers",
+            "Withdrawals",
+            "Fees",
+            "Fills",
+            "Orders",
+            "Oracle",
+            "Products",
+            "Profiles",
+            "Reports",
+            "Users",
+            "WrappedAssets",
+        )
+    },
+    "Client": ".client",
+    "ClockSync": ".clock",
+    "BatchResult": ".batch",
+    "OrderBook": ".orderbook",
+    "Feed": ".websocket",
+    "MarketStore": ".store",
+    "TradeDownloader": ".trades",
+    "ReferenceData": ".reference",
+    "OrderValidator": ".validation",
+    "OrderError": ".validation",
+    "MockExchange": ".mock",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name: str):
+    module: str = _LAZY.get(name)
+
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,698 @@
+# -*- coding: UTF-8 -*-
+
+"""
+Asynchronous (`asyncio`) counterparts of the Exchange/Pro API endpoints.
+
+Every handler exposes the same methods as its synchronous twin from
+:mod:`.endpoints`, but they must be awaited::
+
+    async with Products() as products:
+        tickers = await asyncio.gather(
+            *(products.get_product_ticker(product_id) for product_id in ids)
+        )
+
+The `iter_*` methods return asynchronous generators (`async for`). Error
+responses raise `httpx.HTTPStatusError`, with the API error message like
+the `requests.HTTPError` of the synchronous handlers.
+
+Requires the optional `httpx` package (the `async` extra).
+"""
+
+from datetime import datetime
+from json import JSONDecodeError
+from time import monotonic, time
+from logging import Logger
+from sys import modules
+from typing import TYPE_CHECKING, Dict, List, AsyncIterator, Tuple, Union
+
+from . import client, endpoints
+from .batch import BatchResult, arun_batch
+from .candles import CandleBackfill
+from .clock import ClockSync
+from .authentication import HMACBase
+from .constants import ENVIRONMENT
+from .inflight import ambiguous
+from .models import Model, Order, build
+from .trades import TradeDownloader
+from ..aiosessions import AsyncBaseSession
+from ..cache import ResponseCache
+from ..constants import ENCODING
+from ..limiter import RateLimiter
+from ..metrics import Metrics
+from ..retry import CircuitBreaker
+from ..utils import decode, to_posix, loads, missing_dependency
+
+try:
+    from httpx import AsyncHTTPTransport, Auth, HTTPStatusError, Limits, Request, Response
+except ImportError as error:  # optional dependency
+    raise missing_dependency("the asynchronous handlers", "httpx", "async") from error
+
+if TYPE_CHECKING:
+    from .columnar import Candles, Trades, Snapshot
+    from .store import MarketStore
+
+__all__ = [
+    "AsyncSessionAuth",
+    "AsyncAuthSession",
+    "AsyncExchange",
+    "AsyncEndpoint",
+    "AsyncAuthEndpoint",
+    "Time",
+    "Accounts",
+    "AddressBook",
+    "CoinbaseAccounts",
+    "Conversions",
+    "Currencies",
+    "Deposits",
+    "PaymentMethods",
+    "Transfers",
+    "Withdrawals",
+    "Fees",
+    "Fills",
+    "Orders",
+    "Oracle",
+    "Products",
+    "Profiles",
+    "Reports",
+    "Users",
+    "WrappedAssets",
+    "Client",
+]
+
+
+class AsyncSessionAuth(Auth, HMACBase):
+    """Asynchronous session HMAC authentication handler."""
+
+    def auth_flow(self, request: Request):
+        signature = self._get_signature(
+            method=request.method,
+            path=decode(request.url.raw_path, encoding=ENCODING),
+            body=request.content or None
+        )
+        request.headers.update(signature)
+        yield request
+
+
+class AsyncAuthSession(AsyncBaseSession):
+    """Coinbase asynchronous authenticated session."""
+
+    def __init__(self, key: str, passphrase: str, secret: str, **kwargs):
+        """
+        :param key: The API key.
+        :param passphrase: The API passphrase.
+        :param secret: The API secret.
+        :param kwargs: Additional keyword arguments.
+        """
+        super(AsyncAuthSession, self).__init__(**kwargs)
+        self.auth = AsyncSessionAuth(key, passphrase, secret)
+
+
+class AsyncExchange(endpoints.Exchange):
+    """Exchange/PRO API asynchronous base endpoint."""
+
+    def __init__(self, environment: str, models: bool = False):
+        """
+        :param environment: The API environment (`production` or `sandbox`).
+        :param models: Return typed response models instead of responses.
+        """
+        endpoints.Exchange.__init__(self, environment=environment, models=models)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        """Closes the connection pool of the session."""
+        await self._session.aclose()
+
+    async def _request(self, method, *args, parser=None, model: type = None, **kwargs) -> Response:
+        url: str = self._url.join(*args)
+        kwargs.update(url=url)
+
+        if self._session.limiter is not None:
+            # taken by the session on a cache miss only:
+            kwargs.update(extensions={"throttle": self._throttle_key(kwargs)})
+
+        response: Response = await method(**kwargs)
+
+        if response.is_error:
+            self._raise_for_status(response)
+
+        if parser is not None:
+            return parser(loads(response.content))
+
+        if self._models and (model is not None):
+            return build(model, loads(response.content))
+
+        return response
+
+    async def _paginate(self, *args, field: str, params: dict, model: type = None) -> AsyncIterator[Union[Dict, Model]]:
+        """
+        Asynchronous version of :meth:`.endpoints.Exchange._paginate`.
+        """
+        params: dict = dict(params)
+        watermark = params.pop("before", None)
+
+        if watermark is not None:
+            watermark: float = to_posix(watermark)
+
+        while True:
+            response: Response = await self._get(*args, params=params)
+            page: List[Dict] = loads(response.content)
+
+            for item in page:
+                if (watermark is not None) and (to_posix(item.get(field)) <= watermark):
+                    return
+                yield model(item) if self._models and (model is not None) else item
+
+            cursor: str = response.headers.get("cb-after")
+
+            if (len(page) == 0) or (cursor is None) or (cursor == params.get("after")):
+                return
+
+            params.update(after=cursor)
+
+    def _raise_for_status(self, response: Response):
+        """
+        Raise the `httpx` error of an error response, with the API error
+        message (like `Response.raise_for_status()`).
+
+        :raises HTTPStatusError: Always.
+        """
+        try:
+            error: dict = response.json()
+        except JSONDecodeError:
+            error: dict = {}
+
+        status: int = response.status_code
+        message: str = error.get("message") or response.reason_phrase or "Unknown"
+        side: str = self._error_side(status)
+
+        raise HTTPStatusError(
+            f"{status} {side} Error: {message.rstrip('.?!')}! URL: {response.url}",
+            request=response.request,
+            response=response
+        )
+
+
+class AsyncEndpoint(AsyncExchange):
+    """Exchange/PRO API asynchronous endpoint."""
+
+    _rate_limit: str = "public"
+
+    def __init__(self, **kwargs):
+        """
+        **Parameters**:
+            - ``environment``: The API environment: `production` or `sandbox`
+              (defaults to: `production`);
+            - ``retries``: Total number of retries to allow (defaults to: 3).
+              Only the requests safe to send twice are retried: `GET` and
+              `DELETE` ones, and `POST` ones with a `client_oid`;
+            - ``backoff``: A backoff factor to apply between attempts after the
+              second try (defaults to: 1);
+            - ``timeout``: How long to wait for the server to send data before
+              giving up (defaults to: 30);
+            - ``cache``: Use caching (defaults to: `True`). `GET` responses
+              are kept in memory, per session, for the lifetime set in
+              `CACHE_TTL` for each endpoint. A :class:`ResponseCache` can be
+              given instead (i.e. to add a disk layer);
+            - ``max_connections``: Maximum number of concurrent connections
+              (defaults to: 100);
+            - ``max_keepalive``: Maximum number of idle connections kept alive
+              (defaults to: 20);
+            - ``http2``: bool - Multiplex the requests over HTTP/2 when the
+              server supports it, requires the optional `h2` package
+              (defaults to: `False`);
+            - ``debug``: bool - Set to True to log all requests/responses
+              to/from server (defaults to: `False`);
+            - ``logger``: Logger - The handler to be used for logging.
+              If given, and level is above `DEBUG`, all debug messages will be
+              ignored.
+            - ``limiter``: RateLimiter - Client side rate limiter pacing the
+              requests to the documented limits (defaults to: a process wide
+              shared limiter, `None` to disable).
+            - ``metrics``: Metrics - Registry collecting the latency, size,
+              retries, throttling and cache metrics of the requests
+              (see :mod:`coinbase_lib.metrics`, defaults to: `None`).
+            - ``breaker``: CircuitBreaker - Circuit breaker failing fast while
+              the exchange is degraded, can be shared by several handlers
+              (see :class:`coinbase_lib.retry.CircuitBreaker`, defaults to:
+              `None`).
+            - ``models``: bool - Decode the responses once and return typed
+              models (see :mod:`.models`) instead of `Response` objects
+              (defaults to: `False`).
+            - ``session``: AsyncBaseSession - Existing session to send the requests
+              with, i.e. one shared by a :class:`Client` (the session
+              options above are then ignored).
+
+        Handlers are picklable like the synchronous ones, the session is
+        rebuilt in the receiving process.
+        """
+        config: dict = dict(kwargs)
+        kwargs.setdefault("limiter", endpoints.LIMITER)
+        session: AsyncBaseSession = kwargs.pop("session", None)
+
+        if kwargs.get("cache", True) is True:
+            kwargs.update(cache=ResponseCache(ttl=endpoints.cache_ttl))
+
+        super(AsyncEndpoint, self).__init__(
+            environment=kwargs.pop("environment", ENVIRONMENT),
+            models=kwargs.pop("models", False)
+        )
+        self._session = session if session is not None else AsyncBaseSession(**kwargs)
+
+        if session is None:
+            self._config = (), config
+
+
+class AsyncAuthEndpoint(AsyncExchange):
+    """Exchange/Pro API asynchronous authenticated endpoint."""
+
+    _rate_limit: str = "private"
+
+    def __init__(self, key: str, passphrase: str, secret: str, **kwargs):
+        """
+        **Parameters**:
+            - ``key``: The API key;
+            - ``passphrase``: The API passphrase;
+            - ``secret``: The API secret;
+            - ``environment``: The API environment: `production` or `sandbox`
+              (defaults to: `production`);
+            - ``retries``: Total number of retries to allow (defaults to: 3).
+              Only the requests safe to send twice are retried: `GET` and
+              `DELETE` ones, and `POST` ones with a `client_oid`;
+            - ``backoff``: A backoff factor to apply between attempts after the
+              second try (defaults to: 1);
+            - ``timeout``: How long to wait for the server to send data before
+              giving up (defaults to: 30);
+            - ``cache``: Use caching (defaults to: `True`). `GET` responses
+              are kept in memory, per session, for the lifetime set in
+              `CACHE_TTL` for each endpoint. A :class:`ResponseCache` can be
+              given instead (i.e. to add a disk layer);
+            - ``max_connections``: Maximum number of concurrent connections
+              (defaults to: 100);
+            - ``max_keepalive``: Maximum number of idle connections kept alive
+              (defaults to: 20);
+            - ``http2``: bool - Multiplex the requests over HTTP/2 when the
+              server supports it, requires the optional `h2` package
+              (defaults to: `False`);
+            - ``debug``: bool - Set to True to log all requests/responses
+              to/from server (defaults to: `False`);
+            - ``logger``: Logger - The handler to be used for logging.
+              If given, and level is above `DEBUG`, all debug messages will be
+              ignored.
+            - ``limiter``: RateLimiter - Client side rate limiter pacing the
+              requests to the documented limits (defaults to: a process wide
+              shared limiter, `None` to disable).
+            - ``metrics``: Metrics - Registry collecting the latency, size,
+              retries, throttling and cache metrics of the requests
+              (see :mod:`coinbase_lib.metrics`, defaults to: `None`).
+            - ``breaker``: CircuitBreaker - Circuit breaker failing fast while
+              the exchange is degraded, can be shared by several handlers
+              (see :class:`coinbase_lib.retry.CircuitBreaker`, defaults to:
+              `None`).
+            - ``models``: bool - Decode the responses once and return typed
+              models (see :mod:`.models`) instead of `Response` objects
+              (defaults to: `False`).
+            - ``clock``: ClockSync - Server clock tracker keeping the request
+              signing clock in sync (see :class:`.clock.ClockSync`).
+            - ``session``: AsyncAuthSession - Existing session to send the requests
+              with, i.e. one shared by a :class:`Client` (the session
+              options above are then ignored).
+
+        Handlers are picklable like the synchronous ones, the session is
+        rebuilt in the receiving process (without the `clock`).
+        """
+        config: dict = dict(kwargs)
+        config.pop("clock", None)
+        kwargs.setdefault("limiter", endpoints.LIMITER)
+        clock = kwargs.pop("clock", None)
+        session: AsyncAuthSession = kwargs.pop("session", None)
+
+        if kwargs.get("cache", True) is True:
+            kwargs.update(cache=ResponseCache(ttl=endpoints.cache_ttl))
+
+        super(AsyncAuthEndpoint, self).__init__(
+            environment=kwargs.pop("environment", ENVIRONMENT),
+            models=kwargs.pop("models", False)
+        )
+
+        if session is None:
+            session: AsyncAuthSession = AsyncAuthSession(key, passphrase, secret, **kwargs)
+            self._config = (key, passphrase, secret), config
+
+        self._session = session
+
+        if clock is not None:
+            clock.add(self)
+
+
+class Time(AsyncEndpoint, endpoints.Time):
+    """Asynchronous `time` endpoint of Exchange/Pro API."""
+
+    async def sample_clock(self) -> Tuple[float, float, float]:
+        start: float = monotonic()
+        response: Response = await self._get()
+        end: float = monotonic()
+
+        return float(loads(response.content).get("epoch")), (start + end) / 2, end - start
+
+    async def sync_clock(self, *handlers: endpoints.AuthEndpoint) -> float:
+        epoch, at, _ = await self.sample_clock()
+        return self._sync(epoch, at, handlers)
+
+    sample_clock.__doc__ = endpoints.Time.sample_clock.__doc__
+    sync_clock.__doc__ = endpoints.Time.sync_clock.__doc__
+
+
+class Accounts(AsyncAuthEndpoint, endpoints.Accounts):
+    """Asynchronous `accounts` endpoint of the Exchange/Pro API."""
+
+
+class AddressBook(AsyncAuthEndpoint, endpoints.AddressBook):
+    """Asynchronous `address-book` endpoint of the Exchange/Pro API."""
+
+
+class CoinbaseAccounts(AsyncAuthEndpoint, endpoints.CoinbaseAccounts):
+    """Asynchronous `coinbase-accounts` endpoint of the Exchange/Pro API."""
+
+
+class Conversions(AsyncAuthEndpoint, endpoints.Conversions):
+    """Asynchronous `conversions` endpoint of the Exchange/Pro API."""
+
+
+class Currencies(AsyncEndpoint, endpoints.Currencies):
+    """Asynchronous `currencies` endpoint of the Exchange/Pro API."""
+
+
+class Deposits(AsyncAuthEndpoint, endpoints.Deposits):
+    """Asynchronous `deposits` endpoint of the Exchange/Pro API."""
+
+
+class PaymentMethods(AsyncAuthEndpoint, endpoints.PaymentMethods):
+    """Asynchronous `payment-methods` endpoint of the Exchange/Pro API."""
+
+
+class Transfers(AsyncAuthEndpoint, endpoints.Transfers):
+    """Asynchronous `transfers` endpoint of the Exchange/Pro API."""
+
+
+class Withdrawals(AsyncAuthEndpoint, endpoints.Withdrawals):
+    """Asynchronous `withdrawals` endpoint of the Exchange/Pro API."""
+
+
+class Fees(AsyncAuthEndpoint, endpoints.Fees):
+    """Asynchronous `fees` endpoint of the Exchange/Pro API."""
+
+
+class Fills(AsyncAuthEndpoint, endpoints.Fills):
+    """Asynchronous `fills` endpoint of the Exchange/Pro API."""
+
+
+class Orders(AsyncAuthEndpoint, endpoints.Orders):
+    """Asynchronous `orders` endpoint of the Exchange/Pro API."""
+
+    async def create_order(self, **kwargs) -> Union[Response, Model]:
+        if self.validator is not None:
+            kwargs: dict = self.validator.validate(kwargs)
+
+        client_oid: str = self._track(kwargs)
+
+        try:
+            order = await self._post(json=kwargs, model=Order)
+        except Exception as error:
+            if not ambiguous(error):
+                self.in_flight.discard(client_oid)
+                raise
+            return await self.resolve_order(client_oid, error)
+
+        self.in_flight.discard(client_oid)
+        return order
+
+    async def resolve_order(self, client_oid: str, error: Exception = None) -> Union[Response, Model]:
+        try:
+            order = await self.get_order(f"client:{client_oid}")
+        except Exception as lookup:
+            if self._not_found(lookup):
+                self.in_flight.discard(client_oid)
+
+            if error is None:
+                raise
+
+            raise error from lookup
+
+        self.in_flight.discard(client_oid)
+        return order
+
+    async def create_orders(self, batch: List[dict], max_workers: int = 10) -> List[BatchResult]:
+        return await arun_batch(lambda order: self.create_order(**order), batch, max_workers)
+
+    async def cancel_orders(self, order_ids: List[str], max_workers: int = 10, **kwargs) -> List[BatchResult]:
+        return await arun_batch(lambda order_id: self.del_order(order_id, **kwargs), order_ids, max_workers)
+
+    create_order.__doc__ = endpoints.Orders.create_order.__doc__
+    resolve_order.__doc__ = endpoints.Orders.resolve_order.__doc__
+    create_orders.__doc__ = endpoints.Orders.create_orders.__doc__
+    cancel_orders.__doc__ = endpoints.Orders.cancel_orders.__doc__
+
+
+class Oracle(AsyncAuthEndpoint, endpoints.Oracle):
+    """Asynchronous `oracle` endpoint of the Exchange/Pro API."""
+
+
+class Products(AsyncEndpoint, endpoints.Products):
+    """Asynchronous `products` endpoint of the Exchange/Pro API."""
+
+    async def backfill_candles(
+            self,
+            product_id: str,
+            granularity: int,
+            start: Union[datetime, int, float, str],
+            end: Union[datetime, int, float, str],
+            max_workers: int = 4,
+            checkpoint: str = None,
+            columnar: bool = False,
+            store: "MarketStore" = None
+    ) -> Union[List[List], "Candles"]:
+        backfill = CandleBackfill(
+            self,
+            product_id=product_id,
+            granularity=granularity,
+            max_workers=max_workers,
+            checkpoint=checkpoint,
+            store=store
+        )
+        candles: List[List] = await backfill.arun(start, end)
+
+        if columnar is True:
+            from .columnar import Candles
+            return Candles.from_payload(candles)
+
+        return candles
+
+    backfill_candles.__doc__ = endpoints.Products.backfill_candles.__doc__
+
+    async def backfill_trades(
+            self,
+            product_id: str,
+            first_id: int,
+            last_id: int,
+            max_workers: int = 4,
+            store: "MarketStore" = None
+    ) -> "Trades":
+        from .columnar import Trades
+
+        downloader: TradeDownloader = self.download_trades(
+            product_id, first_id, last_id, forward=True, max_workers=max_workers
+        )
+
+        if store is None:
+            return Trades.from_payload(
+                [trade async for batch in downloader.abatches(columnar=False) for trade in batch]
+            )
+
+        await downloader.ato_store(store)
+        return store.trades_by_id(product_id, first_id, last_id)
+
+    backfill_trades.__doc__ = endpoints.Products.backfill_trades.__doc__
+
+    async def snapshot(self, kind: str = "ticker", product_ids: List[str] = None, max_workers: int = 10) -> "Snapshot":
+        from .columnar import Snapshot
+
+        if kind not in Snapshot.KINDS:
+            raise ValueError(f"Unknown snapshot kind: {kind!r}! Expected one of: {', '.join(Snapshot.KINDS)}.")
+
+        if product_ids is None:
+            product_ids: List[str] = self._product_ids(await self._get(parser=list))
+
+        timestamp: float = time()
+        results: List[BatchResult] = await arun_batch(
+            lambda product_id: self._get(product_id, kind, parser=dict),
+            product_ids,
+            max_workers
+        )
+        return Snapshot.from_results(kind, results, timestamp)
+
+    snapshot.__doc__ = endpoints.Products.snapshot.__doc__
+
+
+class Profiles(AsyncAuthEndpoint, endpoints.Profiles):
+    """Asynchronous `profiles` endpoint of the Exchange/Pro API."""
+
+
+class Reports(AsyncAuthEndpoint, endpoints.Reports):
+    """Asynchronous `reports` endpoint of the Exchange/Pro API."""
+
+
+class Users(AsyncAuthEndpoint, endpoints.Users):
+    """Asynchronous `users` endpoint of the Exchange/Pro API."""
+
+
+class WrappedAssets(AsyncEndpoint, endpoints.WrappedAssets):
+    """Asynchronous `wrapped-assets` endpoint of the Exchange/Pro API."""
+
+
+class Client(client.Client):
+    """
+    Asynchronous Exchange/Pro API client.
+
+    A single connection pool is shared by every endpoint group, exposed as
+    attributes like in :class:`.client.Client`. With `http2` the requests
+    are multiplexed over a few HTTP/2 connections when the server supports
+    it.
+    """
+
+    _endpoints = modules[__name__]
+
+    def __init__(
+            self,
+            key: str = None,
+            passphrase: str = None,
+            secret: str = None,
+            environment: str = ENVIRONMENT,
+            max_connections: int = 100,
+            max_keepalive: int = 20,
+            http2: bool = False,
+            retries: int = 3,
+            backoff: float = 1,
+            timeout: int = 30,
+            cache: Union[bool, ResponseCache] = True,
+            debug: bool = False,
+            logger: Logger = None,
+            limiter: RateLimiter = endpoints.LIMITER,
+            models: bool = False,
+            clock: ClockSync = None,
+            metrics: Metrics = None,
+            breaker: CircuitBreaker = None
+    ):
+        """
+        :param key: The API key (for the authenticated endpoints).
+        :param passphrase: The API passphrase.
+        :param secret: The API secret.
+        :param environment: The API environment: `production` or `sandbox`
+            (defaults to: `production`).
+        :param max_connections: Maximum number of concurrent connections in
+            the pool (defaults to: 100).
+        :param max_keepalive: Maximum number of idle connections kept alive
+            in the pool (defaults to: 20).
+        :param http2: Multiplex the requests over HTTP/2 when the server
+            supports it, requires the optional `h2` package
+            (defaults to: `False`).
+        :param retries: Total number of retries to allow (defaults to: 3).
+        :param backoff: A backoff factor to apply between attempts after the
+            second try (defaults to: 1).
+        :param timeout: How long to wait for the server to send data before
+            giving up (defaults to: 30).
+        :param cache: Use caching (defaults to: `True`), the response cache
+            is shared by all the endpoint groups.
+        :param debug: Set to True to log all requests/responses to/from server
+            (defaults to: `False`).
+        :param logger: The handler to be used for logging.
+        :param limiter: Client side rate limiter (defaults to: the process
+            wide shared limiter, `None` to disable).
+        :param models: Return typed response models instead of `Response`
+            objects (defaults to: `False`).
+        :param clock: Server clock tracker keeping the request signing clock
+            in sync (see :class:`.clock.ClockSync`).
+        :param metrics: Registry collecting the request metrics of all the
+            endpoint groups (defaults to: `None`).
+        :param breaker: Circuit breaker shared by all the endpoint groups
+            (see :class:`coinbase_lib.retry.CircuitBreaker`, defaults to: `None`).
+        """
+        self._config: dict = dict(
+            key=key,
+            passphrase=passphrase,
+            secret=secret,
+            environment=environment,
+            max_connections=max_connections,
+            max_keepalive=max_keepalive,
+            http2=http2,
+            retries=retries,
+            backoff=backoff,
+            timeout=timeout,
+            cache=cache,
+            debug=debug,
+            logger=logger,
+            limiter=limiter,
+            models=models,
+            metrics=metrics,
+            breaker=breaker
+        )
+        if cache is True:
+            cache: ResponseCache = ResponseCache(ttl=endpoints.cache_ttl)
+
+        transport: AsyncHTTPTransport = AsyncHTTPTransport(
+            retries=retries,
+            limits=Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive),
+            http2=http2
+        )
+        options: dict = dict(
+            retries=retries,
+            backoff=backoff,
+            breaker=breaker,
+            timeout=timeout,
+            cache=cache,
+            debug=debug,
+            logger=logger,
+            limiter=limiter,
+            transport=transport,
+            metrics=metrics
+        )
+
+        self._sessions: list = [AsyncBaseSession(**options)]
+
+        for name, handler in self._public:
+            setattr(self, name, getattr(self._endpoints, handler)(
+                environment=environment,
+                models=models,
+                session=self._sessions[0]
+            ))
+
+        if key is None:
+            return
+
+        self._sessions.append(AsyncAuthSession(key, passphrase, secret, **options))
+
+        for name, handler in self._private:
+            setattr(self, name, getattr(self._endpoints, handler)(
+                key, passphrase, secret,
+                environment=environment,
+                models=models,
+                session=self._sessions[1]
+            ))
+
+        if clock is not None:
+            clock.add(self._sessions[1].auth)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        """Closes the connection pool."""
+        for session in self._sessions:
+            await session.aclose()
@@ -4,45 +4,28 @@ from abc import ABC
 from base64 import b64encode, b64decode
 from hashlib import sha256
 from hmac import HMAC
-from typing import Union
+from time import monotonic, time
+from typing import Optional, Union
 
 from requests.auth import AuthBase
 from requests.models import PreparedRequest
 
 from ..constants import ENCODING
-from ..utils import encode, decode, get_posix
+from ..utils import encode, decode
 
 __all__ = ["WSAuth", "SessionAuth"]
 
 
 class HMACBase(ABC):
-    """Requests signing handler."""
+    """
+    Requests signing handler.
 
-    @staticmethod
-    def _pre_hash(timestamp: float, method: str, path: str, body: str = None) -> bytes:
-        """
-        Create the pre-hash string by concatenating the timestamp with
-        the request method, path and body if not None.
-        """
-        if body is not None:
-            body: str = decode(body, encoding=ENCODING)
-            return encode(
-                f"{timestamp}{method.upper()}{path}{body}",
-                encoding=ENCODING
-            )
-        return encode(
-            f"{timestamp}{method.upper()}{path}",
-            encoding=ENCODING
-        )
-
-    @staticmethod
-    def _sign(key: bytes, message: bytes) -> bytes:
-        """
-        Create a sha256 HMAC and sign the required `message` using the
-        API base64 decoded secret as `key`.
-        """
-        hmac = HMAC(key=key, msg=message, digestmod=sha256)
-        return b64encode(hmac.digest())
+    The HMAC is keyed once with the decoded secret and copied for every
+    request. Timestamps are read from the local wall clock until
+    :meth:`sync` aligns them with the server time, then from the monotonic
+    clock plus the server offset, instead of building a `datetime` each
+    time.
+    """
 
     @staticmethod
     def _headers(key: str, signature: bytes, timestamp: str, passphrase: str) -> dict:
@@ -63,20 +46,42 @@ class HMACBase(ABC):
 
         self.__key = key
         self.__passphrase = passphrase
-        self.__secret = b64decode(secret)
+        self.__hmac = HMAC(key=b64decode(secret), digestmod=sha256)
+
+        # POSIX time = monotonic clock + offset, once synced; the wall clock
+        # before, since the monotonic one stops during suspend and ignores
+        # the clock adjustments:
+        self.offset: Optional[float] = None
+
+    def sync(self, epoch: float, at: float = None):
+        """
+        Align the signing clock with the server time.
+
+        :param epoch: Server POSIX timestamp (i.e. `Time.get_time()` epoch).
+        :param at: Monotonic clock reading matching `epoch`, usually the
+            middle of the request round trip (defaults to: now).
+        """
+        self.offset = float(epoch) - (monotonic() if at is None else at)
+
+    def timestamp(self) -> float:
+        """Current POSIX timestamp of the signing clock."""
+        if self.offset is None:
+            return time()
+        return monotonic() + self.offset
 
     def _get_signature(self, method: str, path: str, body: Union[bytes, str] = None) -> dict:
-        timestamp = get_posix()
-        message = self._pre_hash(
-            timestamp=timestamp,
-            method=method.upper(),
-            path=path,
-            body=body
-        )
+        timestamp: str = f"{self.timestamp():.3f}"
+
+        hmac: HMAC = self.__hmac.copy()
+        hmac.update(encode(f"{timestamp}{method.upper()}{path}", encoding=ENCODING))
+
+        if body:
+            hmac.update(encode(body, encoding=ENCODING))
+
         return self._headers(
             key=self.__key,
-            signature=self._sign(self.__secret, message),
-            timestamp=str(timestamp),
+            signature=b64encode(hmac.digest()),
+            timestamp=timestamp,
             passphrase=self.__passphrase,
         )
 
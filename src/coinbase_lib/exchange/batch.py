@@ -0,0 +1,70 @@
+# -*- coding: UTF-8 -*-
+
+from asyncio import Semaphore, gather
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List
+
+__all__ = ["BatchResult", "run_batch", "arun_batch"]
+
+
+class BatchResult:
+    """
+    Outcome of a single request of a batch: the `request` item it was made
+    for and either its `result` or the `error` raised while sending it.
+    """
+
+    __slots__ = ("request", "result", "error")
+
+    def __init__(self, request: Any, result: Any = None, error: Exception = None):
+        self.request = request
+        self.result = result
+        self.error: Exception = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self) -> str:
+        outcome: str = f"result={self.result!r}" if self.ok else f"error={self.error!r}"
+        return f"{self.__class__.__name__}(request={self.request!r}, {outcome})"
+
+
+def _call(call: Callable, item: Any) -> BatchResult:
+    try:
+        return BatchResult(item, result=call(item))
+    except Exception as error:
+        return BatchResult(item, error=error)
+
+
+def run_batch(call: Callable, items: Iterable, max_workers: int) -> List[BatchResult]:
+    """
+    Call `call` for every item using a pool of `max_workers` threads.
+
+    Errors are captured in the results instead of being raised, so one
+    failed request doesn't abort the others. The results are returned in
+    the order of `items`.
+    """
+    items: list = list(items)
+
+    if len(items) == 0:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(lambda item: _call(call, item), items))
+
+
+async def arun_batch(call: Callable, items: Iterable, max_workers: int) -> List[BatchResult]:
+    """
+    Asynchronous version of :func:`run_batch`, `call` returns an awaitable
+    and at most `max_workers` of them are awaited at the same time.
+    """
+    semaphore: Semaphore = Semaphore(max_workers)
+
+    async def _acall(item: Any) -> BatchResult:
+        async with semaphore:
+            try:
+                return BatchResult(item, result=await call(item))
+            except Exception as error:
+                return BatchResult(item, error=error)
+
+    return list(await gather(*(_acall(item) for item in items)))
@@ -0,0 +1,250 @@
+# -*- coding: UTF-8 -*-
+
+from asyncio import Semaphore, gather
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from json import dumps, loads, JSONDecodeError
+from os.path import exists
+from threading import Lock
+from time import time
+from typing import TYPE_CHECKING, List, Dict, Tuple, Union
+
+from .constants import GRANULARITIES, MAX_CANDLES
+from ..constants import ENCODING
+from ..utils import to_posix
+
+if TYPE_CHECKING:
+    from .columnar import Candles
+    from .store import MarketStore
+
+__all__ = ["CandleBackfill"]
+
+
+class CandleBackfill:
+    """
+    Historic rates downloader for ranges longer than a single request.
+
+    The range is split into windows of at most `MAX_CANDLES` buckets which
+    are fetched concurrently (paced by the rate limiter of the session).
+    Overlapping or duplicated buckets are dropped and the result is sorted
+    by time (ascending).
+
+    If a `checkpoint` file is given every completed window is appended to
+    it, so a backfill interrupted part way resumes from where it stopped
+    when started again with the same file.
+
+    If a `store` is given only the windows it doesn't hold yet are fetched,
+    and every completed window that is fully in the past (so its candles
+    won't change anymore) is added to it.
+    """
+
+    def __init__(
+            self,
+            products,
+            product_id: str,
+            granularity: int,
+            max_workers: int = 4,
+            checkpoint: str = None,
+            store: "MarketStore" = None
+    ):
+        """
+        :param products: The :class:`.endpoints.Products` handler.
+        :param product_id: The product ID (i.e. `BTC-USD`).
+        :param granularity: Bucket size in seconds, one of `GRANULARITIES`.
+        :param max_workers: Number of requests in flight (defaults to: 4).
+        :param checkpoint: Path of the file used to resume the backfill
+            (defaults to: `None`).
+        :param store: Local store to read from and add to
+            (see :class:`.store.MarketStore`, defaults to: `None`).
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(
+                f"Invalid granularity: {granularity}! Expected one of: {GRANULARITIES}"
+            )
+
+        self._products = products
+        self._lock: Lock = Lock()
+
+        self.product_id: str = product_id
+        self.granularity: int = granularity
+        self.max_workers: int = max_workers
+        self.checkpoint: str = checkpoint
+        self.store: "MarketStore" = store
+
+    def windows(self, start: int, end: int) -> List[Tuple[int, int]]:
+        """
+        Split the `[start, end]` range (POSIX timestamps) in windows with
+        at most `MAX_CANDLES` buckets each, aligned to the granularity.
+        """
+        start: int = start - (start % self.granularity)
+        step: int = MAX_CANDLES * self.granularity
+        windows: List[Tuple[int, int]] = []
+
+        while start <= end:
+            windows.append(
+                (start, min(start + step - self.granularity, end))
+            )
+            start += step
+
+        return windows
+
+    def run(
+            self,
+            start: Union[datetime, int, float, str],
+            end: Union[datetime, int, float, str]
+    ) -> List[List]:
+        """
+        Fetch all the candles between `start` and `end` (inclusive).
+
+        :param start: Start of the range (`datetime`, POSIX or ISO 8601).
+        :param end: End of the range (`datetime`, POSIX or ISO 8601).
+        """
+        start: int = int(to_posix(start))
+        end: int = int(to_posix(end))
+
+        buckets, pending = self._resume(start, end)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for candles in executor.map(self._fetch, pending):
+                self._merge(buckets, candles)
+
+        return self._collect(buckets, start, end)
+
+    async def arun(
+            self,
+            start: Union[datetime, int, float, str],
+            end: Union[datetime, int, float, str]
+    ) -> List[List]:
+        """
+        Asynchronous version of :meth:`run` for the :mod:`.aio` handlers.
+
+        :param start: Start of the range (`datetime`, POSIX or ISO 8601).
+        :param end: End of the range (`datetime`, POSIX or ISO 8601).
+        """
+        start: int = int(to_posix(start))
+        end: int = int(to_posix(end))
+
+        buckets, pending = self._resume(start, end)
+        semaphore: Semaphore = Semaphore(self.max_workers)
+
+        async def fetch(window: Tuple[int, int]) -> List[List]:
+            async with semaphore:
+                candles: List[List] = await self._products._get(
+                    self.product_id, "candles", params=self._params(window), parser=list
+                )
+            self._save(window, candles)
+            return candles
+
+        for candles in await gather(*(fetch(window) for window in pending)):
+            self._merge(buckets, candles)
+
+        return self._collect(buckets, start, end)
+
+    def _resume(self, start: int, end: int) -> Tuple[Dict[int, List], List[Tuple[int, int]]]:
+        """
+        Get the buckets fetched by a previous run and the windows that are
+        still missing.
+        """
+        buckets: Dict[int, List] = {}
+        done: set = set()
+
+        for window, candles in self._load():
+            done.add(window)
+            self._merge(buckets, candles)
+
+        if self.store is not None:
+            stored: "Candles" = self.store.candles(self.product_id, self.granularity, start, end)
+            self._merge(buckets, stored.rows())
+            ranges: List[Tuple[int, int]] = self.store.candle_gaps(self.product_id, self.granularity, start, end)
+        else:
+            ranges: List[Tuple[int, int]] = [(start, end)]
+
+        pending: List[Tuple[int, int]] = [
+            window for low, high in ranges for window in self.windows(low, high) if window not in done
+        ]
+
+        return buckets, pending
+
+    def _collect(self, buckets: Dict[int, List], start: int, end: int) -> List[List]:
+        start: int = start - (start % self.granularity)
+        return [
+            buckets.get(timestamp) for timestamp in sorted(buckets)
+            if start <= timestamp <= end
+        ]
+
+    def _params(self, window: Tuple[int, int]) -> dict:
+        return {
+            "granularity": self.granularity,
+            "start": self._isoformat(window[0]),
+            "end": self._isoformat(window[1]),
+        }
+
+    def _fetch(self, window: Tuple[int, int]) -> List[List]:
+        candles: List[List] = self._products._get(
+            self.product_id, "candles", params=self._params(window), parser=list
+        )
+        self._save(window, candles)
+        return candles
+
+    @staticmethod
+    def _merge(buckets: Dict[int, List], candles: List[List]):
+        for candle in candles:
+            buckets[candle[0]] = candle
+
+    @staticmethod
+    def _isoformat(timestamp: int) -> str:
+        return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+    def _load(self) -> List[Tuple[Tuple[int, int], List[List]]]:
+        """Read the windows completed by a previous run."""
+        if (self.checkpoint is None) or (not exists(self.checkpoint)):
+            return []
+
+        completed: list = []
+        line: str = "\n"
+
+        with open(self.checkpoint, "r", encoding=ENCODING) as handler:
+            for line in handler:
+                try:
+                    record: dict = loads(line)
+                except JSONDecodeError:
+                    # partially written line of an interrupted run:
+                    continue
+
+                if record.get("product_id") != self.product_id:
+                    continue
+
+                if record.get("granularity") != self.granularity:
+                    continue
+
+                completed.append(
+                    (tuple(record.get("window")), record.get("candles"))
+                )
+
+        if not line.endswith("\n"):
+            with open(self.checkpoint, "a", encoding=ENCODING) as handler:
+                handler.write("\n")
+
+        return completed
+
+    def _save(self, window: Tuple[int, int], candles: List[List]):
+        """Append a completed window to the checkpoint file and the store."""
+        if (self.store is not None) and (window[1] + self.granularity <= time()):
+            self.store.add_candles(self.product_id, self.granularity, window[0], window[1], candles)
+
+        if self.checkpoint is None:
+            return
+
+        record: str = dumps(
+            {
+                "product_id": self.product_id,
+                "granularity": self.granularity,
+                "window": window,
+                "candles": candles,
+            }
+        )
+
+        with self._lock:
+            with open(self.checkpoint, "a", encoding=ENCODING) as handler:
+                handler.write(f"{record}\n")
+                handler.flush()
@@ -0,0 +1,219 @@
+# -*- coding: UTF-8 -*-
+
+"""
+Single entry point to the Exchange/Pro API endpoints sharing one
+connection pool::
+
+    with Client(key, passphrase, secret, pool_maxsize=32) as client:
+        client.products.get_product_ticker("BTC-USD")
+        client.orders.create_order(...)
+"""
+
+from logging import Logger
+from typing import Tuple, Union
+
+from . import endpoints
+from .clock import ClockSync
+from .constants import ENVIRONMENT
+from .endpoints import LIMITER, _restore, cache_ttl
+from .sessions import AuthSession
+from ..cache import ResponseCache
+from ..limiter import RateLimiter
+from ..metrics import Metrics
+from ..retry import CircuitBreaker
+from ..sessions import BaseSession, TimeoutHTTPAdapter
+
+__all__ = ["Client"]
+
+
+class Client:
+    """
+    Exchange/Pro API client.
+
+    A single tuned connection pool (one TCP/TLS connection pool per host) is
+    shared by every endpoint group, exposed as attributes (`products`,
+    `orders`, `fills`, ...). The authenticated groups are only available
+    when the API credentials are given.
+
+    Clients are picklable (i.e. to be sent to a process pool): only the
+    constructor arguments (except the `clock`) are pickled and the sessions
+    are rebuilt in the receiving process, with their own connection pool.
+    Use a :class:`coinbase_lib.limiter.SharedRateLimiter` to share the rate
+    limits between processes.
+    """
+
+    # `(attribute, class name)` of the endpoint groups:
+    _public: Tuple[Tuple[str, str], ...] = (
+        ("time", "Time"),
+        ("currencies", "Currencies"),
+        ("products", "Products"),
+        ("wrapped_assets", "WrappedAssets"),
+    )
+
+    _private: Tuple[Tuple[str, str], ...] = (
+        ("accounts", "Accounts"),
+        ("address_book", "AddressBook"),
+        ("coinbase_accounts", "CoinbaseAccounts"),
+        ("conversions", "Conversions"),
+        ("deposits", "Deposits"),
+        ("payment_methods", "PaymentMethods"),
+        ("transfers", "Transfers"),
+        ("withdrawals", "Withdrawals"),
+        ("fees", "Fees"),
+        ("fills", "Fills"),
+        ("orders", "Orders"),
+        ("oracle", "Oracle"),
+        ("profiles", "Profiles"),
+        ("reports", "Reports"),
+        ("users", "Users"),
+    )
+
+    # module providing the endpoint classes:
+    _endpoints = endpoints
+
+    time: endpoints.Time
+    currencies: endpoints.Currencies
+    products: endpoints.Products
+    wrapped_assets: endpoints.WrappedAssets
+    accounts: endpoints.Accounts
+    address_book: endpoints.AddressBook
+    coinbase_accounts: endpoints.CoinbaseAccounts
+    conversions: endpoints.Conversions
+    deposits: endpoints.Deposits
+    payment_methods: endpoints.PaymentMethods
+    transfers: endpoints.Transfers
+    withdrawals: endpoints.Withdrawals
+    fees: endpoints.Fees
+    fills: endpoints.Fills
+    orders: endpoints.Orders
+    oracle: endpoints.Oracle
+    profiles: endpoints.Profiles
+    reports: endpoints.Reports
+    users: endpoints.Users
+
+    def __init__(
+            self,
+            key: str = None,
+            passphrase: str = None,
+            secret: str = None,
+            environment: str = ENVIRONMENT,
+            pool_connections: int = 4,
+            pool_maxsize: int = 32,
+            retries: int = 3,
+            backoff: int = 1,
+            timeout: int = 30,
+            cache: Union[bool, ResponseCache] = True,
+            debug: bool = False,
+            logger: Logger = None,
+            limiter: RateLimiter = LIMITER,
+            models: bool = False,
+            clock: ClockSync = None,
+            metrics: Metrics = None,
+            breaker: CircuitBreaker = None
+    ):
+        """
+        :param key: The API key (for the authenticated endpoints).
+        :param passphrase: The API passphrase.
+        :param secret: The API secret.
+        :param environment: The API environment: `production` or `sandbox`
+            (defaults to: `production`).
+        :param pool_connections: Number of hosts with a connection pool kept
+            (defaults to: 4).
+        :param pool_maxsize: Maximum number of connections kept alive per
+            host, should be at least the number of threads sending requests
+            (defaults to: 32).
+        :param retries: Total number of retries to allow (defaults to: 3),
+            only for the requests safe to send twice (see
+            :class:`coinbase_lib.retry.RetryPolicy`).
+        :param backoff: A backoff factor to apply between attempts after the
+            second try (defaults to: 1).
+        :param timeout: How long to wait for the server to send data before
+            giving up (defaults to: 30).
+        :param cache: Use caching (defaults to: `True`), the response cache
+            is shared by all the endpoint groups.
+        :param debug: Set to True to log all requests/responses to/from server
+            (defaults to: `False`).
+        :param logger: The handler to be used for logging.
+        :param limiter: Client side rate limiter (defaults to: the process
+            wide shared limiter, `None` to disable).
+        :param models: Return typed response models instead of `Response`
+            objects (defaults to: `False`).
+        :param clock: Server clock tracker keeping the request signing clock
+            in sync (see :class:`.clock.ClockSync`).
+        :param metrics: Registry collecting the request metrics of all the
+            endpoint groups (defaults to: `None`).
+        :param breaker: Circuit breaker shared by all the endpoint groups
+            (see :class:`coinbase_lib.retry.CircuitBreaker`, defaults to: `None`).
+        """
+        self._config: dict = dict(
+            key=key,
+            passphrase=passphrase,
+            secret=secret,
+            environment=environment,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            retries=retries,
+            backoff=backoff,
+            timeout=timeout,
+            cache=cache,
+            debug=debug,
+            logger=logger,
+            limiter=limiter,
+            models=models,
+            metrics=metrics,
+            breaker=breaker
+        )
+
+        if cache is True:
+            cache: ResponseCache = ResponseCache(ttl=cache_ttl)
+
+        adapter: TimeoutHTTPAdapter = TimeoutHTTPAdapter(
+            retries, backoff, timeout, pool_connections, pool_maxsize, breaker
+        )
+        options: dict = dict(
+            cache=cache,
+            debug=debug,
+            logger=logger,
+            limiter=limiter,
+            adapter=adapter,
+            metrics=metrics
+        )
+
+        self._sessions: list = [BaseSession(**options)]
+
+        for name, handler in self._public:
+            setattr(self, name, getattr(self._endpoints, handler)(
+                environment=environment,
+                models=models,
+                session=self._sessions[0]
+            ))
+
+        if key is None:
+            return
+
+        self._sessions.append(AuthSession(key, passphrase, secret, **options))
+
+        for name, handler in self._private:
+            setattr(self, name, getattr(self._endpoints, handler)(
+                key, passphrase, secret,
+                environment=environment,
+                models=models,
+                session=self._sessions[1]
+            ))
+
+        if clock is not None:
+            clock.add(self._sessions[1].auth)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __reduce__(self):
+        return _restore, (self.__class__, (), self._config)
+
+    def close(self):
+        """Closes the connection pool."""
+        for session in self._sessions:
+            session.close()
@@ -0,0 +1,174 @@
+# -*- coding: UTF-8 -*-
+
+from collections import deque
+from logging import Logger, getLogger
+from threading import Event, Lock, Thread
+from time import monotonic, time
+from typing import Deque, List, Optional, Tuple, Union
+
+from .authentication import HMACBase
+from .constants import ENVIRONMENT
+from .endpoints import AuthEndpoint, Time
+from ..constants import NAME
+
+__all__ = ["ClockSync"]
+
+
+class ClockSync:
+    """
+    Background tracker of the API server clock feeding the request signing
+    clock of the registered handlers, so signed requests are not rejected
+    when the local clock drifts.
+
+    **Filter:**
+        The last `samples` measurements of `/time` are kept and, as in the
+        NTP clock filter, the one with the smallest round trip time is used:
+        it is the least delayed by network queuing, so the middle of its
+        round trip is the closest match for the server timestamp.
+
+    A few samples are taken in a quick `burst` when started, then one every
+    `interval` seconds.
+    """
+
+    def __init__(
+            self,
+            *handlers: Union[AuthEndpoint, HMACBase],
+            interval: float = 60,
+            samples: int = 8,
+            burst: int = 4,
+            time_handler: Time = None,
+            environment: str = ENVIRONMENT,
+            logger: Logger = None
+    ):
+        """
+        :param handlers: Authenticated endpoint handlers (or signing
+            handlers, i.e. a websocket `WSAuth`) to keep in sync.
+        :param interval: Seconds between two samples (defaults to: 60).
+        :param samples: Number of samples kept by the filter (defaults to: 8).
+        :param burst: Number of samples taken when started (defaults to: 4).
+        :param time_handler: The `time` endpoint handler used for sampling
+            (defaults to: a new uncached one for `environment`).
+        :param environment: The API environment: `production` or `sandbox`
+            (defaults to: `production`).
+        :param logger: The handler to be used for logging.
+        """
+        self.interval: float = interval
+        self.burst: int = burst
+
+        self._time: Time = time_handler or Time(environment=environment, cache=False)
+        self._log: Logger = logger or getLogger(NAME)
+        self._handlers: List[HMACBase] = []
+        self._samples: Deque[Tuple[float, float, float]] = deque(maxlen=samples)
+        # the `(rtt, epoch, at)` sample with the smallest round trip, picked
+        # under the lock when one is appended, so readers never iterate over
+        # `_samples` while it changes:
+        self._sample: Optional[Tuple[float, float, float]] = None
+        self._lock: Lock = Lock()
+        self._stop: Event = Event()
+        self._thread: Thread = None
+
+        for handler in handlers:
+            self.add(handler)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    @staticmethod
+    def _auth(handler: Union[AuthEndpoint, HMACBase]) -> HMACBase:
+        if isinstance(handler, HMACBase):
+            return handler
+        return handler._session.auth
+
+    def add(self, handler: Union[AuthEndpoint, HMACBase]):
+        """Keep the signing clock of `handler` in sync."""
+        auth: HMACBase = self._auth(handler)
+
+        with self._lock:
+            if auth not in self._handlers:
+                self._handlers.append(auth)
+            best: Optional[Tuple[float, float, float]] = self._sample
+
+        if best is not None:
+            auth.sync(best[1], at=best[2])
+
+    def remove(self, handler: Union[AuthEndpoint, HMACBase]):
+        auth: HMACBase = self._auth(handler)
+
+        with self._lock:
+            if auth in self._handlers:
+                self._handlers.remove(auth)
+
+    @property
+    def offset(self) -> Optional[float]:
+        """The server clock minus the local clock in seconds, if sampled."""
+        best: Optional[Tuple[float, float, float]] = self._sample
+
+        if best is None:
+            return None
+
+        return best[1] - (best[2] + time() - monotonic())
+
+    @property
+    def rtt(self) -> Optional[float]:
+        """Round trip time in seconds of the sample in use, if any."""
+        best: Optional[Tuple[float, float, float]] = self._sample
+        return None if best is None else best[0]
+
+    def timestamp(self) -> float:
+        """Current server POSIX timestamp estimate (local time if not sampled)."""
+        best: Optional[Tuple[float, float, float]] = self._sample
+
+        if best is None:
+            return time()
+
+        return best[1] + monotonic() - best[2]
+
+    def sample(self) -> Tuple[float, float]:
+        """
+        Take a sample now and update the registered handlers.
+
+        :return: The `offset` and `rtt` estimates.
+        """
+        epoch, at, rtt = self._time.sample_clock()
+
+        with self._lock:
+            self._samples.append((rtt, epoch, at))
+            self._sample = min(self._samples)
+            _, epoch, at = self._sample
+            handlers: List[HMACBase] = list(self._handlers)
+
+        for auth in handlers:
+            auth.sync(epoch, at=at)
+
+        return self.offset, self.rtt
+
+    def start(self):
+        """Start sampling in a background (daemon) thread."""
+        if (self._thread is None) or (not self._thread.is_alive()):
+            self._stop.clear()
+            self._thread = Thread(target=self._run, name=f"{NAME}-clock", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the background thread."""
+        self._stop.set()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        count: int = 0
+
+        while not self._stop.is_set():
+            try:
+                self.sample()
+            except Exception as error:
+                self._log.warning(f"Server clock sampling failed: {error!r}")
+
+            count += 1
+            self._stop.wait(1 if count < self.burst else self.interval)
@@ -0,0 +1,281 @@
+# -*- coding: UTF-8 -*-
+
+from array import array
+from decimal import Decimal
+from math import nan
+from typing import Callable, List, Dict, Tuple, Sequence
+
+from .batch import BatchResult
+from ..utils import to_posix
+
+try:
+    import numpy
+except ImportError:  # optional dependency, the `numpy` extra
+    numpy = None
+
+__all__ = ["Candles", "Trades", "Snapshot"]
+
+# NumPy dtypes by `array` typecode:
+_DTYPES: dict = {} if numpy is None else {
+    "b": numpy.int8,
+    "q": numpy.int64,
+    "d": numpy.float64,
+}
+
+
+def _column(typecode: str, values) -> Sequence:
+    """
+    Build a typed column from `values`, backed by a NumPy array if NumPy is
+    installed or by a standard library `array` otherwise.
+    """
+    if numpy is not None:
+        return numpy.fromiter(values, dtype=_DTYPES.get(typecode))
+    return array(typecode, values)
+
+
+def _scaled(values: List[str]) -> Tuple[Sequence, int]:
+    """
+    Convert decimal strings to integers scaled by a common power of ten so
+    no precision is lost. Returns the column and its scale (the number of
+    decimal places).
+    """
+    scale: int = max((len(value) - value.find(".") - 1 for value in values if "." in value), default=0)
+    column: List[int] = []
+
+    for value in values:
+        whole, _, fraction = value.partition(".")
+        column.append(int(f"{whole}{fraction.ljust(scale, '0')}"))
+
+    return _column("q", column), scale
+
+
+class Candles:
+    """
+    Columnar (struct-of-arrays) historic rates.
+
+    Each field is a typed column: `time` holds 64-bit integers and the
+    prices and `volume` hold 64-bit floats.
+    """
+
+    __slots__ = ("time", "low", "high", "open", "close", "volume")
+
+    @classmethod
+    def from_payload(cls, payload: List[List]) -> "Candles":
+        """Build the columns from a decoded `candles` response."""
+        if numpy is not None:
+            table = numpy.array(payload, dtype=numpy.float64).reshape(-1, 6).T
+            return cls(table[0].astype(numpy.int64), *table[1:])
+
+        return cls(
+            array("q", (row[0] for row in payload)),
+            *(array("d", (row[index] for row in payload)) for index in range(1, 6))
+        )
+
+    def __init__(self, time, low, high, open, close, volume):
+        self.time = time
+        self.low = low
+        self.high = high
+        self.open = open
+        self.close = close
+        self.volume = volume
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def rows(self) -> List[List]:
+        """The candles in the `candles` response schema."""
+        return [list(row) for row in zip(*(getattr(self, name).tolist() for name in self.__slots__))]
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(rows={len(self)})"
+
+
+class Trades:
+    """
+    Columnar (struct-of-arrays) public trades.
+
+    `trade_id` holds 64-bit integers, `time` holds POSIX timestamps as
+    64-bit floats and `side` holds 8-bit `1` for `buy` and `-1` for `sell`.
+    `price` and `size` are decimal safe: they hold 64-bit integers scaled
+    by `10 ** price_scale` and `10 ** size_scale` respectively.
+    """
+
+    __slots__ = ("trade_id", "time", "side", "price", "size", "price_scale", "size_scale")
+
+    @classmethod
+    def from_payload(cls, payload: List[Dict]) -> "Trades":
+        """Build the columns from a decoded `trades` response."""
+        price, price_scale = _scaled([trade.get("price") for trade in payload])
+        size, size_scale = _scaled([trade.get("size") for trade in payload])
+
+        return cls(
+            trade_id=_column("q", (trade.get("trade_id") for trade in payload)),
+            time=_column("d", (to_posix(trade.get("time")) for trade in payload)),
+            side=_column("b", (1 if trade.get("side") == "buy" else -1 for trade in payload)),
+            price=price,
+            size=size,
+            price_scale=price_scale,
+            size_scale=size_scale,
+        )
+
+    def __init__(self, trade_id, time, side, price, size, price_scale: int, size_scale: int):
+        self.trade_id = trade_id
+        self.time = time
+        self.side = side
+        self.price = price
+        self.size = size
+        self.price_scale = price_scale
+        self.size_scale = size_scale
+
+    def __len__(self) -> int:
+        return len(self.trade_id)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(rows={len(self)})"
+
+    def decimal(self, name: str, index: int) -> Decimal:
+        """
+        Exact value of the `price` or `size` column at `index`.
+
+        :param name: Column name (`price` or `size`).
+        :param index: Row index.
+        """
+        scale: int = getattr(self, f"{name}_scale")
+        return Decimal(int(getattr(self, name)[index])).scaleb(-scale)
+
+    def floats(self, name: str) -> Sequence:
+        """
+        The `price` or `size` column converted to 64-bit floats, for
+        vectorised analytics where exactness is not required.
+
+        :param name: Column name (`price` or `size`).
+        """
+        scale: int = getattr(self, f"{name}_scale")
+
+        if numpy is not None:
+            return getattr(self, name) / (10 ** scale)
+
+        return array("d", (value / (10 ** scale) for value in getattr(self, name)))
+
+
+def _float(value) -> float:
+    return float(value) if value not in (None, "") else nan
+
+
+def _ticker(payload: dict) -> tuple:
+    return (
+        _float(payload.get("price")),
+        _float(payload.get("size")),
+        _float(payload.get("bid")),
+        _float(payload.get("ask")),
+        _float(payload.get("volume")),
+        int(payload.get("trade_id") or 0),
+        to_posix(payload.get("time")) if payload.get("time") else nan,
+    )
+
+
+def _stats(payload: dict) -> tuple:
+    return tuple(_float(payload.get(name)) for name in ("open", "high", "low", "last", "volume", "volume_30day"))
+
+
+def _book(payload: dict) -> tuple:
+    bids: list = payload.get("bids") or [[None, None]]
+    asks: list = payload.get("asks") or [[None, None]]
+
+    return (
+        _float(bids[0][0]),
+        _float(bids[0][1]),
+        _float(asks[0][0]),
+        _float(asks[0][1]),
+        int(payload.get("sequence") or 0),
+    )
+
+
+class Snapshot:
+    """
+    Columnar (struct-of-arrays) market-wide snapshot of the tickers, stats
+    or inside books (best bid and ask) of several products.
+
+    Row `i` holds the values of product `product_id[i]`, the products whose
+    request failed have no row and their error is kept in `errors`. The
+    values are 64-bit floats (`NaN` if missing), except the `trade_id` and
+    `sequence` 64-bit integers; use the models where exact decimals are
+    needed.
+    """
+
+    __slots__ = ("kind", "timestamp", "product_id", "columns", "errors")
+
+    # columns as `(name, typecode)` and the function extracting them from a
+    # decoded response, by snapshot kind:
+    KINDS: Dict[str, Tuple[Tuple[Tuple[str, str], ...], Callable]] = {
+        "ticker": (
+            (("price", "d"), ("size", "d"), ("bid", "d"), ("ask", "d"), ("volume", "d"), ("trade_id", "q"), ("time", "d")),
+            _ticker,
+        ),
+        "stats": (
+            (("open", "d"), ("high", "d"), ("low", "d"), ("last", "d"), ("volume", "d"), ("volume_30day", "d")),
+            _stats,
+        ),
+        "book": (
+            (("bid", "d"), ("bid_size", "d"), ("ask", "d"), ("ask_size", "d"), ("sequence", "q")),
+            _book,
+        ),
+    }
+
+    @classmethod
+    def from_results(cls, kind: str, results: List[BatchResult], timestamp: float) -> "Snapshot":
+        """
+        Build the columns from the batch results of a snapshot, their
+        `request` being the product ID and their `result` the decoded
+        response.
+        """
+        fields, extract = cls.KINDS.get(kind)
+        product_ids: List[str] = []
+        rows: List[tuple] = []
+        errors: Dict[str, Exception] = {}
+
+        for result in results:
+            if not result.ok:
+                errors[result.request] = result.error
+                continue
+
+            try:
+                row: tuple = extract(result.result)
+            except (AttributeError, IndexError, TypeError, ValueError) as error:
+                errors[result.request] = error
+                continue
+
+            product_ids.append(result.request)
+            rows.append(row)
+
+        columns: Dict[str, Sequence] = {
+            name: _column(typecode, (row[index] for row in rows))
+            for index, (name, typecode) in enumerate(fields)
+        }
+
+        return cls(kind, timestamp, product_ids, columns, errors)
+
+    def __init__(self, kind: str, timestamp: float, product_id: List[str], columns: Dict[str, Sequence], errors: Dict[str, Exception]):
+        self.kind: str = kind
+        self.timestamp: float = timestamp
+        self.product_id: List[str] = product_id
+        self.columns: Dict[str, Sequence] = columns
+        self.errors: Dict[str, Exception] = errors
+
+    def __len__(self) -> int:
+        return len(self.product_id)
+
+    def __getitem__(self, name: str) -> Sequence:
+        """The column `name` (or the `product_id` list)."""
+        if name == "product_id":
+            return self.product_id
+        return self.columns[name]
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(kind={self.kind!r}, rows={len(self)}, errors={len(self.errors)})"
+
+    def rows(self) -> List[Dict]:
+        """The snapshot as one `dict` per product."""
+        names: List[str] = list(self.columns)
+        values = zip(self.product_id, *(self.columns[name].tolist() for name in names))
+        return [dict(zip(["product_id", *names], row)) for row in values]
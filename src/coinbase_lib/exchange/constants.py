@@ -1,3 +1,77 @@
 # -*- coding: UTF-8 -*-
 
 ENVIRONMENT: str = "production"  # or: "sandbox"
+
+# API hostnames by environment (prefixed by `http://` for a plain HTTP
+# server, i.e. a local mock, see :class:`.mock.MockExchange`):
+EXCHANGE: dict = {
+    "production": "api.exchange.coinbase.com",
+    "sandbox": "api-public.sandbox.exchange.coinbase.com",
+}
+
+# API paths by endpoint handler:
+ENDPOINTS: dict = {
+    "Time": "time",
+    "Accounts": "accounts",
+    "AddressBook": "address-book",
+    "CoinbaseAccounts": "coinbase-accounts",
+    "Conversions": "conversions",
+    "Currencies": "currencies",
+    "Deposits": "deposits",
+    "PaymentMethods": "payment-methods",
+    "Transfers": "transfers",
+    "Withdrawals": "withdrawals",
+    "Fees": "fees",
+    "Fills": "fills",
+    "Orders": "orders",
+    "Oracle": "oracle",
+    "Products": "products",
+    "Profiles": "profiles",
+    "Reports": "reports",
+    "Users": "users",
+    "WrappedAssets": "wrapped-assets",
+}
+
+# documented rate limits as `(requests per second, burst)`; endpoints
+# without a dedicated limit share the `public` (by IP) or the `private`
+# (by profile ID) budget:
+RATE_LIMITS: dict = {
+    "public": (10, 15),
+    "private": (15, 30),
+    "accounts": (25, 50),
+    "fills": (10, 20),
+}
+
+# seconds between two refreshes of the reference data (products,
+# currencies and wrapped assets):
+REFERENCE_REFRESH: int = 300
+
+# maximum number of orders tracked while their outcome is unknown:
+MAX_IN_FLIGHT: int = 1000
+
+# accepted candle granularities (in seconds):
+GRANULARITIES: tuple = (60, 300, 900, 3600, 21600, 86400)
+
+# maximum number of candles returned by a single request:
+MAX_CANDLES: int = 300
+
+# response cache lifetime (in seconds) by endpoint path, either
+# `<endpoint>` or `<endpoint>/<resource>`; anything else (orders, fills,
+# accounts, etc.) is never cached:
+CACHE_TTL: dict = {
+    "currencies": 6 * 3600,
+    "products": 3600,
+    "products/book": 0,
+    "products/candles": 60,
+    "products/stats": 30,
+    "products/ticker": 1,
+    "products/trades": 0,
+    "wrapped-assets": 3600,
+    "wrapped-assets/conversion-rate": 60,
+}
+
+# websocket feed URLs by environment:
+WEBSOCKET: dict = {
+    "production": "wss://ws-feed.exchange.coinbase.com",
+    "sandbox": "wss://ws-feed-public.sandbox.exchange.coinbase.com",
+}
@@ -1,23 +1,101 @@
 # -*- coding: UTF-8 -*-
 
 from abc import ABC
+from datetime import datetime
 from json import JSONDecodeError
-from typing import Union, List, Dict
+from time import monotonic, time
+from typing import TYPE_CHECKING, Union, List, Dict, Iterator, Tuple
+from uuid import uuid4
 
 from requests import Response, HTTPError
 
-from .constants import EXCHANGE, ENDPOINTS, ENVIRONMENT
-from .sessions import BaseSession, ExchangeSession
+from .batch import BatchResult, run_batch
+from .candles import CandleBackfill
+from .constants import EXCHANGE, ENDPOINTS, ENVIRONMENT, RATE_LIMITS, CACHE_TTL
+from .inflight import InFlightOrders, ambiguous, status_error
+from .models import (
+    Model,
+    ServerTime,
+    Account,
+    Hold,
+    LedgerEntry,
+    Transfer,
+    Currency,
+    Fees,
+    Fill,
+    Order,
+    Product,
+    Book,
+    Candle,
+    Stats,
+    Ticker,
+    Trade,
+    Profile,
+    build,
+)
+from .sessions import AuthSession
+from .trades import TradeDownloader
+from ..cache import ResponseCache
+from ..helpers import URL
+from ..limiter import RateLimiter
+from ..metrics import endpoint_label
+from ..sessions import BaseSession
+from ..utils import to_posix, loads
+
+if TYPE_CHECKING:  # NumPy backed when installed, imported on first use
+    from .columnar import Candles, Trades, Snapshot
+    from .store import MarketStore
+    from .validation import OrderValidator
+
+# process wide rate limiter shared by all endpoint instances:
+LIMITER: RateLimiter = RateLimiter(RATE_LIMITS)
+
+
+def cache_ttl(url: str) -> int:
+    """
+    Response cache lifetime in seconds for an API `url`, looked up in
+    `CACHE_TTL` by its metrics label (see :func:`..metrics.endpoint_label`,
+    i.e. `products/ticker` for `/products/BTC-USD/ticker`), falling back
+    to the endpoint.
+    """
+    label: str = endpoint_label(url)
+    ttl: int = CACHE_TTL.get(label)
+
+    if ttl is not None:
+        return ttl
+
+    return CACHE_TTL.get(label.partition("/")[0], 0)
+
+
+def _restore(cls: type, args: tuple, kwargs: dict):
+    """Rebuild a pickled handler (or client) from its constructor arguments."""
+    return cls(*args, **kwargs)
 
 
 class Exchange(ABC):
     """Exchange/PRO API base endpoint."""
 
-    def __init__(self, environment: str):
+    # shared rate limit used when the endpoint has no dedicated one:
+    _rate_limit: str = None
+
+    # `(args, kwargs)` the handler was created with, `None` if it can't be
+    # rebuilt from them (it sends the requests with a shared session):
+    _config: Tuple[tuple, dict] = None
+
+    def __init__(self, environment: str, models: bool = False):
         """
         :param environment: The API environment (`production` or `sandbox`).
+        :param models: Return typed response models instead of responses.
         """
-        self._url: str = f"https://{EXCHANGE.get(environment)}"
+        # a hostname may name its scheme, i.e. a local mock over plain HTTP:
+        protocol, _, hostname = EXCHANGE.get(environment).rpartition("://")
+
+        self._url: URL = URL(
+            hostname=hostname,
+            protocol=protocol or "https",
+            endpoint=self._get_endpoint_name()
+        )
+        self._models: bool = models
 
     def __enter__(self):
         return self
@@ -25,13 +103,67 @@ class Exchange(ABC):
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.close()
 
+    def __reduce__(self):
+        # sessions, connection pools and locks can't cross processes, the
+        # handler is pickled as its configuration and rebuilt in the worker:
+        if self._config is None:
+            raise TypeError(
+                f"{self.__class__.__name__} handler using a shared session can't be pickled, "
+                f"pickle its client instead!"
+            )
+        return _restore, (self.__class__, *self._config)
+
     def _get_endpoint_name(self) -> str:
-        return ENDPOINTS.get(self.__class__.__name__)
+        for cls in self.__class__.__mro__:
+            if cls.__name__ in ENDPOINTS:
+                return ENDPOINTS.get(cls.__name__)
 
     def close(self):
         """Closes all adapters and as such the session"""
         self._session.close()
 
+    def _throttle_key(self, kwargs: dict) -> Tuple[str, str]:
+        """
+        Get the rate limit name and profile ID for a request, using the
+        dedicated limit of this endpoint if one is documented.
+        """
+        name: str = self._get_endpoint_name()
+
+        if name not in self._session.limiter.limits:
+            name: str = self._rate_limit
+
+        if self._rate_limit == "public":
+            return name, None
+
+        payload: dict = kwargs.get("params") or kwargs.get("json") or {}
+        return name, payload.get("profile_id")
+
+    def _request(self, method, *args, parser=None, model: type = None, **kwargs) -> Response:
+        """
+        Send a request and return the response, or the decoded payload
+        converted by `parser` if one is given, or built as `model` instances
+        if models are enabled.
+        """
+        url: str = self._url.join(*args)
+        kwargs.update(url=url)
+
+        if self._session.limiter is not None:
+            # taken by the session on a cache miss only:
+            kwargs.update(throttle=self._throttle_key(kwargs))
+
+        response: Response = method(**kwargs)
+
+        if not response.ok:
+            self._raise_for_status(response)
+
+        if parser is not None:
+            return parser(loads(response.content))
+
+        if self._models and (model is not None):
+            return build(model, loads(response.content))
+
+        return response
+
     def _get(self, *args, **kwargs):
         return self._request(self._session.get, *args, **kwargs)
 
@@ -44,6 +176,40 @@ class Exchange(ABC):
     def _put(self, *args, **kwargs):
         return self._request(self._session.put, *args, **kwargs)
 
+    def _paginate(self, *args, field: str, params: dict, model: type = None) -> Iterator[Union[Dict, Model]]:
+        """
+        Lazily walk a cursor paginated resource from the newest item
+        backwards, following the `cb-after` response header. Only one page
+        is decoded at a time.
+
+        If `before` is given in `params` it is not sent to the server but
+        used as a watermark: iteration stops at the first item whose
+        `field` value is at or before it (i.e. already seen).
+
+        Items are built as `model` instances if models are enabled.
+        """
+        params: dict = dict(params)
+        watermark = params.pop("before", None)
+
+        if watermark is not None:
+            watermark: float = to_posix(watermark)
+
+        while True:
+            response: Response = self._get(*args, params=params)
+            page: List[Dict] = loads(response.content)
+
+            for item in page:
+                if (watermark is not None) and (to_posix(item.get(field)) <= watermark):
+                    return
+                yield model(item) if self._models and (model is not None) else item
+
+            cursor: str = response.headers.get("cb-after")
+
+            if (len(page) == 0) or (cursor is None) or (cursor == params.get("after")):
+                return
+
+            params.update(after=cursor)
+
     def _raise_for_status(self, response: Response):
         try:
             error: dict = response.json()
@@ -51,14 +217,15 @@ class Exchange(ABC):
             response.raise_for_status()
         else:
             status: int = response.status_code
-            message: str = error.get("message").rstrip(".?!")
+            message: str = error.get("message")
             side: str = self._error_side(status)
 
             if message is None:
                 message: str = response.reason or "Unknown"
 
             raise HTTPError(
-                f"{status} {side} Error: {message}! URL: {response.url}"
+                f"{status} {side} Error: {message.rstrip('.?!')}! URL: {response.url}",
+                response=response
             )
 
     @staticmethod
@@ -73,32 +240,74 @@ class Exchange(ABC):
 class Endpoint(Exchange):
     """Exchange/PRO API endpoint."""
 
+    _rate_limit: str = "public"
+
     def __init__(self, **kwargs):
         """
         **Parameters**:
             - ``environment``: The API environment: `production` or `sandbox`
               (defaults to: `production`);
-            - ``retries``: Total number of retries to allow (defaults to: 3);
+            - ``retries``: Total number of retries to allow (defaults to: 3).
+              Only the requests safe to send twice are retried: `GET` and
+              `DELETE` ones, and `POST` ones with a `client_oid`;
             - ``backoff``: A backoff factor to apply between attempts after the
               second try (defaults to: 1);
             - ``timeout``: How long to wait for the server to send data before
               giving up (defaults to: 30);
-            - ``cache``: Use caching (defaults to: `True`);
+            - ``cache``: Use caching (defaults to: `True`). Responses are
+              kept in memory, per session, for the lifetime set in
+              `CACHE_TTL` for each endpoint. A :class:`ResponseCache` can be
+              given instead (i.e. to add a disk layer);
             - ``debug``: bool - Set to True to log all requests/responses
               to/from server (defaults to: `False`);
             - ``logger``: Logger - The handler to be used for logging.
               If given, and level is above `DEBUG`, all debug messages will be
               ignored.
-        """
+            - ``limiter``: RateLimiter - Client side rate limiter pacing the
+              requests to the documented limits (defaults to: a process wide
+              shared limiter, `None` to disable).
+            - ``metrics``: Metrics - Registry collecting the latency, size,
+              retries, throttling and cache metrics of the requests
+              (see :mod:`coinbase_lib.metrics`, defaults to: `None`).
+            - ``breaker``: CircuitBreaker - Circuit breaker failing fast while
+              the exchange is degraded, can be shared by several handlers
+              (see :class:`coinbase_lib.retry.CircuitBreaker`, defaults to:
+              `None`).
+            - ``models``: bool - Decode the responses once and return typed
+              models (see :mod:`.models`) instead of `Response` objects
+              (defaults to: `False`).
+            - ``session``: BaseSession - Existing session to send the requests
+              with, i.e. one shared by a :class:`.client.Client` (the session
+              options above are then ignored).
+
+        Handlers are picklable (i.e. to be sent to a process pool): only the
+        options above are pickled, the session is rebuilt in the receiving
+        process with empty caches and its own connection pool. Use a
+        :class:`coinbase_lib.limiter.SharedRateLimiter` to share the rate
+        limits between processes.
+        """
+        config: dict = dict(kwargs)
+        kwargs.setdefault("limiter", LIMITER)
+        session: BaseSession = kwargs.pop("session", None)
+
+        if kwargs.get("cache", True) is True:
+            kwargs.update(cache=ResponseCache(ttl=cache_ttl))
+
         super(Endpoint, self).__init__(
-            environment=kwargs.pop("environment", ENVIRONMENT)
+            environment=kwargs.pop("environment", ENVIRONMENT),
+            models=kwargs.pop("models", False)
         )
-        self._session = BaseSession(**kwargs)
+        self._session = session if session is not None else BaseSession(**kwargs)
+
+        if session is None:
+            self._config = (), config
 
 
 class AuthEndpoint(Exchange):
     """Exchange/Pro API authenticated endpoint."""
 
+    _rate_limit: str = "private"
+
     def __init__(self, key: str, passphrase: str, secret: str, **kwargs):
         """
         **Parameters**:
@@ -107,30 +316,112 @@ class AuthEndpoint(Exchange):
             - ``secret``: The API secret;
             - ``environment``: The API environment: `production` or `sandbox`
               (defaults to: `production`);
-            - ``retries``: Total number of retries to allow (defaults to: 3);
+            - ``retries``: Total number of retries to allow (defaults to: 3).
+              Only the requests safe to send twice are retried: `GET` and
+              `DELETE` ones, and `POST` ones with a `client_oid`;
             - ``backoff``: A backoff factor to apply between attempts after the
               second try (defaults to: 1);
             - ``timeout``: How long to wait for the server to send data before
               giving up (defaults to: 30);
-            - ``cache``: Use caching (defaults to: `True`);
+            - ``cache``: Use caching (defaults to: `True`). Responses are
+              kept in memory, per session, for the lifetime set in
+              `CACHE_TTL` for each endpoint. A :class:`ResponseCache` can be
+              given instead (i.e. to add a disk layer);
             - ``debug``: bool - Set to True to log all requests/responses
               to/from server (defaults to: `False`);
             - ``logger``: Logger - The handler to be used for logging.
               If given, and level is above `DEBUG`, all debug messages will be
               ignored.
-        """
+            - ``limiter``: RateLimiter - Client side rate limiter pacing the
+              requests to the documented limits (defaults to: a process wide
+              shared limiter, `None` to disable).
+            - ``metrics``: Metrics - Registry collecting the latency, size,
+              retries, throttling and cache metrics of the requests
+              (see :mod:`coinbase_lib.metrics`, defaults to: `None`).
+            - ``breaker``: CircuitBreaker - Circuit breaker failing fast while
+              the exchange is degraded, can be shared by several handlers
+              (see :class:`coinbase_lib.retry.CircuitBreaker`, defaults to:
+              `None`).
+            - ``models``: bool - Decode the responses once and return typed
+              models (see :mod:`.models`) instead of `Response` objects
+              (defaults to: `False`).
+            - ``clock``: ClockSync - Server clock tracker keeping the request
+              signing clock in sync (see :class:`.clock.ClockSync`).
+            - ``session``: AuthSession - Existing session to send the requests
+              with, i.e. one shared by a :class:`.client.Client` (the session
+              options above are then ignored).
+
+        Handlers are picklable (i.e. to be sent to a process pool): only the
+        credentials and the options above (except the `clock`) are pickled,
+        the session is rebuilt in the receiving process with empty caches
+        and its own connection pool. Use a
+        :class:`coinbase_lib.limiter.SharedRateLimiter` to share the rate
+        limits between processes.
+        """
+        config: dict = dict(kwargs)
+        config.pop("clock", None)
+        kwargs.setdefault("limiter", LIMITER)
+        clock = kwargs.pop("clock", None)
+        session: AuthSession = kwargs.pop("session", None)
+
+        if kwargs.get("cache", True) is True:
+            kwargs.update(cache=ResponseCache(ttl=cache_ttl))
+
         super(AuthEndpoint, self).__init__(
-            environment=kwargs.pop("environment", ENVIRONMENT)
+            environment=kwargs.pop("environment", ENVIRONMENT),
+            models=kwargs.pop("models", False)
         )
-        self._session = AuthSession(key, passphrase, secret, **kwargs)
+
+        if session is None:
+            session: AuthSession = AuthSession(key, passphrase, secret, **kwargs)
+            self._config = (key, passphrase, secret), config
+
+        self._session = session
+
+        if clock is not None:
+            clock.add(self)
 
 
 class Time(Endpoint):
     """`time` endpoint of Exchange/Pro API."""
 
-    def get_time(self) -> Dict:
+    def get_time(self) -> Union[Response, ServerTime]:
         """Get the API server time."""
-        return self._get()
+        return self._get(model=ServerTime)
+
+    def sample_clock(self) -> Tuple[float, float, float]:
+        """
+        Sample the API server time.
+
+        :return: The server POSIX timestamp, the monotonic clock reading
+            matching it (the middle of the request round trip) and the
+            round trip time in seconds.
+        """
+        start: float = monotonic()
+        response: Response = self._get()
+        end: float = monotonic()
+
+        return float(loads(response.content).get("epoch")), (start + end) / 2, end - start
+
+    def sync_clock(self, *handlers: AuthEndpoint) -> float:
+        """
+        Sample the API server time and align the request signing clock of
+        the authenticated `handlers` with it.
+
+        For continuous tracking see :class:`.clock.ClockSync`.
+
+        :param handlers: Authenticated endpoint handlers.
+        :return: The server clock minus the local clock, in seconds.
+        """
+        epoch, at, _ = self.sample_clock()
+        return self._sync(epoch, at, handlers)
+
+    @staticmethod
+    def _sync(epoch: float, at: float, handlers: Tuple[AuthEndpoint, ...]) -> float:
+        for handler in handlers:
+            handler._session.auth.sync(epoch, at=at)
+
+        return epoch - (at + time() - monotonic())
 
 
 class Accounts(AuthEndpoint):
@@ -164,13 +455,13 @@ class Accounts(AuthEndpoint):
     Funds will remain on hold until the order is filled or canceled.
     """
 
-    def get_accounts(self) -> List:
+    def get_accounts(self) -> Union[Response, List[Account]]:
         """
         Get a list of trading accounts from the profile of the API key.
         """
-        return self._get()
+        return self._get(model=Account)
 
-    def get_account(self, account_id: str) -> Dict:
+    def get_account(self, account_id: str) -> Union[Response, Account]:
         """
         Information for a single account.
         Use this endpoint when you know the account_id.
@@ -178,9 +469,9 @@ class Accounts(AuthEndpoint):
 
         :param account_id: The ID of the trading account.
         """
-        return self._get(account_id)
+        return self._get(account_id, model=Account)
 
-    def get_account_holds(self, account_id: str, **kwargs) -> List:
+    def get_account_holds(self, account_id: str, **kwargs) -> Union[Response, List[Hold]]:
         """
         List the holds of an account that belong to the same profile as the
         API key. Holds are placed on an account for any active orders or
@@ -202,9 +493,25 @@ class Accounts(AuthEndpoint):
         if "limit" not in kwargs:
             kwargs.update(limit=100)
 
-        return self._get(account_id, "holds", params=kwargs)
+        return self._get(account_id, "holds", params=kwargs, model=Hold)
+
+    def iter_account_holds(self, account_id: str, **kwargs) -> Iterator[Union[Dict, Hold]]:
+        """
+        Lazily iterate over all the holds of an account, newest first,
+        following the pagination cursors one page at a time.
+
+        **kwargs:**
+            - ``before``: str - Watermark. Iteration stops at the first hold
+              created at or before this date (i.e. already seen).
+            - ``limit``: int - Page size (defaults to: 100).
+
+        :param account_id: The ID of the trading account.
+        :param kwargs: Additional keyword arguments.
+        """
+        kwargs.setdefault("limit", 100)
+        return self._paginate(account_id, "holds", field="created_at", params=kwargs, model=Hold)
 
-    def get_account_ledger(self, account_id: str, **kwargs) -> List:
+    def get_account_ledger(self, account_id: str, **kwargs) -> Union[Response, List[LedgerEntry]]:
         """
         Lists ledger activity for an account. This includes anything that
         would affect the accounts balance - transfers, trades, fees, etc.
@@ -228,9 +535,28 @@ class Accounts(AuthEndpoint):
         if "limit" not in kwargs:
             kwargs.update(limit=100)
 
-        return self._get(account_id, "ledger", params=kwargs)
+        return self._get(account_id, "ledger", params=kwargs, model=LedgerEntry)
 
-    def get_account_transfers(self, account_id: str, **kwargs) -> List:
+    def iter_account_ledger(self, account_id: str, **kwargs) -> Iterator[Union[Dict, LedgerEntry]]:
+        """
+        Lazily iterate over the whole ledger activity of an account, newest
+        first, following the pagination cursors one page at a time.
+
+        **kwargs:**
+            - ``start_date``: str - Filter results by minimum posted date.
+            - ``end_date``: str - Filter results by maximum posted date.
+            - ``before``: str - Watermark. Iteration stops at the first entry
+              created at or before this date (i.e. already seen).
+            - ``limit``: int - Page size (defaults to: 100).
+            - ``profile_id``: str
+
+        :param account_id: The ID of the trading account.
+        :param kwargs:  Additional keyword arguments.
+        """
+        kwargs.setdefault("limit", 100)
+        return self._paginate(account_id, "ledger", field="created_at", params=kwargs, model=LedgerEntry)
+
+    def get_account_transfers(self, account_id: str, **kwargs) -> Union[Response, List[Transfer]]:
         """
         Lists past withdrawals and deposits for an account.
 
@@ -247,13 +573,30 @@ class Accounts(AuthEndpoint):
         if "limit" not in kwargs:
             kwargs.update(limit=100)
 
-        return self._get(account_id, "transfers", params=kwargs)
+        return self._get(account_id, "transfers", params=kwargs, model=Transfer)
+
+    def iter_account_transfers(self, account_id: str, **kwargs) -> Iterator[Union[Dict, Transfer]]:
+        """
+        Lazily iterate over all past withdrawals and deposits for an account,
+        newest first, following the pagination cursors one page at a time.
+
+        **kwargs:*
+            - ``before``: str - Watermark. Iteration stops at the first
+              transfer created at or before this date (i.e. already seen).
+            - ``limit``: int - Page size (defaults to: 100).
+            - ``type``: str
+
+        :param account_id: The ID of the trading account.
+        :param kwargs:  Additional keyword arguments.
+        """
+        kwargs.setdefault("limit", 100)
+        return self._paginate(account_id, "transfers", field="created_at", params=kwargs, model=Transfer)
 
 
 class AddressBook(AuthEndpoint):
     """`address-book` endpoint of the Exchange/Pro API."""
 
-    def get_addresses(self) -> List:
+    def get_addresses(self) -> Response:
         """Get all addresses stored in the address book."""
         return self._get()
 
@@ -261,7 +604,7 @@ class AddressBook(AuthEndpoint):
 class CoinbaseAccounts(AuthEndpoint):
     """`coinbase-accounts` endpoint of the Exchange/Pro API."""
 
-    def get_wallets(self) -> List:
+    def get_wallets(self) -> Response:
         """
         Gets all the user's available Coinbase wallets (These are the
         wallets/accounts that are used for buying and selling on
@@ -269,7 +612,7 @@ class CoinbaseAccounts(AuthEndpoint):
         """
         return self._get()
 
-    def generate_crypto_address(self, account_id: str, **kwargs) -> Dict:
+    def generate_crypto_address(self, account_id: str, **kwargs) -> Response:
         """
         Generates a one-time crypto address for depositing crypto.
 
@@ -299,7 +642,7 @@ class Conversions(AuthEndpoint):
     deposit.
     """
 
-    def convert_currency(self, from_currency: str, to_currency: str, amount: str, **kwargs) -> Dict:
+    def convert_currency(self, from_currency: str, to_currency: str, amount: str, **kwargs) -> Response:
         """
 
         Converts funds from `from` currency to `to` currency.
@@ -327,7 +670,7 @@ class Conversions(AuthEndpoint):
         )
         return self._post(json=kwargs)
 
-    def get_conversion(self, conversion_id: str, **kwargs) -> Dict:
+    def get_conversion(self, conversion_id: str, **kwargs) -> Response:
         """
         Gets a currency conversion by id
         (i.e. `41554f00-5c34-4f09-b800-2a878e52f2ea`).
@@ -349,16 +692,16 @@ class Currencies(Endpoint):
     Not all currencies may be currently in use for trading.
     """
 
-    def get_currencies(self) -> List:
+    def get_currencies(self) -> Union[Response, List[Currency]]:
         """
         Gets a list of all known currencies.
 
         Note:
             Not all currencies may be currently in use for trading.
         """
-        return self._get()
+        return self._get(model=Currency)
 
-    def get_currency(self, currency_id: str) -> Dict:
+    def get_currency(self, currency_id: str) -> Union[Response, Currency]:
         """
         Gets a single currency by ID (i.e. `BTC`).
 
@@ -368,7 +711,7 @@ class Currencies(Endpoint):
 
         :param currency_id: `ISO 4217` standard ID or custom code.
         """
-        return self._get(currency_id)
+        return self._get(currency_id, model=Currency)
 
 
 class Deposits(AuthEndpoint):
@@ -389,7 +732,7 @@ class Deposits(AuthEndpoint):
             currency: str,
             amount: str,
             **kwargs
-    ) -> Dict:
+    ) -> Response:
         """
         Deposits funds from a https://www.coinbase.com wallet to the specified
         `profile_id`.
@@ -414,7 +757,7 @@ class Deposits(AuthEndpoint):
             currency: str,
             amount: str,
             **kwargs
-    ) -> Dict:
+    ) -> Response:
         """
         Deposits funds from a linked external payment method to the
         specified `profile_id`.
@@ -437,7 +780,7 @@ class Deposits(AuthEndpoint):
 class PaymentMethods(AuthEndpoint):
     """`payment-methods` endpoint of the Exchange/Pro API."""
 
-    def get_payment_methods(self) -> List:
+    def get_payment_methods(self) -> Response:
         """Gets a list of the user's linked payment methods."""
         return self._get()
 
@@ -447,7 +790,7 @@ class Transfers(AuthEndpoint):
     `transfers` endpoint of the Exchange/Pro API.
     """
 
-    def get_transfers(self, **kwargs) -> List:
+    def get_transfers(self, **kwargs) -> Union[Response, List[Transfer]]:
         """
         Gets a list of in-progress and completed transfers of funds in/out of
         the user's accounts.
@@ -459,15 +802,31 @@ class Transfers(AuthEndpoint):
             - ``limit``: int - Limit on number of results to return.
             - ``type``: str - Specify transfers 'deposit' or 'withdraw'.
         """
-        return self._get(params=kwargs)
+        return self._get(params=kwargs, model=Transfer)
+
+    def iter_transfers(self, **kwargs) -> Iterator[Union[Dict, Transfer]]:
+        """
+        Lazily iterate over all transfers of funds in/out of the user's
+        accounts, newest first, following the pagination cursors one page at
+        a time.
+
+        **Parameters:**
+            - ``profile_id``: str - Returns list of transfers from this portfolio id.
+            - ``before``: str - Watermark. Iteration stops at the first
+              transfer created at or before this date (i.e. already seen).
+            - ``limit``: int - Page size (defaults to: 100).
+            - ``type``: str - Specify transfers 'deposit' or 'withdraw'.
+        """
+        kwargs.setdefault("limit", 100)
+        return self._paginate(field="created_at", params=kwargs, model=Transfer)
 
-    def get_transfer(self, transfer_id: str) -> Dict:
+    def get_transfer(self, transfer_id: str) -> Union[Response, Transfer]:
         """
         Get information on a single transfer.
 
         :param transfer_id: The transfer ID.
         """
-        return self._get(transfer_id)
+        return self._get(transfer_id, model=Transfer)
 
 
 class Withdrawals(AuthEndpoint):
@@ -487,7 +846,7 @@ class Withdrawals(AuthEndpoint):
             currency: str,
             amount: str,
             **kwargs
-    ) -> Dict:
+    ) -> Response:
         """
         Withdraws funds from the specified `profile_id` to a
         https://www.coinbase.com wallet.
@@ -513,7 +872,7 @@ class Withdrawals(AuthEndpoint):
             currency: str,
             amount: str,
             **kwargs
-    ) -> Dict:
+    ) -> Response:
         """
         Withdraws funds from the specified `profile_id` to an external crypto
         address.
@@ -551,7 +910,7 @@ class Withdrawals(AuthEndpoint):
         )
         return self._post("crypto", json=kwargs)
 
-    def get_fee_estimate(self, currency: str, crypto_address: str, **kwargs) -> Dict:
+    def get_fee_estimate(self, currency: str, crypto_address: str, **kwargs) -> Response:
         """
         Gets the fee estimate for the crypto withdrawal to crypto address.
 
@@ -574,7 +933,7 @@ class Withdrawals(AuthEndpoint):
             currency: str,
             amount: str,
             **kwargs
-    ) -> Dict:
+    ) -> Response:
         """
         Withdraws funds from the specified `profile_id` to a linked external
         payment method.
@@ -602,7 +961,7 @@ class Withdrawals(AuthEndpoint):
 class Fees(AuthEndpoint):
     """`fees` endpoint of the Exchange/Pro API."""
 
-    def get_fees(self) -> Dict:
+    def get_fees(self) -> Union[Response, Fees]:
         """
         Get fees rates and 30 days trailing volume.
 
@@ -612,13 +971,13 @@ class Fees(AuthEndpoint):
         For more information, see:
             https://help.coinbase.com/en/pro/trading-and-funding/trading-rules-and-fees/fees.html
         """
-        return self._get()
+        return self._get(model=Fees)
 
 
 class Fills(AuthEndpoint):
     """`fills` endpoint of the Exchange/Pro API."""
 
-    def get_fills(self, **kwargs) -> List:
+    def get_fills(self, **kwargs) -> Union[Response, List[Fill]]:
         """
         Get a list of fills.
         A fill is a partial or complete match on a specific order.
@@ -659,15 +1018,60 @@ class Fills(AuthEndpoint):
             - ``after``: Used for pagination. Sets end cursor to `after` date.
             - ``market_type``: Market type which the order was filled in.
         """
-        return self._get(params=kwargs)
+        return self._get(params=kwargs, model=Fill)
+
+    def iter_fills(self, **kwargs) -> Iterator[Union[Dict, Fill]]:
+        """
+        Lazily iterate over all fills, sorted by descending `trade_id`,
+        following the `cb-after` cursor one page at a time. Memory usage
+        stays flat regardless of the history length.
+
+        **kwargs:**
+            - ``order_id``: Limit to fills on a specific order.
+              Either `order_id` or `product_id` is required.
+            - ``product_id``: Limit to fills on a specific product.
+              Either `order_id` or `product_id` is required.
+            - ``profile_id``: Get results for a specific profile
+            - ``limit``: Page size (defaults to: 100).
+            - ``before``: Watermark `trade_id` (i.e. the `CB-BEFORE` header
+              of a previous run). Iteration stops as soon as this trade ID
+              is reached, so only newer fills are returned.
+            - ``market_type``: Market type which the order was filled in.
+        """
+        kwargs.setdefault("limit", 100)
+        return self._paginate(field="trade_id", params=kwargs, model=Fill)
 
 
 class Orders(AuthEndpoint):
     """
     `orders` endpoint of the Exchange/Pro API.
+
+    Orders are placed idempotently: each one gets a `client_oid` and is
+    tracked in :attr:`in_flight` until its outcome is known.
+
+    Set :attr:`validator` to a :class:`.validation.OrderValidator` to check
+    and normalise the orders locally before they are sent.
     """
 
-    def get_orders(self, **kwargs) -> List:
+    # local pre-trade validation, `None` to send the orders as given:
+    validator: "OrderValidator" = None
+
+    @property
+    def in_flight(self) -> InFlightOrders:
+        """The orders sent whose outcome is unknown yet, by `client_oid`."""
+        # created on first use, the handler is built by the base classes:
+        return self.__dict__.setdefault("_in_flight", InFlightOrders())
+
+    def _track(self, order: dict) -> str:
+        """Give the `order` a `client_oid` if missing and track it."""
+        if not order.get("client_oid"):
+            order.update(client_oid=str(uuid4()))
+
+        client_oid: str = order.get("client_oid")
+        self.in_flight.add(client_oid, order)
+        return client_oid
+
+    def get_orders(self, **kwargs) -> Union[Response, List[Order]]:
         """
         List your current open orders. Only open or un-settled orders are
         returned by default. As soon as an order is no longer open and settled,
@@ -688,9 +1092,28 @@ class Orders(AuthEndpoint):
             - ``status``: List[str] - Array with order statuses to filter by.
             - ``market_type``: str - Market type which the order was traded in.
         """
-        return self._get(params=kwargs)
+        return self._get(params=kwargs, model=Order)
 
-    def create_order(self, **kwargs) -> Dict:
+    def iter_orders(self, **kwargs) -> Iterator[Union[Dict, Order]]:
+        """
+        Lazily iterate over all orders matching the filters, newest first,
+        following the pagination cursors one page at a time.
+
+        **kwargs:**
+            - ``profile_id``: str - Filter results by a specific `profile_id`.
+            - ``product_id``: str - Filter results by a specific `product_id`.
+            - ``start_date``: str - Filter results by minimum posted date.
+            - ``end_date``: str - Filter results by maximum posted date.
+            - ``before``: str - Watermark. Iteration stops at the first order
+              created at or before this date (i.e. already seen).
+            - ``limit``: int - Page size (defaults to: 100).
+            - ``status``: List[str] - Array with order statuses to filter by.
+            - ``market_type``: str - Market type which the order was traded in.
+        """
+        kwargs.setdefault("limit", 100)
+        return self._paginate(field="created_at", params=kwargs, model=Order)
+
+    def create_order(self, **kwargs) -> Union[Response, Order]:
         """
         Create an order.
         You can place two types of orders: limit and market.
@@ -720,11 +1143,90 @@ class Orders(AuthEndpoint):
             - ``post_only``: bool - If true, order will only execute as a
               maker order
             - ``client_oid``: str - Optional Order ID selected by the user or
-              the frontend client to identify their order
+              the frontend client to identify their order (defaults to: a
+              random UUID)
+
+        **Validation:**
+            With a :attr:`validator`, the order is checked against the
+            product constraints and normalised first, an invalid one raises
+            :class:`.validation.OrderError` without being sent.
+
+        **Idempotency:**
+            Since the order has a `client_oid` it is retried like the
+            idempotent requests. If the outcome is still ambiguous (timeout,
+            dropped connection, `5xx` response, or a retry rejected as a
+            duplicate `client_oid` because an attempt whose response was
+            lost placed the order) the order is looked up once by its
+            `client_oid` and returned if it was placed. When the
+            lookup fails too, the original error is raised and the order is
+            left in :attr:`in_flight` to be resolved later with
+            :meth:`resolve_order`.
+        """
+        if self.validator is not None:
+            kwargs: dict = self.validator.validate(kwargs)
+
+        client_oid: str = self._track(kwargs)
+
+        try:
+            order = self._post(json=kwargs, model=Order)
+        except Exception as error:
+            if not ambiguous(error):
+                self.in_flight.discard(client_oid)
+                raise
+            return self.resolve_order(client_oid, error)
+
+        self.in_flight.discard(client_oid)
+        return order
+
+    def resolve_order(self, client_oid: str, error: Exception = None) -> Union[Response, Order]:
         """
-        return self._post(json=kwargs)
+        Resolve the outcome of an order placed with `client_oid` by looking
+        it up once, and stop tracking it in :attr:`in_flight` if known.
 
-    def del_orders(self, **kwargs) -> Dict:
+        :param client_oid: The client assigned order ID.
+        :param error: Error raised while placing the order, raised instead
+            of the lookup one if the order wasn't found.
+        :return: The order if it was placed.
+        :raises HTTPError: `404` if the order wasn't placed (or was canceled
+            without matches), it is then safe to place it again.
+        """
+        try:
+            order = self.get_order(f"client:{client_oid}")
+        except Exception as lookup:
+            if self._not_found(lookup):
+                self.in_flight.discard(client_oid)
+
+            if error is None:
+                raise
+
+            raise error from lookup
+
+        self.in_flight.discard(client_oid)
+        return order
+
+    @staticmethod
+    def _not_found(error: Exception) -> bool:
+        response = getattr(error, "response", None)
+        return status_error(error) and (response is not None) and (response.status_code == 404)
+
+    def create_orders(self, batch: List[dict], max_workers: int = 10) -> List[BatchResult]:
+        """
+        Create several orders concurrently.
+
+        The requests share the connection pool of the session and are paced
+        by its rate limiter. A failed order doesn't abort the others, every
+        order gets a :class:`.batch.BatchResult` holding either its
+        `create_order()` result or the error raised.
+
+        :param batch: The orders, each one a `dict` with the `create_order()`
+            keyword arguments.
+        :param max_workers: Number of requests in flight (defaults to: 10,
+            the connection pool size of the session).
+        :return: The results in the order of `batch`.
+        """
+        return run_batch(lambda order: self.create_order(**order), batch, max_workers)
+
+    def del_orders(self, **kwargs) -> Response:
         """
         With best effort, cancel all open orders.
         This may require you to make the request multiple times until all
@@ -736,7 +1238,7 @@ class Orders(AuthEndpoint):
         """
         return self._delete(params=kwargs)
 
-    def get_order(self, order_id: str, **kwargs) -> Dict:
+    def get_order(self, order_id: str, **kwargs) -> Union[Response, Order]:
         """
         Get a single order by id.
 
@@ -755,9 +1257,9 @@ class Orders(AuthEndpoint):
             preceded by the client: namespace.
         :param kwargs: Additional keyword arguments.
         """
-        return self._get(order_id, params=kwargs)
+        return self._get(order_id, params=kwargs, model=Order)
 
-    def del_order(self, order_id: str, **kwargs) -> Dict:
+    def del_order(self, order_id: str, **kwargs) -> Response:
         """
         Cancel a single open order by `order_id`.
 
@@ -800,13 +1302,35 @@ class Orders(AuthEndpoint):
         """
         return self._delete(order_id, params=kwargs)
 
+    def cancel_orders(self, order_ids: List[str], max_workers: int = 10, **kwargs) -> List[BatchResult]:
+        """
+        Cancel several orders concurrently.
+
+        The requests share the connection pool of the session and are paced
+        by its rate limiter. A failed cancellation doesn't abort the others,
+        every order gets a :class:`.batch.BatchResult` holding either its
+        `del_order()` result or the error raised.
+
+        **kwargs:**
+            - profile_id: str - Cancels orders on a specific profile
+            - product_id: str - Optional product id of the orders
+
+        :param order_ids: The exchange assigned ids or the client assigned
+            `client_oid` preceded by the client: namespace.
+        :param max_workers: Number of requests in flight (defaults to: 10,
+            the connection pool size of the session).
+        :param kwargs: Additional keyword arguments.
+        :return: The results in the order of `order_ids`.
+        """
+        return run_batch(lambda order_id: self.del_order(order_id, **kwargs), order_ids, max_workers)
+
 
 class Oracle(AuthEndpoint):
     """
     `oracle` endpoint of the Exchange/Pro API.
     """
 
-    def get_signed_prices(self) -> Dict:
+    def get_signed_prices(self) -> Response:
         """
         Get cryptographically signed prices ready to be posted on-chain using
         Compound's Open Oracle smart contract.
@@ -819,7 +1343,7 @@ class Products(Endpoint):
     `products` endpoint of the Exchange/Pro API.
     """
 
-    def get_products(self, **kwargs) -> List:
+    def get_products(self, **kwargs) -> Union[Response, List[Product]]:
         """
         Gets a list of available currency pairs for trading.
 
@@ -880,13 +1404,13 @@ class Products(Endpoint):
             - ``type``: str
 
         """
-        return self._get(params=kwargs)
+        return self._get(params=kwargs, model=Product)
 
-    def get_product(self, product_id: str) -> Dict:
+    def get_product(self, product_id: str) -> Union[Response, Product]:
         """Get information on a single product."""
-        return self._get(product_id)
+        return self._get(product_id, model=Product)
 
-    def get_product_book(self, product_id: str, **kwargs) -> Dict:
+    def get_product_book(self, product_id: str, **kwargs) -> Union[Response, Book]:
         """
         Get a list of open orders for a product.
         The amount of detail shown can be customized with the `level` parameter.
@@ -993,9 +1517,9 @@ class Products(Endpoint):
 
         :param product_id:
         """
-        return self._get(product_id, "book", params=kwargs)
+        return self._get(product_id, "book", params=kwargs, model=Book)
 
-    def get_product_candles(self, product_id: str, **kwargs) -> List[List]:
+    def get_product_candles(self, product_id: str, columnar: bool = False, **kwargs) -> Union[Response, List[Candle], "Candles"]:
         """
         Historic rates for a product.
         Rates are returned in grouped buckets.
@@ -1056,11 +1580,75 @@ class Products(Endpoint):
             - ``end``: str - Timestamp for ending range of aggregations
 
         :param product_id: The product ID (i.e. `BTC-USD`)
+        :param columnar: Return the candles as typed columns
+            (:class:`.columnar.Candles`) instead of the response
+            (defaults to: `False`).
         :param kwargs: Additional keyword arguments.
         """
-        return self._get(product_id, "candles", params=kwargs)
+        if columnar is True:
+            from .columnar import Candles
+            return self._get(product_id, "candles", params=kwargs, parser=Candles.from_payload)
+        return self._get(product_id, "candles", params=kwargs, model=Candle)
+
+    def backfill_candles(
+            self,
+            product_id: str,
+            granularity: int,
+            start: Union[datetime, int, float, str],
+            end: Union[datetime, int, float, str],
+            max_workers: int = 4,
+            checkpoint: str = None,
+            columnar: bool = False,
+            store: "MarketStore" = None
+    ) -> Union[List[List], "Candles"]:
+        """
+        Historic rates for a product over a range of any length.
+
+        The range is split into windows of at most 300 candles which are
+        fetched concurrently within the rate limit. Duplicate or overlapping
+        buckets are dropped and a single list sorted by time (ascending) is
+        returned, using the same candle schema as `get_product_candles()`.
+
+        **Resuming**
+            If `checkpoint` is given, every completed window is appended to
+            that file. Calling again with the same file after a crash only
+            fetches the windows that are still missing.
+
+        **Local store**
+            If `store` is given, the candles it holds are read from it and
+            only the missing windows are fetched, then added to it (once
+            complete, i.e. not the current bucket).
+
+        :param product_id: The product ID (i.e. `BTC-USD`)
+        :param granularity: One of `60`, `300`, `900`, `3600`, `21600` or
+            `86400` seconds.
+        :param start: Start of the range (`datetime`, POSIX or ISO 8601).
+        :param end: End of the range (`datetime`, POSIX or ISO 8601).
+        :param max_workers: Number of requests in flight (defaults to: 4).
+        :param checkpoint: Path of the file used to resume the backfill
+            (defaults to: `None`).
+        :param columnar: Return the candles as typed columns
+            (:class:`.columnar.Candles`) (defaults to: `False`).
+        :param store: Local market data store
+            (see :class:`.store.MarketStore`, defaults to: `None`).
+        """
+        backfill = CandleBackfill(
+            self,
+            product_id=product_id,
+            granularity=granularity,
+            max_workers=max_workers,
+            checkpoint=checkpoint,
+            store=store
+        )
+        candles: List[List] = backfill.run(start, end)
+
+        if columnar is True:
+            from .columnar import Candles
+            return Candles.from_payload(candles)
 
-    def get_product_stats(self, product_id: str) -> Dict:
+        return candles
+
+    def get_product_stats(self, product_id: str) -> Union[Response, Stats]:
         """
         Gets 30day and 24hour stats for a product.
 
@@ -1070,9 +1658,9 @@ class Products(Endpoint):
 
         :param product_id: The product ID (i.e. `BTC-USD`)
         """
-        return self._get(product_id, "stats")
+        return self._get(product_id, "stats", model=Stats)
 
-    def get_product_ticker(self, product_id: str) -> Dict:
+    def get_product_ticker(self, product_id: str) -> Union[Response, Ticker]:
         """
         Gets snapshot information about the last trade (tick),
         best bid/ask and 24h volume.
@@ -1084,9 +1672,49 @@ class Products(Endpoint):
 
         :param product_id: The product ID (i.e. `BTC-USD`)
         """
-        return self._get(product_id, "ticker")
+        return self._get(product_id, "ticker", model=Ticker)
+
+    def snapshot(self, kind: str = "ticker", product_ids: List[str] = None, max_workers: int = 10) -> "Snapshot":
+        """
+        Market-wide snapshot of the tickers, stats or inside books of
+        several products, fetched concurrently.
+
+        The requests share the connection pool of the session and are paced
+        by its rate limiter. A failed product doesn't fail the snapshot, its
+        error is kept in `Snapshot.errors`.
 
-    def get_product_trades(self, product_id: str, **kwargs) -> List[Dict]:
+        :param kind: What to fetch for each product: `ticker`
+            (:meth:`get_product_ticker`), `stats` (:meth:`get_product_stats`)
+            or `book` (the best bid and ask of :meth:`get_product_book`)
+            (defaults to: `ticker`).
+        :param product_ids: The product IDs (defaults to: all the products
+            listed by :meth:`get_products` that are not delisted).
+        :param max_workers: Number of requests in flight (defaults to: 10,
+            the connection pool size of the session).
+        :return: A columnar :class:`.columnar.Snapshot` timestamped when the
+            requests started.
+        """
+        from .columnar import Snapshot
+
+        if kind not in Snapshot.KINDS:
+            raise ValueError(f"Unknown snapshot kind: {kind!r}! Expected one of: {', '.join(Snapshot.KINDS)}.")
+
+        if product_ids is None:
+            product_ids: List[str] = self._product_ids(self._get(parser=list))
+
+        timestamp: float = time()
+        results: List[BatchResult] = run_batch(
+            lambda product_id: self._get(product_id, kind, parser=dict),
+            product_ids,
+            max_workers
+        )
+        return Snapshot.from_results(kind, results, timestamp)
+
+    @staticmethod
+    def _product_ids(products: List[Dict]) -> List[str]:
+        return [product.get("id") for product in products if product.get("status") != "delisted"]
+
+    def get_product_trades(self, product_id: str, columnar: bool = False, **kwargs) -> Union[Response, List[Trade], "Trades"]:
         """
         Gets a list the latest trades for a product.
 
@@ -1104,9 +1732,101 @@ class Products(Endpoint):
             - ``after``: int
 
         :param product_id: The product ID (i.e. `BTC-USD`)
+        :param columnar: Return the trades as typed, decimal safe columns
+            (:class:`.columnar.Trades`) instead of the response
+            (defaults to: `False`).
         :param kwargs: Additional keyword arguments.
         """
-        return self._get(product_id, "trades", params=kwargs)
+        if columnar is True:
+            from .columnar import Trades
+            return self._get(product_id, "trades", params=kwargs, parser=Trades.from_payload)
+        return self._get(product_id, "trades", params=kwargs, model=Trade)
+
+    def download_trades(
+            self,
+            product_id: str,
+            first_id: int = None,
+            last_id: int = None,
+            start: Union[datetime, int, float, str] = None,
+            end: Union[datetime, int, float, str] = None,
+            forward: bool = False,
+            batch_size: int = 10000,
+            max_workers: int = 4
+    ) -> TradeDownloader:
+        """
+        Streaming download of the public trades of a product over a range
+        of any length, by trade IDs or by time.
+
+        Pages are requested `max_workers` at a time and the trades are
+        regrouped in batches of `batch_size`, so memory stays bounded::
+
+            downloader = products.download_trades("BTC-USD", start=..., end=...)
+
+            for batch in downloader.batches():  # `.columnar.Trades`
+                ...
+
+            downloader.to_csv("trades.csv")
+            downloader.to_parquet("trades.parquet")  # requires `pyarrow`
+            downloader.to_store(MarketStore())
+
+        With the :mod:`.aio` handlers use the asynchronous methods
+        (`abatches()`, `ato_csv()`, `ato_parquet()`, `ato_store()`).
+
+        See :class:`.trades.TradeDownloader` for the parameters.
+        """
+        return TradeDownloader(
+            self,
+            product_id=product_id,
+            first_id=first_id,
+            last_id=last_id,
+            start=start,
+            end=end,
+            forward=forward,
+            batch_size=batch_size,
+            max_workers=max_workers
+        )
+
+    def backfill_trades(
+            self,
+            product_id: str,
+            first_id: int,
+            last_id: int,
+            max_workers: int = 4,
+            store: "MarketStore" = None
+    ) -> "Trades":
+        """
+        Public trades of a product with an ID in `[first_id, last_id]`, as
+        typed, decimal safe columns (:class:`.columnar.Trades`) sorted by
+        trade ID.
+
+        The range is fetched 1000 trades per request, `max_workers` requests
+        at a time (see :meth:`download_trades` for ranges too long to be
+        held in memory).
+
+        **Local store**
+            If `store` is given, the trades it holds are read from it and
+            only the missing ID ranges are fetched, then added to it.
+
+        :param product_id: The product ID (i.e. `BTC-USD`)
+        :param first_id: First trade ID of the range.
+        :param last_id: Last trade ID of the range.
+        :param max_workers: Number of requests in flight (defaults to: 4).
+        :param store: Local market data store
+            (see :class:`.store.MarketStore`, defaults to: `None`).
+        """
+        from .columnar import Trades
+
+        downloader: TradeDownloader = self.download_trades(
+            product_id, first_id, last_id, forward=True, max_workers=max_workers
+        )
+
+        if store is None:
+            return Trades.from_payload(
+                [trade for batch in downloader.batches(columnar=False) for trade in batch]
+            )
+
+        downloader.to_store(store)
+        return store.trades_by_id(product_id, first_id, last_id)
 
 
 class Profiles(AuthEndpoint):
@@ -1114,7 +1834,7 @@ class Profiles(AuthEndpoint):
     `profiles` endpoint of the Exchange/Pro API.
     """
 
-    def get_profiles(self, **kwargs) -> List[Dict]:
+    def get_profiles(self, **kwargs) -> Union[Response, List[Profile]]:
         """
         Gets a list of all of the current user's profiles.
 
@@ -1127,9 +1847,9 @@ class Profiles(AuthEndpoint):
             kwargs.update(
                 active=str(kwargs.get("active")).lower()
             )
-        return self._get(params=kwargs)
+        return self._get(params=kwargs, model=Profile)
 
-    def create_profile(self, name: str) -> Dict:
+    def create_profile(self, name: str) -> Union[Response, Profile]:
         """
         Create a new profile.
         Will fail if no name is provided or if user already has max number of
@@ -1138,10 +1858,11 @@ class Profiles(AuthEndpoint):
         :param name: Profile name.
         """
         return self._post(
-            json={"name": name}
+            json={"name": name},
+            model=Profile
         )
 
-    def transfer_funds(self, from_profile: str, to_profile: str, currency: str, amount: str) -> Dict:
+    def transfer_funds(self, from_profile: str, to_profile: str, currency: str, amount: str) -> Response:
         """
         Transfer an amount of currency from one profile to another.
         """
@@ -1155,7 +1876,7 @@ class Profiles(AuthEndpoint):
             }
         )
 
-    def get_profile(self, profile_id: str, **kwargs) -> Dict:
+    def get_profile(self, profile_id: str, **kwargs) -> Union[Response, Profile]:
         """
         Information for a single profile.
         Use this endpoint when you know the `profile_id`.
@@ -1167,9 +1888,9 @@ class Profiles(AuthEndpoint):
             kwargs.update(
                 active=str(kwargs.get("active")).lower()
             )
-        return self._get(profile_id, params=kwargs)
+        return self._get(profile_id, params=kwargs, model=Profile)
 
-    def rename_profile(self, profile_id: str, **kwargs) -> Dict:
+    def rename_profile(self, profile_id: str, **kwargs) -> Response:
         """
         Rename a profile. Names 'default' and 'margin' are reserved.
 
@@ -1182,7 +1903,7 @@ class Profiles(AuthEndpoint):
         """
         return self._put(profile_id, json=kwargs)
 
-    def del_profile(self, profile_id: str, **kwargs) -> Dict:
+    def del_profile(self, profile_id: str, **kwargs) -> Response:
         """
         Deletes the profile specified by `profile_id` and transfers all funds
         to the profile specified by `to`. Fails if there are any open orders
@@ -1201,7 +1922,7 @@ class Profiles(AuthEndpoint):
 class Reports(AuthEndpoint):
     """`reports` endpoint of the Exchange/Pro API."""
 
-    def get_reports(self, **kwargs) -> List[Dict]:
+    def get_reports(self, **kwargs) -> Response:
         """
         Gets a list of all user generated reports.
 
@@ -1229,7 +1950,7 @@ class Reports(AuthEndpoint):
         """
         return self._get(params=kwargs)
 
-    def create_report(self, **kwargs) -> Dict:
+    def create_report(self, **kwargs) -> Response:
         """
         Generates a report.
         You can create reports with historical data for all report types.
@@ -1425,7 +2146,7 @@ class Reports(AuthEndpoint):
         """
         return self._post(json=kwargs)
 
-    def get_report(self, report_id: str) -> Dict:
+    def get_report(self, report_id: str) -> Response:
         """
         Get a specific report by `report_id`.
 
@@ -1443,7 +2164,7 @@ class Reports(AuthEndpoint):
 class Users(AuthEndpoint):
     """`users` endpoint of the Exchange/Pro API."""
 
-    def get_exchange_limits(self, user_id: str) -> Dict:
+    def get_exchange_limits(self, user_id: str) -> Response:
         """
         Gets exchange limits information for a single user.
 
@@ -1459,11 +2180,11 @@ class Users(AuthEndpoint):
 class WrappedAssets(Endpoint):
     """`wrapped-assets` endpoint of the Exchange/Pro API."""
 
-    def get_assets(self) -> Dict:
+    def get_assets(self) -> Response:
         """Returns a list of all supported wrapped assets details objects."""
         return self._get()
 
-    def get_asset_details(self, wrapped_asset_id: str) -> Dict:
+    def get_asset_details(self, wrapped_asset_id: str) -> Response:
         """
         Returns the circulating and total supply of a wrapped asset, and its
         conversion rate.
@@ -1500,7 +2221,7 @@ class WrappedAssets(Endpoint):
         """
         return self._get(wrapped_asset_id)
 
-    def get_asset_conversion_rate(self, wrapped_asset_id: str):
+    def get_asset_conversion_rate(self, wrapped_asset_id: str) -> Response:
         """
         Returns the conversion rate of a wrapped asset
 
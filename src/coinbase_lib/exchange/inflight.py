@@ -0,0 +1,127 @@
+# -*- coding: UTF-8 -*-
+
+from collections import OrderedDict
+from sys import modules
+from threading import Lock
+from typing import Dict, List, Tuple
+
+from requests import ConnectionError, HTTPError, Timeout
+
+from .constants import MAX_IN_FLIGHT
+from ..retry import CircuitOpenError
+
+__all__ = ["InFlightOrders", "ambiguous", "duplicate", "retries", "status_error"]
+
+
+def status_error(error: Exception) -> bool:
+    """
+    Whether an error is raised for an error response: a `requests`
+    `HTTPError` (synchronous handlers) or an `httpx` `HTTPStatusError`
+    (asynchronous handlers).
+    """
+    if isinstance(error, HTTPError):
+        return True
+
+    httpx = modules.get("httpx")
+    return (httpx is not None) and isinstance(error, httpx.HTTPStatusError)
+
+
+def duplicate(error: Exception) -> bool:
+    """Whether an error is the rejection of an order `client_oid` already used."""
+    return status_error(error) and ("duplicate" in str(error).lower())
+
+
+def retries(response) -> int:
+    """Number of retries made before getting `response`."""
+    # `urllib3` keeps the history on the raw response of `requests`, the
+    # asynchronous sessions count them in the `httpx` response extensions:
+    history = getattr(getattr(response, "raw", None), "retries", None)
+
+    if history is not None:
+        return len(history.history)
+
+    return (getattr(response, "extensions", None) or {}).get("retries", 0)
+
+
+def ambiguous(error: Exception) -> bool:
+    """
+    Whether an error raised while placing an order leaves its outcome
+    unknown: the request may have reached the exchange (timeouts, dropped
+    connections, `5xx` responses, or a `4xx` response to a retry, i.e. a
+    duplicate `client_oid`) as opposed to a rejection of the first attempt
+    (`4xx` responses) or a request never sent (open circuit breaker).
+    """
+    if isinstance(error, CircuitOpenError):
+        return False
+
+    if isinstance(error, (Timeout, ConnectionError)):
+        return True
+
+    if status_error(error):
+        response = getattr(error, "response", None)
+
+        if (response is None) or (response.status_code >= 500):
+            return True
+
+        # a retried order rejected (i.e. as a duplicate `client_oid`) may
+        # have been placed by an attempt whose response was lost:
+        return duplicate(error) or (retries(response) > 0)
+
+    # the asynchronous handlers raise the `httpx` transport errors:
+    httpx = modules.get("httpx")
+    return (httpx is not None) and isinstance(error, httpx.TransportError)
+
+
+class InFlightOrders:
+    """
+    Thread-safe bounded map of the orders sent and not acknowledged yet,
+    by `client_oid`.
+
+    An order stays in it while its outcome is unknown, i.e. after an
+    ambiguous failure whose lookup failed too, so it can be resolved later
+    with :meth:`.endpoints.Orders.resolve_order`. When full, the oldest
+    entries are dropped.
+    """
+
+    def __init__(self, maxsize: int = MAX_IN_FLIGHT):
+        """
+        :param maxsize: Maximum number of orders kept
+            (defaults to: `MAX_IN_FLIGHT`).
+        """
+        self.maxsize: int = maxsize
+        self._orders: OrderedDict = OrderedDict()
+        self._lock: Lock = Lock()
+
+    def __reduce__(self):
+        # the pending orders belong to the process that sent them:
+        return self.__class__, (self.maxsize,)
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def __contains__(self, client_oid: str) -> bool:
+        return client_oid in self._orders
+
+    def add(self, client_oid: str, order: dict):
+        """Track the `order` parameters sent with `client_oid`."""
+        with self._lock:
+            self._orders[client_oid] = order
+            self._orders.move_to_end(client_oid)
+
+            while len(self._orders) > self.maxsize:
+                self._orders.popitem(last=False)
+
+    def get(self, client_oid: str) -> dict:
+        """The parameters of an order in flight, `None` if not tracked."""
+        with self._lock:
+            return self._orders.get(client_oid)
+
+    def discard(self, client_oid: str):
+        """Stop tracking an order whose outcome is known."""
+        with self._lock:
+            self._orders.pop(client_oid, None)
+
+    def items(self) -> List[Tuple[str, Dict]]:
+        """The `(client_oid, order)` pairs in flight, oldest first."""
+        with self._lock:
+            return list(self._orders.items())
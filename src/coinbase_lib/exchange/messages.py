@@ -0,0 +1,191 @@
+# -*- coding: UTF-8 -*-
+
+from typing import Dict
+
+__all__ = [
+    "Message",
+    "Unknown",
+    "Subscriptions",
+    "Heartbeat",
+    "Ticker",
+    "Snapshot",
+    "L2Update",
+    "Match",
+    "Received",
+    "Open",
+    "Done",
+    "Change",
+    "Error",
+]
+
+# message classes by `type`:
+MESSAGES: Dict[str, type] = {}
+
+
+class Message:
+    """Base websocket feed message."""
+
+    __slots__ = ("type",)
+
+    # message types handled by this class:
+    types: tuple = ()
+
+    # all field names, including the inherited ones:
+    _fields: tuple = ("type",)
+
+    def __init_subclass__(cls, **kwargs):
+        super(Message, cls).__init_subclass__(**kwargs)
+        cls._fields = cls._fields + cls.__slots__
+
+        for name in cls.types:
+            MESSAGES[name] = cls
+
+    @staticmethod
+    def from_payload(payload: dict) -> "Message":
+        """Build the typed message matching the `type` of `payload`."""
+        cls: type = MESSAGES.get(payload.get("type"), Unknown)
+        return cls(payload)
+
+    def __init__(self, payload: dict):
+        for name in self._fields:
+            setattr(self, name, payload.get(name))
+
+    def __repr__(self) -> str:
+        fields: str = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._fields)
+        return f"{self.__class__.__name__}({fields})"
+
+
+class Unknown(Message):
+    """Message of a type not handled by this library."""
+
+    __slots__ = ("payload",)
+
+    def __init__(self, payload: dict):
+        super(Unknown, self).__init__(payload)
+        self.payload: dict = payload
+
+
+class Subscriptions(Message):
+    """Confirmation of the current subscriptions."""
+
+    __slots__ = ("channels",)
+    types: tuple = ("subscriptions",)
+
+
+class Error(Message):
+    """Error reported by the server."""
+
+    __slots__ = ("message", "reason")
+    types: tuple = ("error",)
+
+
+class Heartbeat(Message):
+    """`heartbeat` channel message."""
+
+    __slots__ = ("product_id", "sequence", "last_trade_id", "time")
+    types: tuple = ("heartbeat",)
+
+
+class Ticker(Message):
+    """`ticker` channel message."""
+
+    __slots__ = (
+        "product_id",
+        "sequence",
+        "trade_id",
+        "price",
+        "open_24h",
+        "volume_24h",
+        "low_24h",
+        "high_24h",
+        "volume_30d",
+        "best_bid",
+        "best_bid_size",
+        "best_ask",
+        "best_ask_size",
+        "side",
+        "last_size",
+        "time",
+    )
+    types: tuple = ("ticker",)
+
+
+class Snapshot(Message):
+    """`level2` channel initial snapshot of the book."""
+
+    __slots__ = ("product_id", "bids", "asks")
+    types: tuple = ("snapshot",)
+
+
+class L2Update(Message):
+    """`level2` channel update, `changes` holds `[side, price, size]` items."""
+
+    __slots__ = ("product_id", "changes", "time")
+    types: tuple = ("l2update",)
+
+
+class Match(Message):
+    """`matches` (or `full`) channel trade."""
+
+    __slots__ = (
+        "product_id",
+        "sequence",
+        "trade_id",
+        "maker_order_id",
+        "taker_order_id",
+        "side",
+        "size",
+        "price",
+        "time",
+    )
+    types: tuple = ("match", "last_match")
+
+
+class Received(Message):
+    """`full` channel: a valid order has been received."""
+
+    __slots__ = (
+        "product_id",
+        "sequence",
+        "order_id",
+        "order_type",
+        "client_oid",
+        "side",
+        "size",
+        "price",
+        "funds",
+        "time",
+    )
+    types: tuple = ("received",)
+
+
+class Open(Message):
+    """`full` channel: the order is now open on the book."""
+
+    __slots__ = ("product_id", "sequence", "order_id", "side", "price", "remaining_size", "time")
+    types: tuple = ("open",)
+
+
+class Done(Message):
+    """`full` channel: the order is no longer on the book."""
+
+    __slots__ = ("product_id", "sequence", "order_id", "side", "price", "remaining_size", "reason", "time")
+    types: tuple = ("done",)
+
+
+class Change(Message):
+    """`full` channel: an order has changed (size or funds)."""
+
+    __slots__ = (
+        "product_id",
+        "sequence",
+        "order_id",
+        "side",
+        "price",
+        "new_size",
+        "old_size",
+        "new_funds",
+        "old_funds",
+        "time",
+    )
+    types: tuple = ("change",)
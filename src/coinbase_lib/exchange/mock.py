@@ -0,0 +1,1434 @@
+# -*- coding: UTF-8 -*-
+
+"""
+Local stand-in of the Exchange/Pro API for offline, deterministic load and
+latency testing.
+
+:class:`MockExchange` serves the routes of :mod:`.endpoints` over plain
+HTTP (and optionally the websocket feed) from background threads, and
+registers itself as an API environment::
+
+    with MockExchange(latency=0.005, errors=0.01) as mock:
+        products = Products(environment=mock.environment)
+        ticker = products.get_product_ticker("BTC-USD")
+
+The market data is a deterministic function of the time and trade IDs, so
+two runs see the same prices. The websocket feed requires the optional
+`websockets` package.
+"""
+
+from asyncio import CancelledError, Event as AsyncEvent, create_task, new_event_loop, sleep as async_sleep
+from base64 import b64decode, b64encode
+from collections import Counter, deque
+from datetime import datetime, timezone
+from hashlib import blake2b, sha256
+from hmac import HMAC, compare_digest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import dumps
+from logging import Logger, getLogger
+from math import floor, sin
+from random import Random
+from threading import Event, Lock, Thread
+from time import sleep, time
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qs, unquote, urlsplit
+from uuid import NAMESPACE_URL, UUID, uuid5
+
+from .constants import EXCHANGE, GRANULARITIES, MAX_CANDLES, WEBSOCKET
+from ..constants import ENCODING, NAME
+from ..utils import encode, loads, missing_dependency, to_posix
+
+__all__ = ["MockExchange"]
+
+# `(product ID, reference price, quote increment, base increment, minimum funds)`:
+PRODUCTS: tuple = (
+    ("BTC-USD", 60000, "0.01", "0.00000001", "1"),
+    ("ETH-USD", 3000, "0.01", "0.00000001", "1"),
+    ("SOL-USD", 150, "0.01", "0.00000001", "1"),
+    ("LTC-USD", 80, "0.01", "0.00000001", "1"),
+    ("DOGE-USD", 0.15, "0.00001", "0.1", "1"),
+    ("USDT-USD", 1, "0.00001", "0.01", "1"),
+    ("BTC-EUR", 55000, "0.01", "0.00000001", "1"),
+    ("ETH-BTC", 0.05, "0.00001", "0.00000001", "0.00001"),
+)
+
+FIAT: tuple = ("USD", "EUR", "GBP")
+
+# routes served without authentication:
+PUBLIC: tuple = ("time", "products", "currencies", "wrapped-assets")
+
+# seconds between two synthetic public trades of a product:
+TRADE_SPACING: float = 0.5
+
+# number of items of the synthetic account histories (ledger, holds, ...):
+HISTORY: int = 250
+
+# price levels by side of the level 2 and 3 books:
+DEPTH: int = 50
+
+Reply = Tuple[int, Any, Dict[str, str]]
+
+
+def _iso(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _uuid(*names) -> str:
+    """Deterministic UUID of a mock resource."""
+    return str(uuid5(NAMESPACE_URL, "/".join(str(name) for name in names)))
+
+
+def _places(increment: str) -> int:
+    return len(increment.partition(".")[2].rstrip("0")) if "." in increment else 0
+
+
+def _error(status: int, message: str) -> Reply:
+    return status, {"message": message}, {}
+
+
+class _Market:
+    """Deterministic synthetic market of a product."""
+
+    __slots__ = ("id", "base", "quote", "price", "quote_increment", "base_increment", "min_funds", "places", "size_places")
+
+    def __init__(self, product_id: str, price: float, quote_increment: str, base_increment: str, min_funds: str):
+        self.id: str = product_id
+        self.base, _, self.quote = product_id.partition("-")
+        self.price: float = price
+        self.quote_increment: str = quote_increment
+        self.base_increment: str = base_increment
+        self.min_funds: str = min_funds
+        self.places: int = _places(quote_increment)
+        self.size_places: int = _places(base_increment)
+
+    def price_at(self, timestamp: float) -> float:
+        """The mid price at `timestamp`: a slow wave plus a fast ripple."""
+        return self.price * (1 + 0.01 * sin(timestamp / 900) + 0.002 * sin(timestamp / 37))
+
+    def fmt(self, price: float) -> str:
+        return f"{max(price, float(self.quote_increment)):.{self.places}f}"
+
+    def size(self, seed: int) -> str:
+        units: float = (1 + (seed * 37) % 500) * 0.001 / (self.price / 100) ** 0.5
+        return f"{max(units, float(self.base_increment)):.{self.size_places}f}"
+
+    def payload(self) -> dict:
+        return {
+            "id": self.id,
+            "base_currency": self.base,
+            "quote_currency": self.quote,
+            "quote_increment": self.quote_increment,
+            "base_increment": self.base_increment,
+            "display_name": self.id.replace("-", "/"),
+            "min_market_funds": self.min_funds,
+            "margin_enabled": False,
+            "post_only": False,
+            "limit_only": False,
+            "cancel_only": False,
+            "status": "online",
+            "status_message": "",
+            "trading_disabled": False,
+            "fx_stablecoin": self.base in ("USDT", "USDC"),
+            "max_slippage_percentage": "0.03000000",
+            "auction_mode": False,
+        }
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads: bool = True
+    mock: "MockExchange" = None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Request handler dispatching to the :class:`MockExchange` of its server."""
+
+    # keep-alive, so clients reuse their pooled connections:
+    protocol_version: str = "HTTP/1.1"
+    # headers and body are written separately, don't wait for delayed ACKs:
+    disable_nagle_algorithm: bool = True
+    server_version: str = "MockExchange"
+
+    def do_GET(self):
+        self.server.mock.handle(self, "GET")
+
+    def do_POST(self):
+        self.server.mock.handle(self, "POST")
+
+    def do_PUT(self):
+        self.server.mock.handle(self, "PUT")
+
+    def do_DELETE(self):
+        self.server.mock.handle(self, "DELETE")
+
+    def log_message(self, format: str, *args):
+        self.server.mock._log.debug(f"MockExchange: {format % args}")
+
+
+class MockExchange:
+    """
+    Local mock of the Exchange/Pro API REST endpoints and websocket feed.
+
+    **Routes:**
+        All the routes used by :mod:`.endpoints`, with payloads following
+        the API schemas: the market data (products, books, candles, stats,
+        tickers, trades) is synthetic, orders are kept in memory (limit
+        orders rest on the book, market orders fill at once) and the other
+        private routes return plausible static data. Lists are paginated
+        with the `limit`, `before` and `after` parameters and the
+        `cb-before`/`cb-after` headers. Products, currencies and wrapped
+        assets are sent with an `ETag` and answer `304` to conditional
+        requests.
+
+    **Authentication:**
+        With a `secret`, the private routes verify the `CB-ACCESS-*` headers
+        (key, passphrase, timestamp within 30 seconds and HMAC signature)
+        and answer `401` like the API.
+
+    **Faults:**
+        Every request waits `latency` seconds plus a random `jitter`, then
+        fails with a `429` with probability `throttle` or a `5xx` with
+        probability `errors`. :meth:`fail` queues failures for the next
+        requests, for deterministic tests. The randomness is seeded.
+    """
+
+    def __init__(
+            self,
+            host: str = "127.0.0.1",
+            port: int = 0,
+            key: str = None,
+            passphrase: str = None,
+            secret: str = None,
+            latency: float = 0,
+            jitter: float = 0,
+            errors: float = 0,
+            throttle: float = 0,
+            products: Union[int, List[str]] = None,
+            websocket: bool = False,
+            interval: float = 0.1,
+            environment: str = "local",
+            seed: int = 0,
+            logger: Logger = None
+    ):
+        """
+        :param host: Interface to listen on (defaults to: `127.0.0.1`).
+        :param port: Port to listen on (defaults to: a free one).
+        :param key: The API key accepted (defaults to: any).
+        :param passphrase: The API passphrase accepted (defaults to: any).
+        :param secret: The API secret verifying the signatures
+            (defaults to: `None`, no verification).
+        :param latency: Seconds every request is delayed (defaults to: 0).
+        :param jitter: Maximum random seconds added to the latency
+            (defaults to: 0).
+        :param errors: Probability of a `500`, `502`, `503` or `504`
+            response (defaults to: 0).
+        :param throttle: Probability of a `429` response (defaults to: 0).
+        :param products: The product IDs listed, or their number (padded
+            with synthetic `-USD` products) (defaults to: a few majors).
+        :param websocket: Serve the websocket feed too, requires the
+            optional `websockets` package, the `ws` extra
+            (defaults to: `False`).
+        :param interval: Seconds between two websocket feed updates
+            (defaults to: 0.1).
+        :param environment: The API environment name registered while
+            running (defaults to: `local`).
+        :param seed: Seed of the faults and latency jitter (defaults to: 0).
+        :param logger: The handler to be used for logging.
+        """
+        self.host: str = host
+        self.port: int = port
+        self.key: str = key
+        self.passphrase: str = passphrase
+        self.latency: float = latency
+        self.jitter: float = jitter
+        self.errors: float = errors
+        self.throttle: float = throttle
+        self.websocket: bool = websocket
+        self.interval: float = interval
+        self.environment: str = environment
+
+        # served requests by `<method> <endpoint>` and responses by status:
+        self.requests: Counter = Counter()
+        self.statuses: Counter = Counter()
+
+        self._secret: bytes = b64decode(encode(secret, encoding=ENCODING)) if secret is not None else None
+        self._log: Logger = logger or getLogger(NAME)
+        self._random: Random = Random(seed)
+        self._failures: Deque[Tuple[int, str, bool]] = deque()
+        self._lock: Lock = Lock()
+
+        self._markets: Dict[str, _Market] = self._build_markets(products)
+        self._started: float = floor(time())
+        self._orders: Dict[str, dict] = {}
+        self._client_oids: Dict[str, str] = {}
+        self._fills: List[dict] = []
+        self._profiles: Dict[str, dict] = {}
+        self._conversions: Dict[str, dict] = {}
+        self._reports: Dict[str, dict] = {}
+        self._sequence: int = 0
+        self._created: float = 0
+
+        profile_id: str = _uuid("profile", "default")
+        self._profiles[profile_id] = {
+            "id": profile_id,
+            "user_id": _uuid("user"),
+            "name": "default",
+            "active": True,
+            "is_default": True,
+            "has_margin": False,
+            "created_at": _iso(self._started - 86400 * 365),
+        }
+
+        self._routes: dict = {
+            "time": self._time,
+            "products": self._products,
+            "currencies": self._currencies,
+            "wrapped-assets": self._wrapped_assets,
+            "accounts": self._accounts,
+            "address-book": self._address_book,
+            "coinbase-accounts": self._coinbase_accounts,
+            "conversions": self._conversions_route,
+            "deposits": self._transfer_request,
+            "withdrawals": self._transfer_request,
+            "payment-methods": self._payment_methods,
+            "transfers": self._transfers,
+            "fees": self._fees,
+            "fills": self._fills_route,
+            "orders": self._orders_route,
+            "oracle": self._oracle,
+            "profiles": self._profiles_route,
+            "reports": self._reports_route,
+            "users": self._users,
+        }
+
+        self._server: _Server = None
+        self._thread: Thread = None
+        self._ws_port: int = None
+        self._ws_thread: Thread = None
+        self._ws_loop = None
+        self._ws_stop = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    @staticmethod
+    def _build_markets(products: Union[int, List[str]]) -> Dict[str, _Market]:
+        known: Dict[str, tuple] = {item[0]: item for item in PRODUCTS}
+
+        if products is None:
+            product_ids: List[str] = list(known)
+        elif isinstance(products, int):
+            product_ids: List[str] = list(known)[:products]
+            product_ids.extend(f"T{index:03d}-USD" for index in range(products - len(product_ids)))
+        else:
+            product_ids: List[str] = list(products)
+
+        markets: Dict[str, _Market] = {}
+
+        for index, product_id in enumerate(product_ids):
+            spec: tuple = known.get(product_id) or (product_id, 10 + (index * 7919) % 990, "0.01", "0.0001", "1")
+            markets[product_id] = _Market(*spec)
+
+        return markets
+
+    @property
+    def url(self) -> str:
+        """Base URL of the REST API."""
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def ws_url(self) -> Optional[str]:
+        """URL of the websocket feed, if served."""
+        return None if self._ws_port is None else f"ws://{self.host}:{self._ws_port}"
+
+    def start(self):
+        """Start serving in background (daemon) threads and register the environment."""
+        if self._server is not None:
+            return
+
+        self._server = _Server((self.host, self.port), _Handler)
+        self._server.mock = self
+        self.port = self._server.server_address[1]
+        self._thread = Thread(target=self._server.serve_forever, name=f"{NAME}-mock", daemon=True)
+        self._thread.start()
+        EXCHANGE[self.environment] = self.url
+
+        if self.websocket:
+            ready: Event = Event()
+            self._ws_thread = Thread(target=self._serve_websocket, args=(ready,), name=f"{NAME}-mock-ws", daemon=True)
+            self._ws_thread.start()
+            ready.wait()
+
+            if self._ws_port is None:
+                self.stop()
+                raise missing_dependency("the websocket mock", "websockets", "ws")
+
+            WEBSOCKET[self.environment] = self.ws_url
+
+    def stop(self):
+        """Stop serving and unregister the environment."""
+        if self._ws_loop is not None:
+            self._ws_loop.call_soon_threadsafe(self._ws_stop.set)
+            self._ws_thread.join()
+            self._ws_loop = None
+            self._ws_port = None
+            WEBSOCKET.pop(self.environment, None)
+
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+            EXCHANGE.pop(self.environment, None)
+
+    def fail(self, status: int, count: int = 1, message: str = None, processed: bool = False):
+        """
+        Fail the next `count` requests with `status`.
+
+        :param status: The HTTP status code (i.e. `429` or `503`).
+        :param count: Number of requests failing (defaults to: 1).
+        :param message: The error message (defaults to: one matching the
+            status).
+        :param processed: Handle the requests before failing them, as when
+            the response is lost (defaults to: `False`).
+        """
+        with self._lock:
+            self._failures.extend([(status, message or self._message(status), processed)] * count)
+
+    @staticmethod
+    def _message(status: int) -> str:
+        if status == 429:
+            return "Public rate limit exceeded"
+
+        if status >= 500:
+            return "Internal server error"
+
+        return "Bad request"
+
+    def _fault(self) -> Optional[Tuple[int, str, bool]]:
+        """Wait the request latency and draw its injected failure, if any."""
+        with self._lock:
+            delay: float = self.latency + (self._random.uniform(0, self.jitter) if self.jitter > 0 else 0)
+
+            if len(self._failures) > 0:
+                failure: Tuple[int, str, bool] = self._failures.popleft()
+            elif (self.throttle > 0) and (self._random.random() < self.throttle):
+                failure: Tuple[int, str, bool] = (429, self._message(429), False)
+            elif (self.errors > 0) and (self._random.random() < self.errors):
+                failure: Tuple[int, str, bool] = (self._random.choice((500, 502, 503, 504)), self._message(500), False)
+            else:
+                failure = None
+
+        if delay > 0:
+            sleep(delay)
+
+        return failure
+
+    def handle(self, handler: BaseHTTPRequestHandler, method: str):
+        """Answer the request read by `handler`."""
+        url = urlsplit(handler.path)
+        args: List[str] = [unquote(item) for item in url.path.strip("/").split("/") if item]
+        params: Dict[str, Any] = {
+            name: values if len(values) > 1 else values[0]
+            for name, values in parse_qs(url.query).items()
+        }
+        length: int = int(handler.headers.get("Content-Length") or 0)
+        body: bytes = handler.rfile.read(length) if length > 0 else b""
+        endpoint: str = args[0] if len(args) > 0 else ""
+
+        self.requests[f"{method} {endpoint}"] += 1
+        failure: Optional[Tuple[int, str, bool]] = self._fault()
+
+        if (failure is not None) and (not failure[2]):
+            status, payload, headers = _error(*failure[:2])
+        elif endpoint not in self._routes:
+            status, payload, headers = _error(404, "NotFound")
+        else:
+            error: Optional[str] = None if endpoint in PUBLIC else self._verify(method, handler.path, body, handler.headers)
+
+            if error is not None:
+                status, payload, headers = _error(401, error)
+            else:
+                try:
+                    data: dict = loads(body) if len(body) > 0 else {}
+                except ValueError:
+                    status, payload, headers = _error(400, "Invalid JSON body")
+                else:
+                    status, payload, headers = self._route(endpoint, method, args[1:], params, data)
+
+            if failure is not None:
+                status, payload, headers = _error(*failure[:2])
+
+        if (status == 200) and ("ETag" in headers) and (handler.headers.get("If-None-Match") == headers.get("ETag")):
+            status, payload = 304, None
+
+        self.statuses[status] += 1
+        content: bytes = b"" if payload is None else encode(dumps(payload, separators=(",", ":")), encoding=ENCODING)
+
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(content)))
+
+        for name, value in headers.items():
+            handler.send_header(name, value)
+
+        handler.end_headers()
+        handler.wfile.write(content)
+
+    def _route(self, endpoint: str, method: str, args: List[str], params: dict, data: dict) -> Reply:
+        try:
+            return self._routes.get(endpoint)(method, args, params, data)
+        except (KeyError, IndexError, TypeError, ValueError) as error:
+            return _error(400, f"Invalid request: {error}")
+
+    def _verify(self, method: str, path: str, body: bytes, headers) -> Optional[str]:
+        """The authentication error of a request, `None` if it is valid."""
+        if self._secret is None:
+            return None
+
+        key: str = headers.get("CB-ACCESS-KEY")
+        signature: str = headers.get("CB-ACCESS-SIGN")
+        timestamp: str = headers.get("CB-ACCESS-TIMESTAMP")
+        passphrase: str = headers.get("CB-ACCESS-PASSPHRASE")
+
+        return self._check_signature(key, signature, timestamp, passphrase, method, path, body)
+
+    def _check_signature(
+            self,
+            key: str,
+            signature: str,
+            timestamp: str,
+            passphrase: str,
+            method: str,
+            path: str,
+            body: bytes = b""
+    ) -> Optional[str]:
+        if None in (key, signature, timestamp, passphrase):
+            return "CB-ACCESS-KEY, CB-ACCESS-SIGN, CB-ACCESS-TIMESTAMP and CB-ACCESS-PASSPHRASE are required"
+
+        if (self.key is not None) and (key != self.key):
+            return "Invalid API Key"
+
+        if (self.passphrase is not None) and (passphrase != self.passphrase):
+            return "Invalid Passphrase"
+
+        try:
+            if abs(time() - float(timestamp)) > 30:
+                return "request timestamp expired"
+        except ValueError:
+            return "invalid timestamp"
+
+        hmac: HMAC = HMAC(self._secret, encode(f"{timestamp}{method}{path}", encoding=ENCODING) + body, sha256)
+
+        if not compare_digest(b64encode(hmac.digest()).decode(ENCODING), signature):
+            return "invalid signature"
+
+        return None
+
+    def _market(self, product_id: str) -> _Market:
+        market: _Market = self._markets.get(product_id)
+
+        if market is None:
+            raise KeyError(f"{product_id} is not a valid product")
+
+        return market
+
+    @staticmethod
+    def _etag(payload: Any) -> Dict[str, str]:
+        digest: str = blake2b(encode(dumps(payload), encoding=ENCODING), digest_size=8).hexdigest()
+        return {"ETag": f'"{digest}"'}
+
+    @staticmethod
+    def _page(items: List[dict], field: str, params: dict) -> Reply:
+        """Paginate `items`, sorted newest first by `field`."""
+        limit: int = max(1, min(int(params.get("limit") or 100), 1000))
+        after, before = params.get("after"), params.get("before")
+        numeric: bool = field == "trade_id"
+
+        def cursor(value):
+            return int(value) if numeric else value
+
+        if after is not None:
+            items = [item for item in items if cursor(item.get(field)) < cursor(after)][:limit]
+        elif before is not None:
+            items = [item for item in items if cursor(item.get(field)) > cursor(before)][-limit:]
+        else:
+            items = items[:limit]
+
+        headers: Dict[str, str] = {}
+
+        if len(items) > 0:
+            headers.update({"cb-before": str(items[0].get(field)), "cb-after": str(items[-1].get(field))})
+
+        return 200, items, headers
+
+    def _history(self, kind: str, owner: str, fields: Dict[str, Any]) -> List[dict]:
+        """Synthetic history of `HISTORY` items, newest first."""
+        return [
+            {
+                "id": _uuid(kind, owner, index),
+                "created_at": _iso(self._started - 3600 * (index + 1)),
+                **{name: value(index) if callable(value) else value for name, value in fields.items()},
+            }
+            for index in range(HISTORY)
+        ]
+
+    # public routes:
+
+    def _time(self, method: str, args: List[str], params: dict, data: dict) -> Reply:
+        now: float = time()
+        return 200, {"iso": _iso(now), "epoch": round(now, 3)}, {}
+
+    def _products(self, method: str, args: List[str], params: dict, data: dict) -> Reply:
+        if len(args) == 0:
+            payload: List[dict] = [market.payload() for market in self._markets.values()]
+            return 200, payload, self._etag(payload)
+
+        market: _Market = self._markets.get(args[0])
+
+        if market is None:
+            return _error(404, "NotFound")
+
+        if len(args) == 1:
+            return 200, market.payload(), {}
+
+        resource: Optional[Callable] = {
+            "book": self._book,
+            "candles": self._candles,
+            "stats": self._stats,
+            "ticker": self._ticker,
+            "trades": self._trades,
+        }.get(args[1])
+
+        if resource is None:
+            return _error(404, "NotFound")
+
+        return resource(market, params)
+
+    def _newest(self) -> int:
+        """ID of the latest public trade, trades are `TRADE_SPACING` apart."""
+        return 1000000 + int((time() - self._started) / TRADE_SPACING)
+
+    def _trade_time(self, trade_id: int) -> float:
+        return self._started + (trade_id - 1000000) * TRADE_SPACING
+
+    def _trade(self, market: _Market, trade_id: int) -> dict:
+        timestamp: float = self._trade_time(trade_id)
+        return {
+            "time": _iso(timestamp),
+            "trade_id": trade_id,
+            "price": market.fmt(market.price_at(timestamp)),
+            "size": market.size(trade_id),
+            "side": "sell" if (trade_id * 7) % 3 == 0 else "buy",
+        }
+
+    def _trades(self, market: _Market, params: dict) -> Reply:
+        limit: int = max(1, min(int(params.get("limit") or 100), 1000))
+        newest: int = self._newest()
+
+        if params.get("after") is not None:
+            first: int = min(int(params.get("after")) - 1, newest)
+        elif params.get("before") is not None:
+            first: int = min(int(params.get("before")) + limit, newest)
+        else:
+            first: int = newest
+
+        last: int = max(first - limit + 1, 1)
+
+        if params.get("before") is not None:
+            last: int = max(last, int(params.get("before")) + 1)
+
+        trades: List[dict] = [self._trade(market, trade_id) for trade_id in range(first, last - 1, -1)]
+        headers: Dict[str, str] = {}
+
+        if len(trades) > 0:
+            headers.update({"cb-before": str(first), "cb-after": str(last)})
+
+        return 200, trades, headers
+
+    def _quote(self, market: _Market, timestamp: float) -> Tuple[float, float, float]:
+        """The best bid and ask, and the tick size, at `timestamp`."""
+        tick: float = float(market.quote_increment)
+        bid: float = floor(market.price_at(timestamp) / tick) * tick
+        return bid, bid + tick, tick
+
+    def _book(self, market: _Market, params: dict) -> Reply:
+        level: int = int(params.get("level") or 1)
+
+        if level not in (1, 2, 3):
+            return _error(400, "Invalid level")
+
+        now: float = time()
+        bid, ask, tick = self._quote(market, now)
+        depth: int = 1 if level == 1 else DEPTH
+
+        with self._lock:
+            self._sequence += 1
+            sequence: int = self._sequence
+
+        def side(best: float, step: float) -> List[list]:
+            levels: List[list] = []
+
+            for index in range(depth):
+                price: str = market.fmt(best + step * index)
+                size: str = market.size(index + 1)
+
+                if level == 3:
+                    levels.append([price, size, _uuid("order", market.id, price)])
+                else:
+                    levels.append([price, size, 1 + index % 5])
+
+            return levels
+
+        return 200, {
+            "bids": side(bid, -tick),
+            "asks": side(ask, tick),
+            "sequence": sequence,
+            "auction_mode": False,
+            "auction": None,
+            "time": _iso(now),
+        }, {}
+
+    def _candles(self, market: _Market, params: dict) -> Reply:
+        granularity: int = int(params.get("granularity") or 60)
+
+        if granularity not in GRANULARITIES:
+            return _error(400, "Unsupported granularity")
+
+        now: float = time()
+        end: float = min(to_posix(params.get("end")) if params.get("end") else now, now)
+        start: float = to_posix(params.get("start")) if params.get("start") else end - granularity * MAX_CANDLES
+
+        if (end - start) / granularity > MAX_CANDLES:
+            return _error(
+                400,
+                "granularity too small for the requested time range. Count of aggregations requested exceeds 300"
+            )
+
+        candles: List[list] = []
+        bucket: int = int(end // granularity) * granularity
+
+        while bucket >= start:
+            open_: float = market.price_at(bucket)
+            close: float = market.price_at(bucket + granularity)
+            spread: float = abs(close - open_) / 2 + market.price * 0.0005
+            candles.append([
+                bucket,
+                float(market.fmt(min(open_, close) - spread)),
+                float(market.fmt(max(open_, close) + spread)),
+                float(market.fmt(open_)),
+                float(market.fmt(close)),
+                round(granularity / TRADE_SPACING * float(market.size(bucket // granularity)), 8),
+            ])
+            bucket -= granularity
+
+        return 200, candles, {}
+
+    def _stats(self, market: _Market, params: dict) -> Reply:
+        now: float = time()
+        samples: List[float] = [market.price_at(now - 900 * index) for index in range(97)]
+        return 200, {
+            "open": market.fmt(samples[-1]),
+            "high": market.fmt(max(samples)),
+            "low": market.fmt(min(samples)),
+            "last": market.fmt(samples[0]),
+            "volume": f"{86400 / TRADE_SPACING * float(market.size(1)):.8f}",
+            "volume_30day": f"{30 * 86400 / TRADE_SPACING * float(market.size(1)):.8f}",
+        }, {}
+
+    def _ticker(self, market: _Market, params: dict) -> Reply:
+        trade: dict = self._trade(market, self._newest())
+        bid, ask, _ = self._quote(market, time())
+        return 200, {
+            "ask": market.fmt(ask),
+            "bid": market.fmt(bid),
+            "volume": f"{86400 / TRADE_SPACING * float(market.size(1)):.8f}",
+            "trade_id": trade.get("trade_id"),
+            "price": trade.get("price"),
+            "size": trade.get("size"),
+            "time": trade.get("time"),
+        }, {}
+
+    def _currency_ids(self) -> List[str]:
+        currencies: Dict[str, None] = {}
+
+        for market in self._markets.values():
+            currencies.setdefault(market.base)
+            currencies.setdefault(market.quote)
+
+        return list(currencies)
+
+    @staticmethod
+    def _currency(currency_id: str) -> dict:
+        fiat: bool = currency_id in FIAT
+        return {
+            "id": currency_id,
+            "name": currency_id,
+            "min_size": "0.01" if fiat else "0.00000001",
+            "status": "online",
+            "message": "",
+            "max_precision": "0.01" if fiat else "0.00000001",
+            "convertible_to": [],
+            "details": {
+                "type": "fiat" if fiat else "crypto",
+                "symbol": "$" if currency_id == "USD" else "",
+                "network_confirmations": 0 if fiat else 6,
+                "sort_order": 0,
+                "crypto_address_link": "",
+                "crypto_transaction_link": "",
+                "push_payment_methods": [],
+            },
+            "default_network": "" if fiat else currency_id.lower(),
+            "supported_networks": [],
+        }
+
+    def _currencies(self, method: str, args: List[str], params: dict, data: dict) -> Reply:
+        currency_ids: List[str] = self._currency_ids()
+
+        if len(args) == 0:
+            payload: List[dict] = [self._currency(currency_id) for currency_id in currency_ids]
+            return 200, payload, self._etag(payload)
+
+        if args[0] not in currency_ids:
+            return _error(404, "NotFound")
+
+        return 200, self._currency(args[0]), {}
+
+    def _wrapped_assets(self, method: str, args: List[str], params: dict, data: dict) -> Reply:
+        asset: dict = {
+            "id": "CBETH",
+            "circulating_supply": "1000000.00000000",
+            "total_supply": "1200000.00000000",
+            "conversion_rate": "1.05000000",
+            "apy": "0.03500000",
+        }
+
+        if len(args) == 0:
+            payload: dict = {"wrapped_assets": [asset]}
+            return 200, payload, self._etag(payload)
+
+        if args[0].upper() != asset.get("id"):
+            return _error(404, "NotFound")
+
+        if len(args) > 1:
+            return 200, {"amount": asset.get("conversion_rate")}, {}
+
+        return 200, asset, {}
+
+    # private routes:
+
+    def _account(self, currency_id: str) -> dict:
+        return {
+            "id": _uuid("account", currency_id),
+            "currency": currency_id,
+            "balance": "1000.0000000000000000",
+            "hold": "0.0000000000000000",
+            "available": "1000.0000000000000000",
+            "profile_id": _uuid("profile", "default"),
+            "trading_enabled": True,
+        }
+
+    def _accounts(self, method: str, args: List[str], params: dict, data: dict) -> Reply:
+        accounts: Dict[str, dict] = {
+            account.get("id"): account for account in map(self._account, self._currency_ids())
+        }
+
+        if len(args) == 0:
+            return 200, list(accounts.values()), {}
+
+        account: dict = accounts.get(args[0])
+
+        if account is None:
+            return _error(404, "NotFound")
+
+        if len(args) == 1:
+            return 200, account, {}
+
+        fields: Optional[dict] = {
+            "holds": {"updated_at": None, "type": "order", "ref": lambda index: _uuid("order", index), "amount": "1.00"},
+            "ledger": {
+                "type": "match",
+                "amount": lambda index: f"{(-1) ** index:.2f}",
+                "balance": lambda index: f"{1000 - index % 2:.2f}",
+                "details": {},
+            },
+            "transfers": {
+                "type": "deposit",
+                "completed_at": None,
+                "canceled_at": None,
+                "processed_at": None,
+                "user_nonce": None,
+                "amount": "10.00",
+                "details": {},
+            },
+        }.get(args[1])
+
+        if fields is None:
+            return _error(404, "NotFound")
+
+        return self._page(self._history(args[1], args[0], fields), "created_at", params)
+
+    def _address_book(self, method: str, args: List[str], params: dict, data: dict) -> Reply:
+        return 200, [], {}
+
+    def _coinbase_accounts(self, method: str, args: List[str], params: dict, data: dict) -> Reply:
+        if method == "POST":
+            return 200, {
+                "id": _uuid("address", args[0]),
+                "address": blake2b(encode(args[0], encoding=ENCODING), digest_size=20).hexdigest(),
+                "network": "ethereum",
+                "created_at": _iso(time()),
+            }, {}
+
+        return 200, [
+            {
+                "id": _uuid("wallet", currency_id),
+                "name": f"{currency_id} Wallet",
+                "balance": "0.00000000",
+                "currency": currency_id,
+                "type": "fiat" if currency_id in FIAT else "wallet",
+                "primary": currency_id == "USD",
+                "active": True,
+                "available_on_consumer": True,
+            }
+            for currency_id in self._currency_ids()
+        ], {}
+
+    def _conversions_route(self, method: str, args: List[str], params: dict, data: dict) -> Reply:
+        if method == "POST":
+            conversion: dict = {
+                "id": _uuid("conversion", len(self._conversions)),
+                "amount": data["amount"],
+                "from_account_id": _uuid("account", data["from"]),
+                "to_account_id": _uuid("account", data["to"]),
+                "from": data["from"],
+                "to": data["to"],
+            }
+
+            with self._lock:
+                self._conversions[conversion.get("id")] = conversion
+
+            return 200, conversion, {}
+
+        conversion: dict = self._conversions.get(args[0]) if len(args) > 0 else None
+        return (200, conversion, {}) if conversion is not None else _error(404, "NotFound")
+
+    def _transfer_request(self, method: str, args: List[str], params: dict, data: dict) -> Reply:
+        if method == "GET":  # withdrawals/fee-estimate
+            return 200, {"fee": "0.00010000", "fee_before_subsidy": "0.00010000"}, {}
+
+        return 200, {
+            "id": _uuid("transfer", time()),
+            "amount": data.get("amount"),
+            "currency": data.get("currency"),
+            "payout_at": _iso(time() + 86400),
+            "fee": "0.00",
+            "subtotal": data.get("amount"),
+        }, {}
+
+    def _payment_methods(self, method: str, args: List[str], params: dict, data: dict) -> Reply:
+        return 200, [], {}
+
+    def _transfers(self, method: str, args: List[str], params: dict, data: dict) -> Reply:
+        transfers: List[dict] = self._history(
+            "transfer",
+            "all",
+            {
+                "type": lambda index: "deposit" if index % 2 == 0 else "withdraw",
+                "completed_at": None,
+                "canceled_at": None,
+                "processed_at": None,
+                "user_nonce": None,
+                "amount": "10.00",
+                "details": {},
+            }
+        )
+
+        if len(args) > 0:
+            transfer: dict = next((item for item in transfers if item.get("id") == args[0]), None)
+            return (200, transfer, {}) if transfer is not None else _error(404, "NotFound")
+
+        return self._page(transfers, "created_at", params)
+
+    def _fees(self, method: str, args: List[str], params: dict, data: dict) -> Reply:
+        return 200, {"taker_fee_rate": "0.0060", "maker_fee_rate": "0.0040", "usd_volume": "0.00"}, {}
+
+    def _fills_route(self, method: str, args: List[str], params: dict, data: dict) -> Reply:
+        order_id, product_id = params.get("order_id"), params.get("product_id")
+
+        if (order_id is None) and (product_id is None):
+            return _error(400, "Missing product_id or order_id")
+
+        with self._lock:
+            fills: List[dict] = [
+                fill for fill in reversed(self._fills)
+                if (order_id in (None, fill.get("order_id"))) and (product_id in (None, fill.get("product_id")))
+            ]
+
+        return self._page(fills, "trade_id", params)
+
+    def _order(self, order_id: str) -> Optional[dict]:
+        if order_id.startswith("client:"):
+            order_id: str = self._client_oids.get(order_id[7:], "")
+
+        return self._orders.get(order_id)
+
+    def _orders_route(self, method: str, args: List[str], params: dict, data: dict) -> Reply:
+        if method == "POST":
+            return self._create_order(data)
+
+        if method == "DELETE":
+            return self._cancel_orders(args, params)
+
+        if len(args) > 0:
+            with self._lock:
+                order: dict = self._order(args[0])
+            return (200, order, {}) if order is not None else _error(404, "NotFound")
+
+        statuses = params.get("status") or ["open", "pending", "active"]
+        statuses: List[str] = [statuses] if isinstance(statuses, str) else statuses
+        product_id: str = params.get("product_id")
+
+        with self._lock:
+            orders: List[dict] = [
+                order for order in reversed(list(self._orders.values()))
+                if (("all" in statuses) or (order.get("status") in statuses))
+                and (product_id in (None, order.get("product_id")))
+            ]
+
+        return self._page(orders, "created_at", params)
+
+    def _create_order(self, data: dict) -> Reply:
+        market: _Market = self._markets.get(data.get("product_id"))
+
+        if market is None:
+            return _error(400, "product_id is not a valid product")
+
+        side: str = data.get("side")
+        kind: str = data.get("type") or "limit"
+
+        if side not in ("buy", "sell"):
+            return _error(400, "side must be buy or sell")
+
+        if (kind == "limit") and ((data.get("price") is None) or (data.get("size") is None)):
+            return _error(400, "price and size are required for limit orders")
+
+        if (kind == "market") and (data.get("size") is None) and (data.get("funds") is None):
+            return _error(400, "size or funds is required for market orders")
+
+        if data.get("post_only") and (kind == "market"):
+            return _error(400, "post_only is not allowed for market orders")
+
+        client_oid: str = data.get("client_oid")
+
+        with self._lock:
+            if client_oid and (client_oid in self._client_oids):
+                return _error(400, "duplicate client_oid")
+
+            now: float = max(time(), self._created + 0.000001)
+            self._created = now
+            order: dict = {
+                "id": str(UUID(int=self._random.getrandbits(128), version=4)),
+                "price": data.get("price"),
+                "size": data.get("size"),
+                "funds": data.get("funds"),
+                "product_id": market.id,
+                "profile_id": data.get("profile_id") or _uuid("profile", "default"),
+                "side": side,
+                "type": kind,
+                "time_in_force": data.get("time_in_force") or "GTC",
+                "post_only": bool(data.get("post_only")),
+                "created_at": _iso(now),
+                "fill_fees": "0.0000000000000000",
+                "filled_size": "0.00000000",
+                "executed_value": "0.0000000000000000",
+                "status": "pending",
+                "settled": False,
+                "market_type": "spot",
+            }
+
+            if client_oid:
+                order.update(client_oid=client_oid)
+                self._client_oids[client_oid] = order.get("id")
+
+            if kind == "market":
+                self._fill(market, order, now)
+
+            self._orders[order.get("id")] = dict(order, status=order.get("status").replace("pending", "open"))
+
+        return 200, order, {}
+
+    def _fill(self, market: _Market, order: dict, now: float):
+        """Fill a market order at once, at the current best price."""
+        bid, ask, _ = self._quote(market, now)
+        price: float = ask if order.get("side") == "buy" else bid
+        size: float = float(order.get("size") or float(order.get("funds")) / price)
+        value: float = size * price
+        fee: float = value * 0.006
+
+        self._fills.append({
+            "trade_id": len(self._fills) + 1,
+            "product_id": market.id,
+            "order_id": order.get("id"),
+            "user_id": _uuid("user"),
+            "profile_id": order.get("profile_id"),
+            "liquidity": "T",
+            "price": market.fmt(price),
+            "size": f"{size:.{market.size_places}f}",
+            "fee": f"{fee:.16f}",
+            "created_at": order.get("created_at"),
+            "side": order.get("side"),
+            "settled": True,
+            "usd_volume": f"{value:.16f}",
+            "market_type": "spot",
+        })
+        order.update(
+            status="done",
+            done_reason="filled",
+            done_at=order.get("created_at"),
+            settled=True,
+            filled_size=f"{size:.{market.size_places}f}",
+            executed_value=f"{value:.16f}",
+            fill_fees=f"{fee:.16f}",
+        )
+
+    def _cancel_orders(self, args: List[str], params: dict) -> Reply:
+        now: str = _iso(time())
+        product_id: str = params.get("product_id")
+
+        with self._lock:
+            if len(args) == 0:
+                orders: List[dict] = [
+                    order for order in self._orders.values()
+                    if (order.get("status") == "open") and (product_id in (None, order.get("product_id")))
+                ]
+            else:
+                order: dict = self._order(args[0])
+
+                if order is None:
+                    return _error(404, "NotFound")
+
+                if order.get("status") != "open":
+                    return _error(400, "Order already done")
+
+                orders: List[dict] = [order]
+
+            for order in orders:
+                order.update(status="done", done_reason="canceled", done_at=now, settled=True)
+
+        if len(args) == 0:
+            return 200, [order.get("id") for order in orders], {}
+
+        return 200, args[0][7:] if args[0].startswith("client:") else args[0], {}
+
+    def _oracle(self, method: str, args: List[str], params: dict, data: dict) -> Reply:
+        now: float = time()
+        prices: Dict[str, str] = {
+            market.base: market.fmt(market.price_at(now))
+            for market in self._markets.values() if market.quote == "USD"
+        }
+        return 200, {"timestamp": str(int(now)), "messages": [], "signatures": [], "prices": prices}, {}
+
+    def _profiles_route(self, method: str, args: List[str], params: dict, data: dict) -> Reply:
+        if method == "POST":
+            if (len(args) > 0) and (args[0] == "transfer"):
+                return 200, {}, {}
+
+            profile: dict = dict(
+                next(iter(self._profiles.values())),
+                id=_uuid("profile", data["name"]),
+                name=data["name"],
+                is_default=False,
+                created_at=_iso(time()),
+            )
+
+            with self._lock:
+                self._profiles[profile.get("id")] = profile
+
+            return 200, profile, {}
+
+        if len(args) == 0:
+            return 200, list(self._profiles.values()), {}
+
+        profile: dict = self._profiles.get(args[0])
+
+        if profile is None:
+            return _error(404, "NotFound")
+
+        if method == "PUT":
+            with self._lock:
+                if len(args) > 1:  # deactivate
+                    profile.update(active=False)
+                else:
+                    profile.update(name=data.get("name", profile.get("name")))
+
+        return 200, profile, {}
+
+    def _reports_route(self, method: str, args: List[str], params: dict, data: dict) -> Reply:
+        if method == "POST":
+            report: dict = {
+                "id": _uuid("report", len(self._reports)),
+                "type": data.get("type"),
+                "status": "pending",
+                "created_at": _iso(time()),
+                "completed_at": None,
+                "expires_at": _iso(time() + 86400),
+                "file_url": None,
+                "params": data,
+            }
+
+            with self._lock:
+                self._reports[report.get("id")] = report
+
+            return 200, report, {}
+
+        if len(args) == 0:
+            return 200, list(self._reports.values()), {}
+
+        report: dict = self._reports.get(args[0])
+
+        if report is None:
+            return _error(404, "NotFound")
+
+        return 200, dict(report, status="ready", file_url=f"{self.url}/reports/{args[0]}.csv"), {}
+
+    def _users(self, method: str, args: List[str], params: dict, data: dict) -> Reply:
+        return 200, {
+            "limit_currency": "USD",
+            "transfer_limits": {
+                "ach": {"USD": {"max": "25000.00", "remaining": "25000.00", "period_in_days": 7}},
+            },
+        }, {}
+
+    # websocket feed:
+
+    def _serve_websocket(self, ready: Event):
+        try:
+            from websockets.asyncio.server import serve
+        except ImportError:  # optional dependency
+            ready.set()
+            return
+
+        loop = new_event_loop()
+
+        async def main():
+            self._ws_stop = AsyncEvent()
+
+            async with serve(self._feed, self.host, 0) as server:
+                self._ws_port = next(iter(server.sockets)).getsockname()[1]
+                self._ws_loop = loop
+                ready.set()
+                await self._ws_stop.wait()
+
+        try:
+            loop.run_until_complete(main())
+        finally:
+            loop.close()
+
+    async def _feed(self, socket):
+        from websockets.exceptions import ConnectionClosed
+
+        # channel -> product IDs, and the last `(bid, ask)` sent by product:
+        subscriptions: Dict[str, List[str]] = {}
+        quotes: Dict[str, Tuple[float, float]] = {}
+        producer = None
+
+        try:
+            async for raw in socket:
+                message: dict = loads(raw)
+                action: str = message.get("type")
+
+                if action not in ("subscribe", "unsubscribe"):
+                    await socket.send(dumps({"type": "error", "message": "Failed to subscribe", "reason": f"{action} is not a valid message"}))
+                    continue
+
+                if ("signature" in message) and (self._secret is not None):
+                    error: Optional[str] = self._check_signature(
+                        message.get("key"),
+                        message.get("signature"),
+                        message.get("timestamp"),
+                        message.get("passphrase"),
+                        "GET",
+                        "/users/self/verify"
+                    )
+
+                    if error is not None:
+                        await socket.send(dumps({"type": "error", "message": "Authentication Failed", "reason": error}))
+                        continue
+
+                snapshots: List[str] = self._subscribe(subscriptions, message)
+                channels: List[dict] = [
+                    {"name": name, "product_ids": product_ids} for name, product_ids in subscriptions.items()
+                ]
+                await socket.send(dumps({"type": "subscriptions", "channels": channels}))
+
+                for product_id in snapshots:
+                    await socket.send(dumps(self._snapshot(self._markets.get(product_id), quotes)))
+
+                if producer is None:
+                    producer = create_task(self._produce(socket, subscriptions, quotes))
+
+        except ConnectionClosed:
+            pass
+
+        finally:
+            if producer is not None:
+                producer.cancel()
+
+                try:
+                    await producer
+                except (CancelledError, ConnectionClosed):
+                    pass
+
+    def _subscribe(self, subscriptions: Dict[str, List[str]], message: dict) -> List[str]:
+        """Apply a (un)subscribe message, return the products needing a level2 snapshot."""
+        snapshots: List[str] = []
+        default: List[str] = [item for item in message.get("product_ids") or [] if item in self._markets]
+
+        for channel in message.get("channels") or []:
+            if isinstance(channel, dict):
+                name: str = channel.get("name")
+                product_ids: List[str] = [item for item in channel.get("product_ids") or default if item in self._markets]
+            else:
+                name, product_ids = channel, default
+
+            current: List[str] = subscriptions.setdefault(name, [])
+
+            if message.get("type") == "unsubscribe":
+                subscriptions[name] = [item for item in current if item not in product_ids]
+                continue
+
+            for product_id in product_ids:
+                if product_id not in current:
+                    current.append(product_id)
+
+                    if name in ("level2", "level2_batch"):
+                        snapshots.append(product_id)
+
+        for name in [name for name, product_ids in subscriptions.items() if len(product_ids) == 0]:
+            subscriptions.pop(name)
+
+        return snapshots
+
+    def _snapshot(self, market: _Market, quotes: Dict[str, Tuple[float, float]]) -> dict:
+        _, book, _ = self._book(market, {"level": 2})
+        quotes[market.id] = (float(book.get("bids")[0][0]), float(book.get("asks")[0][0]))
+        return {
+            "type": "snapshot",
+            "product_id": market.id,
+            "bids": [level[:2] for level in book.get("bids")],
+            "asks": [level[:2] for level in book.get("asks")],
+        }
+
+    async def _produce(self, socket, subscriptions: Dict[str, List[str]], quotes: Dict[str, Tuple[float, float]]):
+        sequences: Counter = Counter()
+
+        while True:
+            await async_sleep(self.interval)
+            now: float = time()
+            newest: int = self._newest()
+
+            for name, product_ids in list(subscriptions.items()):
+                for product_id in list(product_ids):
+                    market: _Market = self._markets.get(product_id)
+                    sequences[product_id] += 1
+                    message: dict = self._update(name, market, sequences[product_id], newest, now, quotes)
+
+                    if message is not None:
+                        await socket.send(dumps(message))
+
+    def _update(
+            self,
+            channel: str,
+            market: _Market,
+            sequence: int,
+            newest: int,
+            now: float,
+            quotes: Dict[str, Tuple[float, float]]
+    ) -> Optional[dict]:
+        """The next `channel` message of `market`."""
+        trade: dict = self._trade(market, newest)
+
+        if channel == "heartbeat":
+            return {
+                "type": "heartbeat",
+                "sequence": sequence,
+                "last_trade_id": newest,
+                "product_id": market.id,
+                "time": _iso(now),
+            }
+
+        if channel == "ticker":
+            bid, ask, _ = self._quote(market, now)
+            _, stats, _ = self._stats(market, {})
+            return {
+                "type": "ticker",
+                "sequence": sequence,
+                "product_id": market.id,
+                "price": trade.get("price"),
+                "open_24h": stats.get("open"),
+                "volume_24h": stats.get("volume"),
+                "low_24h": stats.get("low"),
+                "high_24h": stats.get("high"),
+                "volume_30d": stats.get("volume_30day"),
+                "best_bid": market.fmt(bid),
+                "best_bid_size": market.size(sequence),
+                "best_ask": market.fmt(ask),
+                "best_ask_size": market.size(sequence + 1),
+                "side": trade.get("side"),
+                "time": _iso(now),
+                "trade_id": newest,
+                "last_size": trade.get("size"),
+            }
+
+        if channel == "matches":
+            return dict(
+                trade,
+                type="match",
+                sequence=sequence,
+                product_id=market.id,
+                maker_order_id=_uuid("order", "maker", newest),
+                taker_order_id=_uuid("order", "taker", newest),
+            )
+
+        if channel in ("level2", "level2_batch"):
+            bid, ask, tick = self._quote(market, now)
+            changes: List[list] = [
+                ["buy", market.fmt(bid), market.size(sequence)],
+                ["sell", market.fmt(ask), market.size(sequence + 1)],
+            ]
+            previous: Optional[Tuple[float, float]] = quotes.get(market.id)
+
+            if previous is not None:
+                # the window of `DEPTH` levels by side follows the quote: the
+                # levels it moved through change side (so the book never
+                # crosses), the far ones are added or dropped:
+                up: int = min(DEPTH, round((ask - previous[1]) / tick))
+                down: int = min(DEPTH, round((previous[0] - bid) / tick))
+
+                for index in range(up):
+                    size: str = market.size(sequence + index)
+                    changes.append(["sell", market.fmt(previous[1] + tick * index), "0"])
+                    changes.append(["buy", market.fmt(bid - tick * (index + 1)), size])
+                    changes.append(["sell", market.fmt(ask + tick * (DEPTH - 1 - index)), size])
+                    changes.append(["buy", market.fmt(previous[0] - tick * (DEPTH - 1 - index)), "0"])
+
+                for index in range(down):
+                    size: str = market.size(sequence + index)
+                    changes.append(["buy", market.fmt(previous[0] - tick * index), "0"])
+                    changes.append(["sell", market.fmt(ask + tick * (index + 1)), size])
+                    changes.append(["buy", market.fmt(bid - tick * (DEPTH - 1 - index)), size])
+                    changes.append(["sell", market.fmt(previous[1] + tick * (DEPTH - 1 - index)), "0"])
+
+            quotes[market.id] = (bid, ask)
+            return {
+                "type": "l2update",
+                "product_id": market.id,
+                "changes": changes,
+                "time": _iso(now),
+            }
+
+        return None
@@ -0,0 +1,318 @@
+# -*- coding: UTF-8 -*-
+
+from decimal import Decimal
+from typing import Any, List, Union
+
+__all__ = [
+    "Model",
+    "ServerTime",
+    "Account",
+    "Hold",
+    "LedgerEntry",
+    "Transfer",
+    "Currency",
+    "Fees",
+    "Fill",
+    "Order",
+    "Product",
+    "Book",
+    "Candle",
+    "Stats",
+    "Ticker",
+    "Trade",
+    "Profile",
+    "build",
+]
+
+
+class LazyDecimal:
+    """
+    Descriptor exposing a numeric field as `Decimal`.
+
+    The raw value (usually a string) is kept as decoded and only parsed on
+    first read; the parsed value replaces it, so later reads are free.
+    """
+
+    __slots__ = ("slot",)
+
+    def __init__(self, slot: str):
+        self.slot: str = slot
+
+    def __get__(self, instance, owner=None) -> Decimal:
+        if instance is None:
+            return self
+
+        value: Any = getattr(instance, self.slot)
+
+        if (value is None) or isinstance(value, Decimal):
+            return value
+
+        value: Decimal = Decimal(value if isinstance(value, str) else repr(value))
+        setattr(instance, self.slot, value)
+        return value
+
+    def __set__(self, instance, value: Any):
+        setattr(instance, self.slot, value)
+
+
+class Model:
+    """
+    Base response model.
+
+    Subclasses list their fields in `__slots__`; numeric fields are
+    declared with a leading underscore and named again in `decimals`, they
+    are exposed through :class:`LazyDecimal` under the public name.
+    """
+
+    __slots__ = ()
+
+    # numeric fields exposed as `Decimal`:
+    decimals: tuple = ()
+
+    # `(payload key, slot)` pairs, including the inherited ones:
+    _fields: tuple = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super(Model, cls).__init_subclass__(**kwargs)
+        fields: list = list(cls._fields)
+
+        for slot in cls.__slots__:
+            name: str = slot[1:] if slot[1:] in cls.decimals else slot
+            fields.append((name, slot))
+
+            if name != slot:
+                setattr(cls, name, LazyDecimal(slot))
+
+        cls._fields = tuple(fields)
+
+    def __init__(self, payload: dict):
+        for name, slot in self._fields:
+            setattr(self, slot, payload.get(name))
+
+    def __repr__(self) -> str:
+        fields: str = ", ".join(f"{name}={getattr(self, name)!r}" for name, _ in self._fields)
+        return f"{self.__class__.__name__}({fields})"
+
+    def to_dict(self) -> dict:
+        """The model as a `dict` (numeric fields as `Decimal`)."""
+        return {name: getattr(self, name) for name, _ in self._fields}
+
+
+def build(model: type, payload: Union[dict, list]) -> Union[Model, List[Model]]:
+    """
+    Build `model` instances from a decoded payload (an object or an array
+    of objects).
+    """
+    if isinstance(payload, list):
+        return [model(item) for item in payload]
+    return model(payload)
+
+
+class ServerTime(Model):
+    """API server time."""
+
+    __slots__ = ("iso", "_epoch")
+    decimals: tuple = ("epoch",)
+
+
+class Account(Model):
+    """Trading account."""
+
+    __slots__ = ("id", "currency", "_balance", "_hold", "_available", "profile_id", "trading_enabled")
+    decimals: tuple = ("balance", "hold", "available")
+
+
+class Hold(Model):
+    """Hold placed on an account."""
+
+    __slots__ = ("id", "created_at", "updated_at", "type", "ref", "_amount")
+    decimals: tuple = ("amount",)
+
+
+class LedgerEntry(Model):
+    """Account ledger activity."""
+
+    __slots__ = ("id", "created_at", "type", "_amount", "_balance", "details")
+    decimals: tuple = ("amount", "balance")
+
+
+class Transfer(Model):
+    """Deposit or withdrawal."""
+
+    __slots__ = (
+        "id",
+        "type",
+        "created_at",
+        "completed_at",
+        "canceled_at",
+        "processed_at",
+        "user_nonce",
+        "_amount",
+        "details",
+    )
+    decimals: tuple = ("amount",)
+
+
+class Currency(Model):
+    """Known currency."""
+
+    __slots__ = (
+        "id",
+        "name",
+        "display_name",
+        "status",
+        "message",
+        "_min_size",
+        "_max_precision",
+        "convertible_to",
+        "details",
+        "default_network",
+        "supported_networks",
+    )
+    decimals: tuple = ("min_size", "max_precision")
+
+
+class Fees(Model):
+    """Current fee rates and 30 days trailing volume."""
+
+    __slots__ = ("_taker_fee_rate", "_maker_fee_rate", "_usd_volume")
+    decimals: tuple = ("taker_fee_rate", "maker_fee_rate", "usd_volume")
+
+
+class Fill(Model):
+    """Partial or complete match of an order."""
+
+    __slots__ = (
+        "trade_id",
+        "product_id",
+        "order_id",
+        "user_id",
+        "profile_id",
+        "liquidity",
+        "_price",
+        "_size",
+        "_fee",
+        "_usd_volume",
+        "created_at",
+        "side",
+        "settled",
+        "market_type",
+        "funding_currency",
+    )
+    decimals: tuple = ("price", "size", "fee", "usd_volume")
+
+
+class Order(Model):
+    """Order."""
+
+    __slots__ = (
+        "id",
+        "client_oid",
+        "product_id",
+        "profile_id",
+        "side",
+        "type",
+        "status",
+        "time_in_force",
+        "post_only",
+        "settled",
+        "stop",
+        "created_at",
+        "done_at",
+        "done_reason",
+        "reject_reason",
+        "market_type",
+        "_price",
+        "_size",
+        "_funds",
+        "_specified_funds",
+        "_stop_price",
+        "_fill_fees",
+        "_filled_size",
+        "_executed_value",
+    )
+    decimals: tuple = (
+        "price",
+        "size",
+        "funds",
+        "specified_funds",
+        "stop_price",
+        "fill_fees",
+        "filled_size",
+        "executed_value",
+    )
+
+
+class Product(Model):
+    """Currency pair available for trading."""
+
+    __slots__ = (
+        "id",
+        "base_currency",
+        "quote_currency",
+        "display_name",
+        "status",
+        "status_message",
+        "margin_enabled",
+        "post_only",
+        "limit_only",
+        "cancel_only",
+        "trading_disabled",
+        "auction_mode",
+        "fx_stablecoin",
+        "_quote_increment",
+        "_base_increment",
+        "_min_market_funds",
+        "_max_market_funds",
+        "_max_slippage_percentage",
+    )
+    decimals: tuple = (
+        "quote_increment",
+        "base_increment",
+        "min_market_funds",
+        "max_market_funds",
+        "max_slippage_percentage",
+    )
+
+
+class Book(Model):
+    """Order book snapshot, `bids` and `asks` are kept as decoded."""
+
+    __slots__ = ("sequence", "bids", "asks", "time", "auction_mode", "auction")
+
+
+class Candle(Model):
+    """Historic rates bucket."""
+
+    __slots__ = ("time", "_low", "_high", "_open", "_close", "_volume")
+    decimals: tuple = ("low", "high", "open", "close", "volume")
+
+    def __init__(self, payload: list):
+        self.time, self._low, self._high, self._open, self._close, self._volume = payload
+
+
+class Stats(Model):
+    """30 days and 24 hours stats of a product."""
+
+    __slots__ = ("_open", "_high", "_low", "_last", "_volume", "_volume_30day")
+    decimals: tuple = ("open", "high", "low", "last", "volume", "volume_30day")
+
+
+class Ticker(Model):
+    """Last trade (tick), best bid/ask and 24h volume of a product."""
+
+    __slots__ = ("trade_id", "_price", "_size", "_bid", "_ask", "_volume", "time")
+    decimals: tuple = ("price", "size", "bid", "ask", "volume")
+
+
+class Trade(Model):
+    """Public trade."""
+
+    __slots__ = ("trade_id", "side", "_size", "_price", "time")
+    decimals: tuple = ("size", "price")
+
+
+class Profile(Model):
+    """User profile (portfolio)."""
+
+    __slots__ = ("id", "user_id", "name", "active", "is_default", "has_margin", "created_at")
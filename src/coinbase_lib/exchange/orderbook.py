@@ -0,0 +1,363 @@
+# -*- coding: UTF-8 -*-
+
+from decimal import Decimal
+from heapq import heapify, heappop, heappush
+from itertools import islice
+from threading import RLock
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+from .messages import Message
+
+__all__ = ["SequenceGapError", "BookSide", "OrderBook"]
+
+
+class SequenceGapError(Exception):
+    """Raised when a sequence gap is detected and no snapshot is available."""
+
+
+class BookSide:
+    """
+    One side of an order book: the aggregated size by price.
+
+    Sizes are kept in a hash map (O(1) reads and size updates) and prices in
+    a binary heap with lazy deletion: adding a price level is O(log n),
+    removing one only drops it from the map and its heap entry is discarded
+    when it reaches the top (or when the heap is compacted), so the best
+    price is read in amortized O(log n). Walking the book from the best
+    price visits `k` levels in O(k log k) without sorting the whole side.
+
+    Not thread-safe, even reads change the heap: :class:`OrderBook` reads
+    and updates its sides under its lock.
+    """
+
+    # stale heap entries tolerated before compacting (also the minimum):
+    COMPACT: int = 64
+
+    def __init__(self, descending: bool):
+        """
+        :param descending: Best price is the highest one (bids).
+        """
+        self.descending: bool = descending
+
+        self._sizes: Dict[Decimal, Decimal] = {}
+        # heap keys (negated prices when descending) and the prices queued:
+        self._heap: List[Decimal] = []
+        self._queued: Set[Decimal] = set()
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    def clear(self):
+        self._sizes.clear()
+        self._heap.clear()
+        self._queued.clear()
+
+    def add(self, price: Decimal, size: Decimal):
+        """Add `size` (may be negative) to the level at `price`."""
+        self.set(price, self._sizes.get(price, 0) + size)
+
+    def set(self, price: Decimal, size: Decimal):
+        """Set the aggregated size of the level at `price`."""
+        if size > 0:
+            # a removed level still queued is revived as is:
+            if price not in self._queued:
+                heappush(self._heap, -price if self.descending else price)
+                self._queued.add(price)
+            self._sizes[price] = size
+
+        elif price in self._sizes:
+            del self._sizes[price]
+
+            if len(self._heap) > 2 * len(self._sizes) + self.COMPACT:
+                self._compact()
+
+    def _compact(self):
+        """Drop the stale heap entries."""
+        self._heap = [-price if self.descending else price for price in self._sizes]
+        heapify(self._heap)
+        self._queued = set(self._sizes)
+
+    def _price(self, key: Decimal) -> Decimal:
+        return -key if self.descending else key
+
+    def size(self, price: Decimal) -> Decimal:
+        """Aggregated size at `price` (`0` if there is no such level)."""
+        return self._sizes.get(price, Decimal(0))
+
+    def best(self) -> Optional[Tuple[Decimal, Decimal]]:
+        """Best `(price, size)` or `None` if empty."""
+        while len(self._heap) > 0:
+            price: Decimal = self._price(self._heap[0])
+            size: Decimal = self._sizes.get(price)
+
+            if size is not None:
+                return price, size
+
+            heappop(self._heap)
+            self._queued.discard(price)
+
+        return None
+
+    def levels(self, depth: int = None) -> List[Tuple[Decimal, Decimal]]:
+        """`(price, size)` levels from the best price outwards."""
+        if depth is None:
+            return [(price, self._sizes[price]) for price in sorted(self._sizes, reverse=self.descending)]
+
+        return list(islice(self.walk(), depth))
+
+    def walk(self) -> Iterator[Tuple[Decimal, Decimal]]:
+        """
+        Iterate over `(price, size)` from the best price outwards (the side
+        must not change while iterating).
+        """
+        heap: List[Decimal] = self._heap
+
+        if len(heap) == 0:
+            return
+
+        # the heap is visited in order through a frontier of its nodes:
+        frontier: List[Tuple[Decimal, int]] = [(heap[0], 0)]
+
+        while len(frontier) > 0:
+            key, index = heappop(frontier)
+            price: Decimal = self._price(key)
+            size: Decimal = self._sizes.get(price)
+
+            if size is not None:
+                yield price, size
+
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(heap):
+                    heappush(frontier, (heap[child], child))
+
+
+class OrderBook:
+    """
+    Local order book kept up to date from a REST snapshot and the websocket
+    feed updates (`level2` or `full` channel).
+
+    **Level 3:**
+        Orders are tracked by ID, updates (`open`, `done`, `match`,
+        `change`) are applied in `sequence` order. Stale messages are
+        ignored and a gap in the sequence triggers a new snapshot (using
+        the `snapshot` callable) or raises :class:`SequenceGapError`.
+
+    **Level 2:**
+        The `snapshot` and `l2update` messages set the aggregated size
+        of each price level. They are rejected by level 3 books, which
+        track the individual orders.
+
+    **Threads:**
+        Messages can be applied from the feed thread while other threads
+        query the book: every method takes the book lock, read the sides
+        through them rather than through `bids` and `asks`.
+    """
+
+    def __init__(self, product_id: str, level: int = 3, snapshot: Callable[[], dict] = None):
+        """
+        :param product_id: The product ID (i.e. `BTC-USD`).
+        :param level: Book level, `2` or `3` (defaults to: 3).
+        :param snapshot: Function returning a decoded book snapshot for the
+            product, used for the initial load and after a sequence gap
+            (i.e. ``lambda: products.get_product_book(product_id, level=3).json()``).
+        """
+        if level not in (2, 3):
+            raise ValueError(f"Invalid book level: {level}! Expected `2` or `3`.")
+
+        self.product_id: str = product_id
+        self.level: int = level
+        self.sequence: int = None
+
+        # number of snapshots loaded after a sequence gap:
+        self.resyncs: int = 0
+
+        self.bids: BookSide = BookSide(descending=True)
+        self.asks: BookSide = BookSide(descending=False)
+
+        self._snapshot: Callable[[], dict] = snapshot
+        self._orders: Dict[str, Tuple[str, Decimal, Decimal]] = {}
+        self._lock: RLock = RLock()
+
+    def _side(self, side: str) -> BookSide:
+        return self.bids if side == "buy" else self.asks
+
+    def load(self, snapshot: dict = None):
+        """
+        Replace the book content with a snapshot, either the one given or
+        a new one from the `snapshot` callable.
+
+        :param snapshot: Decoded `get_product_book()` response or `level2`
+            `snapshot` message payload.
+        """
+        if snapshot is None:
+            if self._snapshot is None:
+                raise SequenceGapError(f"No snapshot available for {self.product_id}!")
+            snapshot: dict = self._snapshot()
+
+        with self._lock:
+            self.bids.clear()
+            self.asks.clear()
+            self._orders.clear()
+            self.sequence = snapshot.get("sequence")
+
+            for side, entries in (("buy", snapshot.get("bids")), ("sell", snapshot.get("asks"))):
+                for entry in entries:
+                    price, size = Decimal(entry[0]), Decimal(entry[1])
+
+                    if self.level == 3:
+                        self._orders[entry[2]] = (side, price, size)
+                        self._side(side).add(price, size)
+                    else:
+                        self._side(side).set(price, size)
+
+    def apply(self, message: Union[Message, dict]):
+        """
+        Apply a websocket feed message to the book.
+
+        :param message: Typed message or decoded payload.
+        :raises ValueError: On a `level2` channel message for a level 3
+            book.
+        """
+        if isinstance(message, dict):
+            message: Message = Message.from_payload(message)
+
+        with self._lock:
+            if message.type in ("snapshot", "l2update"):
+                self._apply_level2(message)
+
+            elif self.level == 3:
+                self._apply_sequenced(message)
+
+    def _apply_level2(self, message: Message):
+        if self.level == 3:
+            # aggregated levels, without the orders of a level 3 book:
+            raise ValueError(
+                f"Can't apply a level2 `{message.type}` message to the level 3 book of {self.product_id}!"
+            )
+
+        if message.type == "snapshot":
+            self.load({"bids": message.bids, "asks": message.asks})
+        else:
+            for side, price, size in message.changes:
+                self._side(side).set(Decimal(price), Decimal(size))
+
+    def _apply_sequenced(self, message: Message):
+        sequence: int = getattr(message, "sequence", None)
+
+        if (sequence is None) or (self.sequence is None):
+            return
+
+        if sequence <= self.sequence:
+            return
+
+        if sequence > self.sequence + 1:
+            self.resyncs += 1
+            self.load()
+            return
+
+        self.sequence = sequence
+
+        if message.type == "open":
+            self._open(message.order_id, message.side, Decimal(message.price), Decimal(message.remaining_size))
+
+        elif message.type == "done":
+            self._remove(message.order_id)
+
+        elif message.type == "match":
+            self._reduce(message.maker_order_id, Decimal(message.size))
+
+        elif (message.type == "change") and (message.new_size is not None):
+            self._resize(message.order_id, Decimal(message.new_size))
+
+    def _open(self, order_id: str, side: str, price: Decimal, size: Decimal):
+        self._orders[order_id] = (side, price, size)
+        self._side(side).add(price, size)
+
+    def _remove(self, order_id: str):
+        order: Tuple[str, Decimal, Decimal] = self._orders.pop(order_id, None)
+
+        if order is not None:
+            side, price, size = order
+            self._side(side).add(price, -size)
+
+    def _reduce(self, order_id: str, size: Decimal):
+        order: Tuple[str, Decimal, Decimal] = self._orders.get(order_id)
+
+        if order is not None:
+            self._resize(order_id, order[2] - size)
+
+    def _resize(self, order_id: str, size: Decimal):
+        order: Tuple[str, Decimal, Decimal] = self._orders.get(order_id)
+
+        if order is None:
+            return
+
+        side, price, previous = order
+        self._orders[order_id] = (side, price, size)
+        self._side(side).add(price, size - previous)
+
+    def best_bid(self) -> Optional[Tuple[Decimal, Decimal]]:
+        """Best bid as `(price, size)` or `None` if there are no bids."""
+        with self._lock:
+            return self.bids.best()
+
+    def best_ask(self) -> Optional[Tuple[Decimal, Decimal]]:
+        """Best ask as `(price, size)` or `None` if there are no asks."""
+        with self._lock:
+            return self.asks.best()
+
+    def spread(self) -> Optional[Decimal]:
+        """Difference between the best ask and the best bid."""
+        with self._lock:
+            bid, ask = self.bids.best(), self.asks.best()
+
+        if (bid is None) or (ask is None):
+            return None
+
+        return ask[0] - bid[0]
+
+    def depth(self, side: str, price: Union[Decimal, str]) -> Decimal:
+        """
+        Aggregated size at `price`.
+
+        :param side: `buy` (bids) or `sell` (asks).
+        :param price: The price level.
+        """
+        with self._lock:
+            return self._side(side).size(Decimal(price))
+
+    def levels(self, side: str, depth: int = None) -> List[Tuple[Decimal, Decimal]]:
+        """
+        `(price, size)` levels of a side from the best price outwards.
+
+        :param side: `buy` (bids) or `sell` (asks).
+        :param depth: Number of levels (defaults to: all).
+        """
+        with self._lock:
+            return self._side(side).levels(depth)
+
+    def vwap(self, side: str, size: Union[Decimal, str]) -> Optional[Decimal]:
+        """
+        Volume weighted average price to `buy` (walking the asks) or `sell`
+        (walking the bids) `size` units, or `None` if the book is not deep
+        enough.
+
+        :param side: `buy` or `sell`.
+        :param size: Size to fill.
+        """
+        remaining: Decimal = Decimal(size)
+        target: Decimal = remaining
+        notional: Decimal = Decimal(0)
+
+        with self._lock:
+            book: BookSide = self.asks if side == "buy" else self.bids
+
+            for price, available in book.walk():
+                filled: Decimal = min(available, remaining)
+                notional += filled * price
+                remaining -= filled
+
+                if remaining <= 0:
+                    return notional / target
+
+        return None
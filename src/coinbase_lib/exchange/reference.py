@@ -0,0 +1,296 @@
+# -*- coding: UTF-8 -*-
+
+from hashlib import blake2b
+from logging import Logger, getLogger
+from threading import Event, RLock, Thread
+from time import time
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+from requests import Response
+
+from .constants import ENVIRONMENT, REFERENCE_REFRESH
+from .endpoints import Endpoint, Currencies, Products, WrappedAssets
+from .models import Currency, Product
+from ..constants import NAME
+from ..utils import loads
+
+__all__ = ["Change", "ReferenceData"]
+
+
+class Change:
+    """
+    Change event of a reference data item: `old` is `None` for an added
+    item and `new` is `None` for a removed one.
+    """
+
+    __slots__ = ("kind", "id", "old", "new")
+
+    def __init__(self, kind: str, id: str, old: Any, new: Any):
+        self.kind: str = kind
+        self.id: str = id
+        self.old = old
+        self.new = new
+
+    @property
+    def type(self) -> str:
+        """`added`, `removed` or `changed`."""
+        if self.old is None:
+            return "added"
+
+        if self.new is None:
+            return "removed"
+
+        return "changed"
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(kind={self.kind!r}, id={self.id!r}, type={self.type!r})"
+
+
+class _Table:
+    """Immutable snapshot of a reference data kind, swapped when refreshed."""
+
+    __slots__ = ("items", "raw", "digest", "validators", "updated")
+
+    def __init__(self, items: Dict[str, Any], raw: Dict[str, dict], digest: bytes, validators: dict, updated: float):
+        self.items: Mapping[str, Any] = MappingProxyType(items)
+        self.raw: Dict[str, dict] = raw
+        self.digest: bytes = digest
+        self.validators: dict = validators
+        self.updated: float = updated
+
+
+class ReferenceData:
+    """
+    In-process registry of the slow changing reference data: the products,
+    currencies and wrapped assets.
+
+    Each kind is loaded once, on first use, and served from memory with
+    O(1) lookups by ID: products and currencies as typed models (see
+    :mod:`.models`), wrapped assets as decoded. Lookups don't take a lock,
+    a refresh builds new tables and swaps them in.
+
+    **Refresh:**
+        Started, the registry refreshes every `interval` seconds in a
+        background (daemon) thread. The requests are conditional
+        (`If-None-Match`/`If-Modified-Since`) when the API sent validators,
+        and an unchanged payload is detected by its digest otherwise, so
+        nothing is rebuilt when nothing changed.
+
+    **Change events:**
+        `callback` is called with a :class:`Change` for every item added,
+        removed or changed by a refresh (not by the initial load).
+    """
+
+    KINDS: tuple = ("products", "currencies", "wrapped_assets")
+
+    def __init__(
+            self,
+            interval: float = REFERENCE_REFRESH,
+            callback: Callable = None,
+            environment: str = ENVIRONMENT,
+            logger: Logger = None,
+            **handlers: Endpoint
+    ):
+        """
+        :param interval: Seconds between two background refreshes
+            (defaults to: `REFERENCE_REFRESH`).
+        :param callback: Function called with every :class:`Change`
+            (defaults to: `None`).
+        :param environment: The API environment: `production` or `sandbox`
+            (defaults to: `production`).
+        :param logger: The handler to be used for logging.
+        :param handlers: The endpoint handlers to use by kind (`products`,
+            `currencies`, `wrapped_assets`), defaults to new uncached ones
+            for `environment`.
+        """
+        self.interval: float = interval
+        self._callback: Callable = callback
+        self._log: Logger = logger or getLogger(NAME)
+        self._handlers: Dict[str, Endpoint] = {
+            "products": handlers.get("products") or Products(environment=environment, cache=False),
+            "currencies": handlers.get("currencies") or Currencies(environment=environment, cache=False),
+            "wrapped_assets": handlers.get("wrapped_assets") or WrappedAssets(environment=environment, cache=False),
+        }
+        self._tables: Dict[str, _Table] = {}
+        self._lock: RLock = RLock()
+        self._stop: Event = Event()
+        self._thread: Thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def _table(self, kind: str) -> _Table:
+        table: _Table = self._tables.get(kind)
+
+        if table is None:
+            with self._lock:  # concurrent first lookups wait for one load
+                if kind not in self._tables:
+                    self.refresh(kind)
+                table: _Table = self._tables.get(kind)
+
+        return table
+
+    @property
+    def products(self) -> Mapping[str, Product]:
+        """Read-only mapping of the products by product ID."""
+        return self._table("products").items
+
+    @property
+    def currencies(self) -> Mapping[str, Currency]:
+        """Read-only mapping of the currencies by currency ID."""
+        return self._table("currencies").items
+
+    @property
+    def wrapped_assets(self) -> Mapping[str, dict]:
+        """Read-only mapping of the wrapped assets by wrapped asset ID."""
+        return self._table("wrapped_assets").items
+
+    def product(self, product_id: str) -> Product:
+        """
+        A product by ID (i.e. `BTC-USD`).
+
+        :raises KeyError: If the product is unknown.
+        """
+        return self._lookup("products", product_id)
+
+    def currency(self, currency_id: str) -> Currency:
+        """
+        A currency by ID (i.e. `BTC`).
+
+        :raises KeyError: If the currency is unknown.
+        """
+        return self._lookup("currencies", currency_id)
+
+    def wrapped_asset(self, wrapped_asset_id: str) -> dict:
+        """
+        A wrapped asset by ID (i.e. `CBETH`).
+
+        :raises KeyError: If the wrapped asset is unknown.
+        """
+        return self._lookup("wrapped_assets", wrapped_asset_id)
+
+    def _lookup(self, kind: str, key: str) -> Any:
+        try:
+            return self._table(kind).items[key]
+        except KeyError:
+            raise KeyError(f"Unknown {kind[:-1].replace('_', ' ')}: {key!r}!") from None
+
+    def updated(self, kind: str) -> Optional[float]:
+        """POSIX timestamp of the last successful refresh of `kind`, if loaded."""
+        table: _Table = self._tables.get(kind)
+        return None if table is None else table.updated
+
+    def load(self) -> "ReferenceData":
+        """Load (or reload) all the kinds now."""
+        for kind in self.KINDS:
+            self.refresh(kind)
+        return self
+
+    def refresh(self, kind: str) -> List[Change]:
+        """
+        Refresh a kind now and notify the changes.
+
+        :param kind: `products`, `currencies` or `wrapped_assets`.
+        :return: The changes, empty on the initial load.
+        """
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown reference data kind: {kind!r}! Expected one of: {', '.join(self.KINDS)}.")
+
+        # one refresh at a time, concurrent first lookups wait for it:
+        with self._lock:
+            old: _Table = self._tables.get(kind)
+            headers: dict = {} if old is None else old.validators
+            response: Response = self._handlers.get(kind)._get(headers=headers)
+
+            if (old is not None) and (response.status_code == 304):
+                old.updated = time()
+                return []
+
+            digest: bytes = blake2b(response.content, digest_size=16).digest()
+
+            if (old is not None) and (digest == old.digest):
+                old.updated = time()
+                return []
+
+            table: _Table = self._build(kind, response, digest)
+            self._tables[kind] = table
+
+        if old is None:
+            return []
+
+        changes: List[Change] = self._diff(kind, old, table)
+
+        if self._callback is not None:
+            for change in changes:
+                try:
+                    self._callback(change)
+                except Exception as error:
+                    self._log.warning(f"Reference data callback failed for {change!r}: {error!r}")
+
+        return changes
+
+    @staticmethod
+    def _build(kind: str, response: Response, digest: bytes) -> _Table:
+        payload = loads(response.content)
+
+        if isinstance(payload, dict):  # `{"wrapped_assets": [...]}`
+            payload = payload.get(kind) or []
+
+        raw: Dict[str, dict] = {item.get("id"): item for item in payload}
+        model: type = {"products": Product, "currencies": Currency}.get(kind)
+        items: Dict[str, Any] = raw if model is None else {key: model(item) for key, item in raw.items()}
+
+        validators: dict = {}
+
+        if response.headers.get("ETag"):
+            validators.update({"If-None-Match": response.headers.get("ETag")})
+
+        if response.headers.get("Last-Modified"):
+            validators.update({"If-Modified-Since": response.headers.get("Last-Modified")})
+
+        return _Table(items, raw, digest, validators, time())
+
+    @staticmethod
+    def _diff(kind: str, old: _Table, new: _Table) -> List[Change]:
+        changes: List[Change] = []
+
+        for key, item in new.raw.items():
+            previous: dict = old.raw.get(key)
+
+            if previous != item:
+                changes.append(Change(kind, key, old.items.get(key), new.items.get(key)))
+
+        for key in old.raw.keys() - new.raw.keys():
+            changes.append(Change(kind, key, old.items.get(key), None))
+
+        return changes
+
+    def start(self):
+        """Start refreshing in a background (daemon) thread."""
+        if (self._thread is None) or (not self._thread.is_alive()):
+            self._stop.clear()
+            self._thread = Thread(target=self._run, name=f"{NAME}-reference", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the background thread."""
+        self._stop.set()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            for kind in self.KINDS:
+                try:
+                    self.refresh(kind)
+                except Exception as error:
+                    self._log.warning(f"Reference data refresh of {kind} failed: {error!r}")
+
+            self._stop.wait(self.interval)
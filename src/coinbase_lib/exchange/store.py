@@ -0,0 +1,451 @@
+# -*- coding: UTF-8 -*-
+
+from array import array
+from datetime import datetime
+from mmap import mmap, ACCESS_READ
+from os import makedirs
+from os.path import exists, getsize, join
+from struct import Struct
+from threading import Lock, RLock
+from typing import Dict, List, Sequence, Tuple, Union
+
+from .columnar import Candles, Trades, numpy, _DTYPES
+from ..constants import CACHE
+from ..utils import to_posix
+
+__all__ = ["MarketStore"]
+
+# index record: covered key range `[low, high]`, first row, number of rows
+# and the decimal scales of the `price` and `size` columns (trades only):
+_RECORD: Struct = Struct("<qqqqqq")
+
+# `(name, typecode)` of the columns, the first one is the covered key:
+_CANDLES: Tuple[Tuple[str, str], ...] = (
+    ("time", "q"),
+    ("low", "d"),
+    ("high", "d"),
+    ("open", "d"),
+    ("close", "d"),
+    ("volume", "d"),
+)
+
+_TRADES: Tuple[Tuple[str, str], ...] = (
+    ("trade_id", "q"),
+    ("time", "d"),
+    ("side", "b"),
+    ("price", "q"),
+    ("size", "q"),
+)
+
+
+class _Column:
+    """Append-only file of fixed size values, read through a memory map."""
+
+    def __init__(self, path: str, typecode: str):
+        self.path: str = path
+        self.typecode: str = typecode
+        self.itemsize: int = array(typecode).itemsize
+
+        self._map: mmap = None
+
+    def append(self, values: Sequence, rows: int):
+        """
+        Write `values` after the first `rows` values, anything past them
+        (left by an interrupted write) is dropped.
+        """
+        with open(self.path, "ab") as handler:
+            handler.truncate(rows * self.itemsize)
+            # typed columns (i.e. of `Trades`) already have the right layout:
+            handler.write(values.tobytes() if hasattr(values, "tobytes") else array(self.typecode, values).tobytes())
+
+    def view(self, start: int, stop: int) -> Sequence:
+        """Zero-copy view of the values in `[start, stop)`."""
+        size: int = stop * self.itemsize
+
+        if (self._map is None) or (len(self._map) < size):
+            # the file grew, map it again (views of the old map stay valid):
+            with open(self.path, "rb") as handler:
+                self._map = mmap(handler.fileno(), 0, access=ACCESS_READ)
+
+        if numpy is not None:
+            return numpy.frombuffer(
+                self._map,
+                dtype=_DTYPES.get(self.typecode),
+                count=stop - start,
+                offset=start * self.itemsize
+            )
+
+        return memoryview(self._map)[start * self.itemsize:size].cast(self.typecode)
+
+    def concat(self, views: List[Sequence]) -> Sequence:
+        """Copy `views` into a single column."""
+        if numpy is not None:
+            return numpy.concatenate(views) if len(views) > 0 else numpy.empty(0, _DTYPES.get(self.typecode))
+
+        column: array = array(self.typecode)
+
+        for view in views:
+            column.frombytes(memoryview(view).cast("B"))
+
+        return column
+
+
+class _Series:
+    """
+    Columnar series stored as one file per column plus an index.
+
+    Data is appended in chunks, each one covering a range of the key (the
+    first column) that doesn't overlap the others and holding its rows
+    sorted by key. The index keeps one record per chunk, it is written last
+    so a chunk only exists once complete.
+
+    Chunks are kept sorted by key in memory: finding the chunks, then the
+    rows, of a key range is a binary search.
+    """
+
+    def __init__(self, path: str, schema: Tuple[Tuple[str, str], ...]):
+        makedirs(path, exist_ok=True)
+
+        self.index: str = join(path, "index")
+        self.columns: Dict[str, _Column] = {
+            name: _Column(join(path, name), typecode) for name, typecode in schema
+        }
+        self.key: str = schema[0][0]
+
+        self._records: List[Tuple[int, ...]] = []
+        self._filled: List[Tuple[int, ...]] = []
+        self._rows: int = 0
+        self._loaded: int = -1
+        self._lock: RLock = RLock()
+
+    def _refresh(self):
+        """Load the index again if it was extended (i.e. by another process)."""
+        size: int = getsize(self.index) if exists(self.index) else 0
+
+        if size == self._loaded:
+            return
+
+        data: bytes = b""
+
+        if size > 0:
+            with open(self.index, "rb") as handler:
+                data: bytes = handler.read()
+
+        # a partial record is the tail of an interrupted write:
+        records: List[Tuple[int, ...]] = [
+            _RECORD.unpack_from(data, offset)
+            for offset in range(0, len(data) - len(data) % _RECORD.size, _RECORD.size)
+        ]
+        self._records = sorted(records)
+        self._filled = [record for record in self._records if record[3] > 0]
+        self._rows = max((record[2] + record[3] for record in records), default=0)
+        self._loaded = size
+
+    def gaps(self, low: int, high: int, step: int) -> List[Tuple[int, int]]:
+        """The `[low, high]` sub ranges not covered yet, `step` apart."""
+        with self._lock:
+            self._refresh()
+
+            gaps: List[Tuple[int, int]] = []
+            cursor: int = low
+
+            for record in self._records[self._first(low, lambda item: item[1]):]:
+                if record[0] > high:
+                    break
+
+                if record[0] > cursor:
+                    gaps.append((cursor, record[0] - step))
+
+                cursor = max(cursor, record[1] + step)
+
+            if cursor <= high:
+                gaps.append((cursor, high))
+
+            return gaps
+
+    def append(self, low: int, high: int, columns: Dict[str, Sequence], scales: Tuple[int, int] = (0, 0)):
+        """Add a chunk covering `[low, high]`, its rows sorted by key."""
+        with self._lock:
+            self._refresh()
+            rows: int = len(columns.get(self.key))
+
+            if rows > 0:
+                for name, column in self.columns.items():
+                    column.append(columns.get(name), self._rows)
+
+            with open(self.index, "ab") as handler:
+                handler.truncate(self._loaded - self._loaded % _RECORD.size)
+                handler.write(_RECORD.pack(low, high, self._rows, rows, *scales))
+
+    def _first(self, value: float, last, records: List[Tuple[int, ...]] = None) -> int:
+        """Position of the first record whose `last(record)` is at or after `value`."""
+        records: List[Tuple[int, ...]] = self._records if records is None else records
+        low, high = 0, len(records)
+
+        while low < high:
+            middle: int = (low + high) // 2
+
+            if last(records[middle]) < value:
+                low = middle + 1
+            else:
+                high = middle
+
+        return low
+
+    def select(self, name: str, low: float, high: float) -> List[Tuple[Tuple[int, ...], int, int]]:
+        """
+        The rows whose `name` column value is in `[low, high]`, as
+        `(chunk record, start, stop)` row slices in key order.
+        """
+        with self._lock:
+            self._refresh()
+
+            column: _Column = self.columns.get(name)
+            slices: list = []
+
+            def last(record: Tuple[int, ...]) -> float:
+                return column.view(record[2] + record[3] - 1, record[2] + record[3])[0]
+
+            for record in self._filled[self._first(low, last, self._filled):]:
+                offset, rows = record[2], record[3]
+                values: Sequence = column.view(offset, offset + rows)
+
+                if values[0] > high:
+                    break
+
+                start: int = _bisect(values, low, left=True)
+                stop: int = _bisect(values, high, left=False)
+
+                if stop > start:
+                    slices.append((record, offset + start, offset + stop))
+
+            return slices
+
+    def read(self, slices: List[Tuple[Tuple[int, ...], int, int]]) -> Dict[str, Sequence]:
+        """
+        The columns of the selected rows: memory mapped views if they all
+        come from a single chunk, copies otherwise.
+        """
+        with self._lock:
+            if len(slices) == 1:
+                _, start, stop = slices[0]
+                return {name: column.view(start, stop) for name, column in self.columns.items()}
+
+            return {
+                name: column.concat([column.view(start, stop) for _, start, stop in slices])
+                for name, column in self.columns.items()
+            }
+
+
+def _bisect(values: Sequence, value: float, left: bool) -> int:
+    if numpy is not None:
+        return int(numpy.searchsorted(values, value, side="left" if left else "right"))
+
+    low, high = 0, len(values)
+
+    while low < high:
+        middle: int = (low + high) // 2
+
+        if (values[middle] < value) if left else (values[middle] <= value):
+            low = middle + 1
+        else:
+            high = middle
+
+    return low
+
+
+def _rescale(column: Sequence, factor: int) -> Sequence:
+    if factor == 1:
+        return column
+
+    if numpy is not None:
+        return column * factor
+
+    return array("q", (value * factor for value in column))
+
+
+class MarketStore:
+    """
+    Local historical market data store.
+
+    Candles (by product and granularity) and public trades (by product) are
+    kept in append-only columnar files under the cache directory, memory
+    mapped when read: a range held by a single chunk is returned as
+    zero-copy views of the files (NumPy arrays if NumPy is installed,
+    `memoryview` objects otherwise).
+
+    The store also records which ranges were fetched, including the ones
+    without any data, so the backfill methods of the `products` handler
+    only request the missing gaps.
+
+    Reads are safe from several threads and processes, writes to the same
+    series should be made by a single process at a time.
+    """
+
+    def __init__(self, path: str = CACHE.STORE):
+        """
+        :param path: The store directory (defaults to: `CACHE.STORE`).
+        """
+        self.path: str = path
+
+        self._series: Dict[Tuple[str, ...], _Series] = {}
+        self._lock: Lock = Lock()
+
+    def __reduce__(self):
+        return self.__class__, (self.path,)
+
+    def _get(self, schema: Tuple[Tuple[str, str], ...], *names: str) -> _Series:
+        with self._lock:
+            series: _Series = self._series.get(names)
+
+            if series is None:
+                series: _Series = _Series(join(self.path, *names), schema)
+                self._series[names] = series
+
+            return series
+
+    def _candles(self, product_id: str, granularity: int) -> _Series:
+        return self._get(_CANDLES, "candles", product_id, str(granularity))
+
+    def _trades(self, product_id: str) -> _Series:
+        return self._get(_TRADES, "trades", product_id)
+
+    @staticmethod
+    def _align(
+            granularity: int,
+            start: Union[datetime, int, float, str],
+            end: Union[datetime, int, float, str]
+    ) -> Tuple[int, int]:
+        start: int = int(to_posix(start))
+        end: int = int(to_posix(end))
+        return start - start % granularity, end - end % granularity
+
+    def candle_gaps(
+            self,
+            product_id: str,
+            granularity: int,
+            start: Union[datetime, int, float, str],
+            end: Union[datetime, int, float, str]
+    ) -> List[Tuple[int, int]]:
+        """
+        The `(start, end)` POSIX sub ranges of `[start, end]` that are not
+        stored yet, aligned to the granularity.
+        """
+        start, end = self._align(granularity, start, end)
+        return self._candles(product_id, granularity).gaps(start, end, granularity)
+
+    def add_candles(
+            self,
+            product_id: str,
+            granularity: int,
+            start: Union[datetime, int, float, str],
+            end: Union[datetime, int, float, str],
+            candles: List[List]
+    ):
+        """
+        Store the `candles` fetched for `[start, end]`, parts of the range
+        already stored are skipped.
+
+        :param product_id: The product ID (i.e. `BTC-USD`).
+        :param granularity: Bucket size in seconds.
+        :param start: Start of the fetched range (`datetime`, POSIX or ISO 8601).
+        :param end: End of the fetched range (`datetime`, POSIX or ISO 8601).
+        :param candles: The decoded `candles` response.
+        """
+        series: _Series = self._candles(product_id, granularity)
+        buckets: Dict[int, List] = {int(candle[0]): candle for candle in candles}
+
+        with series._lock:
+            for low, high in self.candle_gaps(product_id, granularity, start, end):
+                rows: List[List] = [buckets.get(key) for key in sorted(buckets) if low <= key <= high]
+                series.append(
+                    low, high,
+                    {name: [row[index] for row in rows] for index, (name, _) in enumerate(_CANDLES)}
+                )
+
+    def candles(
+            self,
+            product_id: str,
+            granularity: int,
+            start: Union[datetime, int, float, str],
+            end: Union[datetime, int, float, str]
+    ) -> Candles:
+        """
+        The stored candles between `start` and `end` (inclusive), sorted by
+        time (ascending).
+        """
+        start, end = self._align(granularity, start, end)
+        series: _Series = self._candles(product_id, granularity)
+        slices: list = series.select("time", start, end)
+
+        if len(slices) == 0:
+            return Candles.from_payload([])
+
+        return Candles(**series.read(slices))
+
+    def trade_gaps(self, product_id: str, first_id: int, last_id: int) -> List[Tuple[int, int]]:
+        """The `(first_id, last_id)` sub ranges of trade IDs not stored yet."""
+        return self._trades(product_id).gaps(first_id, last_id, 1)
+
+    def add_trades(self, product_id: str, first_id: int, last_id: int, trades: List[Dict]):
+        """
+        Store the `trades` fetched for the `[first_id, last_id]` trade IDs
+        range, parts of the range already stored are skipped.
+
+        :param product_id: The product ID (i.e. `BTC-USD`).
+        :param first_id: First trade ID of the fetched range.
+        :param last_id: Last trade ID of the fetched range.
+        :param trades: The decoded `trades` responses.
+        """
+        series: _Series = self._trades(product_id)
+        by_id: Dict[int, Dict] = {int(trade.get("trade_id")): trade for trade in trades}
+
+        with series._lock:
+            for low, high in self.trade_gaps(product_id, first_id, last_id):
+                rows: Trades = Trades.from_payload(
+                    [by_id.get(key) for key in sorted(by_id) if low <= key <= high]
+                )
+                series.append(
+                    low, high,
+                    {name: getattr(rows, name) for name, _ in _TRADES},
+                    (rows.price_scale, rows.size_scale)
+                )
+
+    def trades(
+            self,
+            product_id: str,
+            start: Union[datetime, int, float, str] = None,
+            end: Union[datetime, int, float, str] = None
+    ) -> Trades:
+        """
+        The stored trades between `start` and `end` (inclusive, defaults to
+        all of them), sorted by trade ID.
+        """
+        start: float = float("-inf") if start is None else to_posix(start)
+        end: float = float("inf") if end is None else to_posix(end)
+        return self._read_trades(self._trades(product_id), "time", start, end)
+
+    def trades_by_id(self, product_id: str, first_id: int, last_id: int) -> Trades:
+        """The stored trades with an ID in `[first_id, last_id]`."""
+        return self._read_trades(self._trades(product_id), "trade_id", first_id, last_id)
+
+    @staticmethod
+    def _read_trades(series: _Series, name: str, low: float, high: float) -> Trades:
+        slices: list = series.select(name, low, high)
+
+        if len(slices) == 0:
+            return Trades.from_payload([])
+
+        columns: Dict[str, Sequence] = series.read(slices)
+        price_scale: int = max(record[4] for record, _, _ in slices)
+        size_scale: int = max(record[5] for record, _, _ in slices)
+
+        if len(slices) > 1:
+            # chunks may use different scales, bring them to the largest:
+            for column, index, scale in (("price", 4, price_scale), ("size", 5, size_scale)):
+                columns[column] = series.columns.get(column).concat([
+                    _rescale(series.columns.get(column).view(start, stop), 10 ** (scale - record[index]))
+                    for record, start, stop in slices
+                ])
+
+        return Trades(price_scale=price_scale, size_scale=size_scale, **columns)
@@ -0,0 +1,461 @@
+# -*- coding: UTF-8 -*-
+
+from asyncio import Task, ensure_future
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from csv import DictWriter
+from datetime import datetime
+from decimal import Decimal
+from typing import TYPE_CHECKING, AsyncIterator, Deque, Dict, Iterator, List, Tuple, Union
+
+from ..constants import ENCODING
+from ..utils import missing_dependency, to_posix
+
+if TYPE_CHECKING:
+    from .columnar import Trades
+    from .store import MarketStore
+
+__all__ = ["TradeDownloader"]
+
+# trades per request (the API maximum):
+_PAGE: int = 1000
+
+# CSV and Parquet columns:
+_FIELDS: Tuple[str, ...] = ("trade_id", "time", "side", "price", "size")
+
+# `(low, high, trades)`: trades of the `[low, high]` trade IDs range
+_Batch = Tuple[int, int, List[Dict]]
+
+
+class _Batcher:
+    """Regroup the pages of trades in batches of `size` trades."""
+
+    def __init__(self, size: int, forward: bool):
+        self.size: int = size
+        self.forward: bool = forward
+
+        self._trades: List[Dict] = []
+        self._low: int = None
+        self._high: int = None
+
+    def push(self, low: int, high: int, trades: List[Dict]) -> List[_Batch]:
+        """Add a page covering `[low, high]` and get the completed batches."""
+        if self._low is None:
+            self._low, self._high = low, high
+        elif self.forward:
+            self._high = high
+        else:
+            self._low = low
+
+        self._trades.extend(trades)
+        batches: List[_Batch] = []
+
+        while len(self._trades) >= self.size:
+            trades, self._trades = self._trades[:self.size], self._trades[self.size:]
+            boundary: int = trades[-1].get("trade_id")
+
+            # the batch covers the IDs up to its last trade, the rest of the
+            # range stays with the trades left over:
+            if self.forward:
+                batches.append((self._low, boundary, trades))
+                self._low = boundary + 1
+            else:
+                batches.append((boundary, self._high, trades))
+                self._high = boundary - 1
+
+        return batches
+
+    def flush(self) -> List[_Batch]:
+        if (self._low is None) or (self._low > self._high):
+            return []
+
+        return [(self._low, self._high, self._trades)]
+
+
+class _CSVWriter:
+
+    def __init__(self, path: str):
+        self._handler = open(path, "w", encoding=ENCODING, newline="")
+        self._writer: DictWriter = DictWriter(self._handler, fieldnames=_FIELDS, extrasaction="ignore")
+        self._writer.writeheader()
+
+    def write(self, trades: List[Dict]):
+        self._writer.writerows(trades)
+
+    def close(self):
+        self._handler.close()
+
+
+class _ParquetWriter:
+
+    def __init__(self, path: str):
+        try:
+            import pyarrow
+            from pyarrow import parquet
+        except ImportError as error:
+            raise missing_dependency("the Parquet export", "pyarrow", "parquet") from error
+
+        self._pyarrow = pyarrow
+        # decimal safe prices and sizes, one row group per batch:
+        self._schema = pyarrow.schema([
+            ("trade_id", pyarrow.int64()),
+            ("time", pyarrow.timestamp("us", tz="UTC")),
+            ("side", pyarrow.string()),
+            ("price", pyarrow.decimal128(38, 18)),
+            ("size", pyarrow.decimal128(38, 18)),
+        ])
+        self._writer = parquet.ParquetWriter(path, self._schema)
+
+    def write(self, trades: List[Dict]):
+        columns: list = [
+            [trade.get("trade_id") for trade in trades],
+            [round(to_posix(trade.get("time")) * 1_000_000) for trade in trades],
+            [trade.get("side") for trade in trades],
+            [Decimal(trade.get("price")) for trade in trades],
+            [Decimal(trade.get("size")) for trade in trades],
+        ]
+        self._writer.write_table(
+            self._pyarrow.Table.from_arrays(
+                [self._pyarrow.array(column, type=field.type) for column, field in zip(columns, self._schema)],
+                schema=self._schema
+            )
+        )
+
+    def close(self):
+        self._writer.close()
+
+
+class _StoreWriter:
+
+    def __init__(self, store: "MarketStore", product_id: str):
+        self._store: "MarketStore" = store
+        self._product_id: str = product_id
+
+    def add(self, low: int, high: int, trades: List[Dict]):
+        self._store.add_trades(self._product_id, low, high, trades)
+
+
+class TradeDownloader:
+    """
+    Streaming downloader of the public trades of a product.
+
+    The trade ID range is split in pages of 1000 IDs whose cursors are
+    known in advance, so `max_workers` of them are requested at the same
+    time (paced by the rate limiter of the session). Pages are consumed in
+    order, backwards from the newest trade (the API order) or `forward`
+    from the oldest one, and regrouped in batches of `batch_size` trades.
+
+    At most `max_workers` pages and one batch are held in memory, whatever
+    the length of the range.
+
+    The range is given by trade IDs or by time: `start` and `end` are
+    resolved to trade IDs with a binary search over the trade IDs (about 30
+    single trade requests each).
+    """
+
+    def __init__(
+            self,
+            products,
+            product_id: str,
+            first_id: int = None,
+            last_id: int = None,
+            start: Union[datetime, int, float, str] = None,
+            end: Union[datetime, int, float, str] = None,
+            forward: bool = False,
+            batch_size: int = 10000,
+            max_workers: int = 4
+    ):
+        """
+        :param products: The :class:`.endpoints.Products` handler.
+        :param product_id: The product ID (i.e. `BTC-USD`).
+        :param first_id: First trade ID of the range (defaults to: the first
+            trade at or after `start`, or the first trade).
+        :param last_id: Last trade ID of the range (defaults to: the last
+            trade at or before `end`, or the newest trade).
+        :param start: Start of the range (`datetime`, POSIX or ISO 8601),
+            if `first_id` is not given.
+        :param end: End of the range (`datetime`, POSIX or ISO 8601), if
+            `last_id` is not given.
+        :param forward: Walk the range from the oldest trade to the newest
+            (defaults to: `False`, newest first).
+        :param batch_size: Trades per batch (defaults to: 10000).
+        :param max_workers: Number of requests in flight (defaults to: 4).
+        """
+        self._products = products
+
+        self.product_id: str = product_id
+        self.first_id: int = first_id
+        self.last_id: int = last_id
+        self.start: float = None if start is None else to_posix(start)
+        self.end: float = None if end is None else to_posix(end)
+        self.forward: bool = forward
+        self.batch_size: int = batch_size
+        self.max_workers: int = max_workers
+
+    def _params(self, trade_id: int, limit: int = _PAGE) -> dict:
+        # `after` returns the trades older than the cursor:
+        return {"limit": limit, "after": trade_id + 1}
+
+    def _spans(self, first_id: int, last_id: int) -> Iterator[Tuple[int, int]]:
+        """The `[low, high]` trade IDs range of every page, in walk order."""
+        if self.forward:
+            for low in range(first_id, last_id + 1, _PAGE):
+                yield low, min(low + _PAGE - 1, last_id)
+        else:
+            for high in range(last_id, first_id - 1, -_PAGE):
+                yield max(high - _PAGE + 1, first_id), high
+
+    def _page(self, span: Tuple[int, int], trades: List[Dict]) -> List[Dict]:
+        """
+        The trades of the `span` range, in walk order. The response may go
+        past it when trade IDs are not contiguous.
+        """
+        trades: List[Dict] = [
+            trade for trade in trades if span[0] <= trade.get("trade_id") <= span[1]
+        ]
+        return trades[::-1] if self.forward else trades
+
+    @staticmethod
+    def _probe(trades: List[Dict]) -> Tuple[int, float]:
+        """ID and POSIX time of the single trade of a probe response."""
+        if len(trades) == 0:
+            return 0, float("-inf")
+        return trades[0].get("trade_id"), to_posix(trades[0].get("time"))
+
+    @staticmethod
+    def _search(low: int, high: int) -> Iterator[int]:
+        """
+        Binary search of the last trade ID in `[low, high]` with a time
+        before a limit. Yields the IDs to probe and receives whether the
+        trade at (or just before) each one is before the limit.
+        """
+        while low < high:
+            middle: int = (low + high + 1) // 2
+
+            if (yield middle):
+                low = middle
+            else:
+                high = middle - 1
+
+        return low
+
+    def _bounds(self, newest: int, first_id: int, last_id: int) -> Tuple[int, int]:
+        last_id: int = newest if last_id is None else min(last_id, newest)
+        return (1 if first_id is None else first_id), last_id
+
+    def resolve(self) -> Tuple[int, int]:
+        """The `(first_id, last_id)` trade IDs range to download."""
+        newest, _ = self._probe(self._fetch(None, 1))
+        first_id, last_id = self.first_id, self.last_id
+
+        if (first_id is None) and (self.start is not None):
+            first_id: int = self._locate(newest, lambda timestamp: timestamp < self.start) + 1
+
+        if (last_id is None) and (self.end is not None):
+            last_id: int = self._locate(newest, lambda timestamp: timestamp <= self.end)
+
+        return self._bounds(newest, first_id, last_id)
+
+    def _locate(self, newest: int, before) -> int:
+        search = self._search(0, newest)
+
+        try:
+            trade_id: int = next(search)
+
+            while True:
+                _, timestamp = self._probe(self._fetch(trade_id, 1))
+                trade_id: int = search.send(before(timestamp))
+        except StopIteration as result:
+            return result.value
+
+    def _fetch(self, trade_id: int = None, limit: int = _PAGE) -> List[Dict]:
+        params: dict = {"limit": limit} if trade_id is None else self._params(trade_id, limit)
+        return self._products._get(self.product_id, "trades", params=params, parser=list)
+
+    def _pages(self, first_id: int, last_id: int) -> Iterator[_Batch]:
+        pending: Deque[Tuple[Tuple[int, int], Future]] = deque()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for span in self._spans(first_id, last_id):
+                pending.append((span, executor.submit(self._fetch, span[1])))
+
+                if len(pending) >= self.max_workers:
+                    span, future = pending.popleft()
+                    yield span[0], span[1], self._page(span, future.result())
+
+            while len(pending) > 0:
+                span, future = pending.popleft()
+                yield span[0], span[1], self._page(span, future.result())
+
+    def _batches(self, first_id: int = None, last_id: int = None) -> Iterator[_Batch]:
+        if (first_id is None) or (last_id is None):
+            first_id, last_id = self.resolve()
+
+        batcher: _Batcher = _Batcher(self.batch_size, self.forward)
+
+        for low, high, trades in self._pages(first_id, last_id):
+            yield from batcher.push(low, high, trades)
+
+        yield from batcher.flush()
+
+    def batches(self, columnar: bool = True) -> Iterator[Union["Trades", List[Dict]]]:
+        """
+        Iterate over the batches of trades.
+
+        :param columnar: Yield typed, decimal safe columns
+            (:class:`.columnar.Trades`) instead of the decoded trades
+            (defaults to: `True`).
+        """
+        from .columnar import Trades
+
+        for _, _, trades in self._batches():
+            if len(trades) > 0:
+                yield Trades.from_payload(trades) if columnar else trades
+
+    def to_csv(self, path: str) -> int:
+        """
+        Write the trades to a CSV file, with the values as sent by the API.
+
+        :return: The number of trades written.
+        """
+        return self._write(_CSVWriter(path))
+
+    def to_parquet(self, path: str) -> int:
+        """
+        Write the trades to a Parquet file, one row group per batch.
+        Requires the optional `pyarrow` package (the `parquet` extra).
+
+        :return: The number of trades written.
+        """
+        return self._write(_ParquetWriter(path))
+
+    def _write(self, writer) -> int:
+        count: int = 0
+
+        try:
+            for _, _, trades in self._batches():
+                if len(trades) > 0:
+                    writer.write(trades)
+                count += len(trades)
+        finally:
+            writer.close()
+
+        return count
+
+    def to_store(self, store: "MarketStore") -> int:
+        """
+        Add the trades to a local store (see :class:`.store.MarketStore`),
+        only the trade IDs it doesn't hold yet are downloaded.
+
+        :return: The number of trades added.
+        """
+        writer: _StoreWriter = _StoreWriter(store, self.product_id)
+        count: int = 0
+
+        for low, high in store.trade_gaps(self.product_id, *self.resolve()):
+            for batch in self._batches(low, high):
+                writer.add(*batch)
+                count += len(batch[2])
+
+        return count
+
+    async def aresolve(self) -> Tuple[int, int]:
+        """Asynchronous version of :meth:`resolve` for the :mod:`.aio` handlers."""
+        newest, _ = self._probe(await self._afetch(None, 1))
+        first_id, last_id = self.first_id, self.last_id
+
+        if (first_id is None) and (self.start is not None):
+            first_id: int = await self._alocate(newest, lambda timestamp: timestamp < self.start) + 1
+
+        if (last_id is None) and (self.end is not None):
+            last_id: int = await self._alocate(newest, lambda timestamp: timestamp <= self.end)
+
+        return self._bounds(newest, first_id, last_id)
+
+    async def _alocate(self, newest: int, before) -> int:
+        search = self._search(0, newest)
+
+        try:
+            trade_id: int = next(search)
+
+            while True:
+                _, timestamp = self._probe(await self._afetch(trade_id, 1))
+                trade_id: int = search.send(before(timestamp))
+        except StopIteration as result:
+            return result.value
+
+    async def _afetch(self, trade_id: int = None, limit: int = _PAGE) -> List[Dict]:
+        params: dict = {"limit": limit} if trade_id is None else self._params(trade_id, limit)
+        return await self._products._get(self.product_id, "trades", params=params, parser=list)
+
+    async def _apages(self, first_id: int, last_id: int) -> AsyncIterator[_Batch]:
+        pending: Deque[Tuple[Tuple[int, int], Task]] = deque()
+
+        try:
+            for span in self._spans(first_id, last_id):
+                pending.append((span, ensure_future(self._afetch(span[1]))))
+
+                if len(pending) >= self.max_workers:
+                    span, task = pending.popleft()
+                    yield span[0], span[1], self._page(span, await task)
+
+            while len(pending) > 0:
+                span, task = pending.popleft()
+                yield span[0], span[1], self._page(span, await task)
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+    async def _abatches(self, first_id: int = None, last_id: int = None) -> AsyncIterator[_Batch]:
+        if (first_id is None) or (last_id is None):
+            first_id, last_id = await self.aresolve()
+
+        batcher: _Batcher = _Batcher(self.batch_size, self.forward)
+
+        async for low, high, trades in self._apages(first_id, last_id):
+            for batch in batcher.push(low, high, trades):
+                yield batch
+
+        for batch in batcher.flush():
+            yield batch
+
+    async def abatches(self, columnar: bool = True) -> AsyncIterator[Union["Trades", List[Dict]]]:
+        """Asynchronous version of :meth:`batches` for the :mod:`.aio` handlers."""
+        from .columnar import Trades
+
+        async for _, _, trades in self._abatches():
+            if len(trades) > 0:
+                yield Trades.from_payload(trades) if columnar else trades
+
+    async def ato_csv(self, path: str) -> int:
+        """Asynchronous version of :meth:`to_csv` for the :mod:`.aio` handlers."""
+        return await self._awrite(_CSVWriter(path))
+
+    async def ato_parquet(self, path: str) -> int:
+        """Asynchronous version of :meth:`to_parquet` for the :mod:`.aio` handlers."""
+        return await self._awrite(_ParquetWriter(path))
+
+    async def _awrite(self, writer) -> int:
+        count: int = 0
+
+        try:
+            async for _, _, trades in self._abatches():
+                if len(trades) > 0:
+                    writer.write(trades)
+                count += len(trades)
+        finally:
+            writer.close()
+
+        return count
+
+    async def ato_store(self, store: "MarketStore") -> int:
+        """Asynchronous version of :meth:`to_store` for the :mod:`.aio` handlers."""
+        writer: _StoreWriter = _StoreWriter(store, self.product_id)
+        count: int = 0
+
+        for low, high in store.trade_gaps(self.product_id, *await self.aresolve()):
+            async for batch in self._abatches(low, high):
+                writer.add(*batch)
+                count += len(batch[2])
+
+        return count
@@ -0,0 +1,153 @@
+# -*- coding: UTF-8 -*-
+
+from decimal import Decimal, InvalidOperation, ROUND_DOWN, ROUND_HALF_EVEN, ROUND_UP
+from typing import TYPE_CHECKING, Union
+
+from .models import Product
+
+if TYPE_CHECKING:
+    from .reference import ReferenceData
+
+__all__ = ["OrderError", "OrderValidator"]
+
+
+class OrderError(ValueError):
+    """Raised when an order is rejected locally, before being sent."""
+
+    def __init__(self, message: str, order: dict = None):
+        super(OrderError, self).__init__(message)
+        self.order: dict = order
+
+
+class OrderValidator:
+    """
+    Local pre-trade validation and normalisation of the orders against the
+    product constraints, so orders the exchange would reject don't cost a
+    round trip (and rate limit budget).
+
+    **Checks:**
+        - the product exists and is trading (not `trading_disabled`,
+          `cancel_only` or offline);
+        - no market orders on `limit_only` and `post_only` products;
+        - no `post_only` orders with a `IOC` or `FOK` time in force;
+        - limit orders have a `price` and a `size`, market orders a `size`
+          or `funds`;
+        - `price`, `stop_price` and `funds` are multiples of the
+          `quote_increment`, `size` is a multiple of the `base_increment`;
+        - `funds` are within `min_market_funds` and `max_market_funds`, and
+          the notional value of limit orders (`price * size`) is at least
+          `min_market_funds`.
+
+    **Rounding:**
+        With `rounding` enabled, values off increment are rounded instead of
+        rejected: the `size` and `funds` down, the `price` away from the
+        book (down for buys, up for sells) and the `stop_price` to the
+        nearest increment. The normalised values are sent as strings.
+    """
+
+    def __init__(self, products: Union["ReferenceData", dict], rounding: bool = True):
+        """
+        :param products: Where the products are looked up by ID: a
+            :class:`.reference.ReferenceData` registry (or a mapping of
+            :class:`.models.Product` by product ID).
+        :param rounding: Round the values off increment instead of
+            rejecting them (defaults to: `True`).
+        """
+        self.products = products
+        self.rounding: bool = rounding
+
+    def _product(self, order: dict) -> Product:
+        product_id: str = order.get("product_id")
+
+        if not product_id:
+            raise OrderError("Missing product_id!", order)
+
+        try:
+            if hasattr(self.products, "product"):
+                return self.products.product(product_id)
+            return self.products[product_id]
+        except KeyError:
+            raise OrderError(f"Unknown product: {product_id!r}!", order) from None
+
+    def validate(self, order: dict) -> dict:
+        """
+        Validate and normalise an order (the `create_order()` keyword
+        arguments).
+
+        :return: A normalised copy of the order.
+        :raises OrderError: If the exchange would reject the order.
+        """
+        product: Product = self._product(order)
+        order: dict = dict(order)
+        kind: str = order.get("type") or "limit"
+
+        if product.trading_disabled or (product.status not in (None, "online")):
+            raise OrderError(f"Trading is disabled on {product.id}!", order)
+
+        if product.cancel_only:
+            raise OrderError(f"{product.id} only accepts cancel requests!", order)
+
+        if (kind == "market") and (product.limit_only or product.post_only):
+            raise OrderError(f"{product.id} doesn't accept market orders!", order)
+
+        if order.get("post_only") and ((kind == "market") or (order.get("time_in_force") in ("IOC", "FOK"))):
+            raise OrderError("Post only orders must rest on the book (GTC or GTT limit orders)!", order)
+
+        buy: bool = order.get("side") == "buy"
+        price: Decimal = self._value(order, "price", product.quote_increment, ROUND_DOWN if buy else ROUND_UP)
+        size: Decimal = self._value(order, "size", product.base_increment, ROUND_DOWN)
+        funds: Decimal = self._value(order, "funds", product.quote_increment, ROUND_DOWN)
+        self._value(order, "stop_price", product.quote_increment, ROUND_HALF_EVEN)
+
+        if kind == "market":
+            if (size is None) and (funds is None):
+                raise OrderError("Market orders need a size or funds!", order)
+        elif (price is None) or (size is None):
+            raise OrderError("Limit orders need a price and a size!", order)
+
+        if funds is not None:
+            self._check_funds(order, funds, product)
+
+        if (price is not None) and (size is not None) and (product.min_market_funds is not None):
+            if price * size < product.min_market_funds:
+                raise OrderError(f"Order value {price * size} is below the minimum of {product.min_market_funds}!", order)
+
+        return order
+
+    def _value(self, order: dict, name: str, increment: Decimal, rounding: str) -> Decimal:
+        """Parse the `name` field of `order`, rounded to `increment`."""
+        value = order.get(name)
+
+        if value is None:
+            return None
+
+        try:
+            value: Decimal = Decimal(value if isinstance(value, str) else repr(value))
+        except InvalidOperation:
+            raise OrderError(f"Invalid {name}: {value!r}!", order) from None
+
+        if (not value.is_finite()) or (value <= 0):
+            raise OrderError(f"Invalid {name}: {value!r}!", order)
+
+        if increment:
+            steps: Decimal = value / increment
+
+            if steps != steps.to_integral_value():
+                if not self.rounding:
+                    raise OrderError(f"The {name} {value} is not a multiple of {increment:f}!", order)
+
+                value: Decimal = (steps.to_integral_value(rounding) * increment).quantize(increment)
+
+                if value <= 0:
+                    raise OrderError(f"The {name} is below the minimum of {increment:f}!", order)
+
+        order[name] = f"{value:f}"
+        return value
+
+    @staticmethod
+    def _check_funds(order: dict, funds: Decimal, product: Product):
+        if (product.min_market_funds is not None) and (funds < product.min_market_funds):
+            raise OrderError(f"Funds {funds} are below the minimum of {product.min_market_funds}!", order)
+
+        if (product.max_market_funds is not None) and (funds > product.max_market_funds):
+            raise OrderError(f"Funds {funds} are above the maximum of {product.max_market_funds}!", order)
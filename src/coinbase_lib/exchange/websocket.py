@@ -0,0 +1,301 @@
+# -*- coding: UTF-8 -*-
+
+"""
+Exchange/Pro websocket market data feed.
+
+Messages are delivered as typed objects (see :class:`Message`) either to a
+`callback` or through asynchronous iteration::
+
+    async with Feed(["BTC-USD"], ["ticker", "heartbeat"]) as feed:
+        async for message in feed:
+            ...
+
+The connection is re-established (and every subscription re-sent) when it
+drops. Requires the optional `websockets` package (the `ws` extra).
+"""
+
+from asyncio import Queue, Task, QueueFull, CancelledError, create_task, sleep
+from inspect import isawaitable
+from json import dumps, loads
+from logging import Logger, getLogger
+from random import uniform
+from typing import List, Callable, Union
+
+from .authentication import WSAuth
+from .constants import ENVIRONMENT, WEBSOCKET
+from .messages import (
+    Message,
+    Subscriptions,
+    Heartbeat,
+    Ticker,
+    Snapshot,
+    L2Update,
+    Match,
+    Received,
+    Open,
+    Done,
+    Change,
+    Error,
+)
+from ..constants import NAME
+from ..utils import missing_dependency
+
+try:
+    from websockets import connect
+    from websockets.exceptions import ConnectionClosed, InvalidHandshake
+except ImportError as error:  # optional dependency
+    raise missing_dependency("the websocket feed", "websockets", "ws") from error
+
+__all__ = [
+    "Message",
+    "Subscriptions",
+    "Heartbeat",
+    "Ticker",
+    "Snapshot",
+    "L2Update",
+    "Match",
+    "Received",
+    "Open",
+    "Done",
+    "Change",
+    "Error",
+    "Feed",
+]
+
+# end of stream marker:
+_CLOSED = object()
+
+
+class Feed:
+    """
+    Websocket feed client with automatic reconnection.
+
+    **Backpressure:**
+        When consumed by iteration, messages are buffered in a queue of at
+        most `max_queue` items. With `overflow="block"` (default) the socket
+        is not read while the queue is full, so the server side buffers
+        fill up instead of the process memory. With `overflow="drop"` the
+        oldest buffered message is discarded (see :attr:`dropped`).
+    """
+
+    def __init__(
+            self,
+            product_ids: List[str],
+            channels: List[Union[str, dict]],
+            callback: Callable = None,
+            key: str = None,
+            passphrase: str = None,
+            secret: str = None,
+            environment: str = ENVIRONMENT,
+            url: str = None,
+            max_queue: int = 10000,
+            overflow: str = "block",
+            reconnect: bool = True,
+            max_delay: float = 30,
+            logger: Logger = None
+    ):
+        """
+        :param product_ids: The product IDs to subscribe to (i.e. `BTC-USD`).
+        :param channels: The channels to subscribe to (`ticker`, `level2`,
+            `matches`, `heartbeat`, `full`, etc.).
+        :param callback: Function (or coroutine function) called with every
+            message, its exceptions are logged and the feed keeps running.
+            If given, the feed can't be iterated.
+        :param key: The API key (for authenticated feeds).
+        :param passphrase: The API passphrase (for authenticated feeds).
+        :param secret: The API secret (for authenticated feeds).
+        :param environment: The API environment: `production` or `sandbox`
+            (defaults to: `production`).
+        :param url: Feed URL, overrides `environment` (i.e. a local mock).
+        :param max_queue: Maximum number of buffered messages
+            (defaults to: 10000).
+        :param overflow: What to do when the buffer is full: `block` or
+            `drop` (defaults to: `block`).
+        :param reconnect: Reconnect when the connection drops
+            (defaults to: `True`).
+        :param max_delay: Maximum delay in seconds between reconnection
+            attempts (defaults to: 30).
+        :param logger: The handler to be used for logging.
+        """
+        if overflow not in ("block", "drop"):
+            raise ValueError(f"Invalid overflow policy: {overflow}!")
+
+        self.url: str = url or WEBSOCKET.get(environment)
+        self.product_ids: List[str] = list(product_ids)
+        self.channels: List[Union[str, dict]] = list(channels)
+        self.overflow: str = overflow
+        self.reconnect: bool = reconnect
+        self.max_delay: float = max_delay
+
+        # number of messages discarded by the `drop` overflow policy:
+        self.dropped: int = 0
+
+        self._callback: Callable = callback
+        self._auth: WSAuth = WSAuth(key, passphrase, secret) if key is not None else None
+        self._log: Logger = logger or getLogger(NAME)
+        self._queue: Queue = Queue(maxsize=max_queue)
+        self._task: Task = None
+        self._socket = None
+        self._closed: bool = False
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def __aiter__(self):
+        if self._callback is not None:
+            raise TypeError("A feed with a callback can't be iterated!")
+
+        self.start()
+        return self
+
+    async def __anext__(self) -> Message:
+        message = await self._queue.get()
+
+        if message is _CLOSED:
+            raise StopAsyncIteration
+
+        return message
+
+    def start(self):
+        """Start the connection loop in a background task."""
+        if self._task is None:
+            self._task = create_task(self.run())
+
+    async def run(self):
+        """
+        Connect, subscribe and dispatch messages until closed, reconnecting
+        with exponential backoff when the connection drops.
+        """
+        delay: float = 1
+
+        try:
+            while not self._closed:
+                try:
+                    async with connect(self.url, max_size=None) as socket:
+                        self._socket = socket
+                        await self._send("subscribe")
+                        delay: float = 1
+
+                        async for raw in socket:
+                            await self._receive(raw)
+
+                except (ConnectionClosed, InvalidHandshake, OSError) as error:
+                    self._log.warning(f"Feed connection lost: {error!r}")
+
+                finally:
+                    self._socket = None
+
+                if self._closed or (not self.reconnect):
+                    break
+
+                await sleep(uniform(delay / 2, delay))
+                delay: float = min(delay * 2, self.max_delay)
+
+        except CancelledError:
+            pass
+
+        finally:
+            self._closed = True
+            await self._end()
+
+    async def subscribe(self, product_ids: List[str] = None, channels: List[Union[str, dict]] = None):
+        """
+        Add subscriptions. They are kept and re-sent after a reconnection.
+        """
+        product_ids: List[str] = [item for item in product_ids or [] if item not in self.product_ids]
+        channels: List[Union[str, dict]] = [item for item in channels or [] if item not in self.channels]
+
+        self.product_ids.extend(product_ids)
+        self.channels.extend(channels)
+
+        await self._send("subscribe", product_ids or self.product_ids, channels or self.channels)
+
+    async def unsubscribe(self, product_ids: List[str] = None, channels: List[Union[str, dict]] = None):
+        """Remove subscriptions."""
+        product_ids: List[str] = product_ids or []
+        channels: List[Union[str, dict]] = channels or []
+
+        self.product_ids = [item for item in self.product_ids if item not in product_ids]
+        self.channels = [item for item in self.channels if item not in channels]
+
+        await self._send("unsubscribe", product_ids, channels)
+
+    async def close(self):
+        """Close the connection and stop the background task."""
+        self._closed = True
+
+        if self._task is not None:
+            self._task.cancel()
+            await self._task
+
+    async def _send(self, action: str, product_ids: List[str] = None, channels: List[Union[str, dict]] = None):
+        if self._socket is None:
+            return
+
+        message: dict = {
+            "type": action,
+            "product_ids": self.product_ids if product_ids is None else product_ids,
+            "channels": self.channels if channels is None else channels,
+        }
+
+        if self._auth is not None:
+            self._auth.sign(method="GET", path="/users/self/verify", params=message)
+
+        await self._socket.send(dumps(message))
+
+    async def _receive(self, raw: Union[str, bytes]):
+        """
+        Decode and dispatch a received message. A message that can't be
+        decoded or handled is logged and skipped, the connection is kept.
+        """
+        try:
+            message: Message = Message.from_payload(loads(raw))
+        except Exception as error:
+            self._log.warning(f"Feed message skipped, can't be decoded: {error!r} ({raw[:200]!r})")
+            return
+
+        try:
+            await self._dispatch(message)
+        except Exception as error:
+            self._log.warning(f"Feed callback failed for {message!r}: {error!r}")
+
+    async def _dispatch(self, message: Message):
+        if isinstance(message, Error):
+            self._log.error(f"Feed error: {message.message} ({message.reason})")
+
+        if self._callback is not None:
+            result = self._callback(message)
+
+            if isawaitable(result):
+                await result
+
+            return
+
+        if self.overflow == "block":
+            await self._queue.put(message)
+            return
+
+        while True:
+            try:
+                self._queue.put_nowait(message)
+                return
+            except QueueFull:
+                self._queue.get_nowait()
+                self.dropped += 1
+
+    async def _end(self):
+        """Wake up the consumers waiting on the queue."""
+        if self._callback is not None:
+            return
+
+        while True:
+            try:
+                self._queue.put_nowait(_CLOSED)
+                return
+            except QueueFull:
+                self._queue.get_nowait()
+                self.dropped += 1
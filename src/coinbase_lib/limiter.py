@@ -0,0 +1,227 @@
+# -*- coding: UTF-8 -*-
+
+from asyncio import sleep as async_sleep
+from os import O_CREAT, O_RDWR, SEEK_SET, close, lseek, makedirs, open as os_open, read, write
+from os.path import join
+from struct import Struct
+from tempfile import gettempdir
+from threading import Lock
+from time import monotonic, sleep
+from typing import Dict, Tuple
+
+from .constants import NAME
+
+try:
+    from fcntl import flock, LOCK_EX, LOCK_UN
+except ImportError:  # Windows
+    flock = None
+    from msvcrt import locking, LK_LOCK, LK_UNLCK
+
+__all__ = ["TokenBucket", "SharedTokenBucket", "RateLimiter", "SharedRateLimiter"]
+
+# `(tokens, stamp)` state of a shared bucket:
+_STATE: Struct = Struct("dd")
+
+
+class TokenBucket:
+    """
+    Thread-safe and asyncio-safe token bucket.
+
+    The bucket refills at `rate` tokens per second up to `burst` tokens.
+    Every call reserves its tokens immediately (the balance may go below
+    zero) and gets back the time it has to wait before sending, so
+    concurrent callers are served in arrival order without busy waiting.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        """
+        :param rate: Sustained number of requests per second.
+        :param burst: Maximum number of requests in a burst.
+        """
+        self.rate: float = rate
+        self.burst: int = burst
+
+        self._tokens: float = burst
+        self._stamp: float = monotonic()
+        self._lock: Lock = Lock()
+
+    def reserve(self, tokens: int = 1) -> float:
+        """
+        Take `tokens` out of the bucket and return how many seconds the
+        caller must wait before using them.
+        """
+        with self._lock:
+            now: float = monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            self._tokens -= tokens
+
+            if self._tokens >= 0:
+                return 0.0
+
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens: int = 1):
+        """Block the current thread until `tokens` are available."""
+        delay: float = self.reserve(tokens)
+
+        if delay > 0:
+            sleep(delay)
+
+    async def wait(self, tokens: int = 1):
+        """Suspend the current task until `tokens` are available."""
+        delay: float = self.reserve(tokens)
+
+        if delay > 0:
+            await async_sleep(delay)
+
+
+class SharedTokenBucket(TokenBucket):
+    """
+    Token bucket shared by the processes of a host.
+
+    The balance is kept in a small file updated under an exclusive file
+    lock, so several processes (i.e. process pool workers) draw from the
+    same budget. The monotonic clock is system wide, so the stamps of all
+    the processes are comparable.
+    """
+
+    def __init__(self, rate: float, burst: int, path: str):
+        """
+        :param rate: Sustained number of requests per second.
+        :param burst: Maximum number of requests in a burst.
+        :param path: The state file, created if missing.
+        """
+        super(SharedTokenBucket, self).__init__(rate, burst)
+        self.path: str = path
+        self._fd: int = None
+
+    def __del__(self):
+        if self._fd is not None:
+            close(self._fd)
+
+    def _lock_file(self):
+        if flock is not None:
+            flock(self._fd, LOCK_EX)
+        else:
+            lseek(self._fd, 0, SEEK_SET)
+            locking(self._fd, LK_LOCK, _STATE.size)
+
+    def _unlock_file(self):
+        if flock is not None:
+            flock(self._fd, LOCK_UN)
+        else:
+            lseek(self._fd, 0, SEEK_SET)
+            locking(self._fd, LK_UNLCK, _STATE.size)
+
+    def reserve(self, tokens: int = 1) -> float:
+        # the file lock doesn't exclude the threads of this process:
+        with self._lock:
+            if self._fd is None:
+                self._fd = os_open(self.path, O_RDWR | O_CREAT, 0o600)
+
+            self._lock_file()
+
+            try:
+                lseek(self._fd, 0, SEEK_SET)
+                state: bytes = read(self._fd, _STATE.size)
+                now: float = monotonic()
+
+                if len(state) == _STATE.size:
+                    balance, stamp = _STATE.unpack(state)
+                else:
+                    balance, stamp = self.burst, now
+
+                # a stamp from the future was written before a reboot:
+                if stamp > now:
+                    balance, stamp = self.burst, now
+
+                balance: float = min(self.burst, balance + (now - stamp) * self.rate) - tokens
+
+                lseek(self._fd, 0, SEEK_SET)
+                write(self._fd, _STATE.pack(balance, now))
+
+            finally:
+                self._unlock_file()
+
+        if balance >= 0:
+            return 0.0
+
+        return -balance / self.rate
+
+
+class RateLimiter:
+    """
+    Registry of token buckets keyed by rate limit name and profile.
+
+    Buckets are created on first use from the `limits` table, so every
+    profile gets its own budget for the same name.
+    """
+
+    def __init__(self, limits: Dict[str, Tuple[float, int]]):
+        """
+        :param limits: Mapping of rate limit names to
+            `(requests per second, burst)` tuples.
+        """
+        self.limits: Dict[str, Tuple[float, int]] = limits
+
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._lock: Lock = Lock()
+
+    def __reduce__(self):
+        # the buckets are not copied, each process gets its own budget:
+        return self.__class__, (self.limits,)
+
+    def _bucket(self, name: str, profile: str) -> TokenBucket:
+        rate, burst = self.limits.get(name)
+        return TokenBucket(rate, burst)
+
+    def bucket(self, name: str, profile: str = None) -> TokenBucket:
+        """Get (or create) the bucket for `name` and `profile`."""
+        key: Tuple[str, str] = (name, profile)
+
+        try:
+            return self._buckets[key]
+        except KeyError:
+            with self._lock:
+                if key not in self._buckets:
+                    self._buckets[key] = self._bucket(name, profile)
+                return self._buckets[key]
+
+    def acquire(self, name: str, profile: str = None):
+        """Block until a request for `name` and `profile` may be sent."""
+        self.bucket(name, profile).acquire()
+
+    async def wait(self, name: str, profile: str = None):
+        """Suspend until a request for `name` and `profile` may be sent."""
+        await self.bucket(name, profile).wait()
+
+
+class SharedRateLimiter(RateLimiter):
+    """
+    Rate limiter whose budgets are shared by all the processes of a host
+    using the same directory (see :class:`SharedTokenBucket`).
+
+    It can be pickled, i.e. passed to process pool workers: the copies keep
+    drawing from the same budgets.
+    """
+
+    def __init__(self, limits: Dict[str, Tuple[float, int]], path: str = None):
+        """
+        :param limits: Mapping of rate limit names to
+            `(requests per second, burst)` tuples.
+        :param path: Directory of the bucket state files
+            (defaults to: a `coinbase-limits` directory in the system
+            temporary directory).
+        """
+        super(SharedRateLimiter, self).__init__(limits)
+        self.path: str = path or join(gettempdir(), f"{NAME}-limits")
+        makedirs(self.path, exist_ok=True)
+
+    def __reduce__(self):
+        return self.__class__, (self.limits, self.path)
+
+    def _bucket(self, name: str, profile: str) -> TokenBucket:
+        rate, burst = self.limits.get(name)
+        filename: str = name if profile is None else f"{name}-{profile}"
+        return SharedTokenBucket(rate, burst, join(self.path, filename))
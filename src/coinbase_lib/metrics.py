@@ -0,0 +1,284 @@
+# -*- coding: UTF-8 -*-
+
+from bisect import bisect_left
+from threading import Lock
+from typing import Callable, Dict, List, Tuple
+from urllib.parse import urlsplit
+
+from .constants import METRICS
+
+__all__ = ["endpoint_label", "Sample", "Histogram", "Metrics"]
+
+
+def endpoint_label(url: str) -> str:
+    """
+    Low cardinality endpoint name for `url`: the first path segment and the
+    last one when there are IDs in between (i.e. `products/ticker` for
+    `/products/BTC-USD/ticker`, `orders` for `/orders/{order_id}`).
+    """
+    path: List[str] = urlsplit(url).path.strip("/").split("/")
+
+    if len(path) > 2:
+        return f"{path[0]}/{path[-1]}"
+
+    return path[0]
+
+
+class Sample:
+    """A single request observation, as passed to the callbacks."""
+
+    __slots__ = ("method", "endpoint", "status", "elapsed", "sent", "received", "retries")
+
+    def __init__(
+            self,
+            method: str,
+            endpoint: str,
+            status: int,
+            elapsed: float,
+            sent: int,
+            received: int,
+            retries: int
+    ):
+        self.method: str = method
+        self.endpoint: str = endpoint
+        self.status: int = status
+        self.elapsed: float = elapsed
+        self.sent: int = sent
+        self.received: int = received
+        self.retries: int = retries
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}({self.method} {self.endpoint} {self.status}, "
+            f"elapsed={self.elapsed:.6f}, sent={self.sent}, received={self.received}, "
+            f"retries={self.retries})"
+        )
+
+
+class Histogram:
+    """Cumulative histogram with fixed bucket upper bounds."""
+
+    __slots__ = ("bounds", "counts", "count", "sum")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds: Tuple[float, ...] = bounds
+        # one extra bucket for `+Inf`:
+        self.counts: List[int] = [0] * (len(bounds) + 1)
+        self.count: int = 0
+        self.sum: float = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """`(upper bound, count)` pairs, the last bound is `inf`."""
+        total: int = 0
+        buckets: List[Tuple[float, int]] = []
+
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            total += count
+            buckets.append((bound, total))
+
+        return buckets
+
+
+class _Counters:
+    __slots__ = ("latency", "requests", "errors", "throttled", "retries", "sent", "received", "hits", "misses")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.latency: Histogram = Histogram(bounds)
+        self.requests: int = 0
+        self.errors: int = 0
+        self.throttled: int = 0
+        self.retries: int = 0
+        self.sent: int = 0
+        self.received: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+
+
+class Metrics:
+    """
+    Thread-safe request metrics registry.
+
+    Sessions given a registry report every request sent over the network
+    (latency, bytes in and out, retries, status) and every response cache
+    lookup. Values are aggregated by endpoint (see :func:`endpoint_label`)
+    and every request :class:`Sample` is also passed to the subscribed
+    callbacks.
+
+    Sessions without a registry skip all of this, so metrics cost nothing
+    unless enabled.
+    """
+
+    def __init__(
+            self,
+            buckets: Tuple[float, ...] = METRICS.BUCKETS,
+            label: Callable[[str], str] = endpoint_label,
+            prefix: str = METRICS.PREFIX
+    ):
+        """
+        :param buckets: Latency histogram bucket upper bounds in seconds
+            (defaults to: `METRICS.BUCKETS`).
+        :param label: Function naming the endpoint of an URL
+            (defaults to: :func:`endpoint_label`).
+        :param prefix: Metric names prefix used by :meth:`render`.
+        """
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+        self.label: Callable[[str], str] = label
+        self.prefix: str = prefix
+
+        self._counters: Dict[str, _Counters] = {}
+        self._callbacks: List[Callable[[Sample], None]] = []
+        self._lock: Lock = Lock()
+
+    def __reduce__(self):
+        # copies start empty and without callbacks, each process collects
+        # its own metrics:
+        return self.__class__, (self.buckets, self.label, self.prefix)
+
+    def subscribe(self, callback: Callable[[Sample], None]):
+        """Call `callback` with every request :class:`Sample`."""
+        self._callbacks.append(callback)
+
+    def unsubscribe(self, callback: Callable[[Sample], None]):
+        self._callbacks.remove(callback)
+
+    def _get(self, endpoint: str) -> _Counters:
+        counters: _Counters = self._counters.get(endpoint)
+
+        if counters is None:
+            counters: _Counters = self._counters.setdefault(endpoint, _Counters(self.buckets))
+
+        return counters
+
+    def observe(
+            self,
+            method: str,
+            url: str,
+            status: int,
+            elapsed: float,
+            sent: int = 0,
+            received: int = 0,
+            retries: int = 0,
+            throttled: int = 0
+    ):
+        """
+        Record a request.
+
+        :param method: The HTTP method.
+        :param url: The request URL.
+        :param status: The response status code (`None` if it failed).
+        :param elapsed: Seconds from sending the request to the response.
+        :param sent: Request body size in bytes.
+        :param received: Response body size in bytes.
+        :param retries: Number of retries made.
+        :param throttled: Number of `429` responses retried.
+        """
+        endpoint: str = self.label(url)
+
+        with self._lock:
+            counters: _Counters = self._get(endpoint)
+            counters.latency.observe(elapsed)
+            counters.requests += 1
+            counters.sent += sent
+            counters.received += received
+            counters.retries += retries
+
+            if (status is None) or (status >= 400):
+                counters.errors += 1
+
+            # the retried ones included, absorbed or not:
+            counters.throttled += throttled + (status == 429)
+
+        if len(self._callbacks) > 0:
+            sample: Sample = Sample(method, endpoint, status, elapsed, sent, received, retries)
+
+            for callback in self._callbacks:
+                callback(sample)
+
+    def cache(self, url: str, hit: bool):
+        """Record a response cache lookup."""
+        endpoint: str = self.label(url)
+
+        with self._lock:
+            counters: _Counters = self._get(endpoint)
+
+            if hit is True:
+                counters.hits += 1
+            else:
+                counters.misses += 1
+
+    def hit_rate(self, endpoint: str = None) -> float:
+        """Cache hit rate of `endpoint`, or overall if not given."""
+        with self._lock:
+            if endpoint is not None:
+                counters: List[_Counters] = [self._counters[endpoint]] if endpoint in self._counters else []
+            else:
+                counters: List[_Counters] = list(self._counters.values())
+
+            hits: int = sum(item.hits for item in counters)
+            lookups: int = hits + sum(item.misses for item in counters)
+
+        return hits / lookups if lookups > 0 else 0.0
+
+    def snapshot(self) -> Dict[str, dict]:
+        """The current values by endpoint."""
+        with self._lock:
+            return {
+                endpoint: {
+                    "requests": counters.requests,
+                    "errors": counters.errors,
+                    "throttled": counters.throttled,
+                    "retries": counters.retries,
+                    "bytes_sent": counters.sent,
+                    "bytes_received": counters.received,
+                    "cache_hits": counters.hits,
+                    "cache_misses": counters.misses,
+                    "latency_count": counters.latency.count,
+                    "latency_sum": counters.latency.sum,
+                    "latency_buckets": counters.latency.cumulative(),
+                }
+                for endpoint, counters in self._counters.items()
+            }
+
+    def render(self) -> str:
+        """The current values in the Prometheus text exposition format."""
+        snapshot: Dict[str, dict] = self.snapshot()
+        lines: List[str] = []
+
+        for name, key, help_text in (
+                ("requests_total", "requests", "Requests sent."),
+                ("errors_total", "errors", "Failed requests and error responses."),
+                ("throttled_total", "throttled", "Rate limited (429) responses."),
+                ("retries_total", "retries", "Retries made."),
+                ("sent_bytes_total", "bytes_sent", "Request body bytes sent."),
+                ("received_bytes_total", "bytes_received", "Response body bytes received."),
+                ("cache_hits_total", "cache_hits", "Responses served from cache."),
+                ("cache_misses_total", "cache_misses", "Cache lookups not found."),
+        ):
+            lines.append(f"# HELP {self.prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {self.prefix}_{name} counter")
+
+            for endpoint, values in snapshot.items():
+                lines.append(f'{self.prefix}_{name}{{endpoint="{endpoint}"}} {values.get(key)}')
+
+        name: str = f"{self.prefix}_request_duration_seconds"
+        lines.append(f"# HELP {name} Request latency.")
+        lines.append(f"# TYPE {name} histogram")
+
+        for endpoint, values in snapshot.items():
+            for bound, count in values.get("latency_buckets"):
+                bound: str = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{name}_bucket{{endpoint="{endpoint}",le="{bound}"}} {count}')
+
+            lines.append(f'{name}_sum{{endpoint="{endpoint}"}} {values.get("latency_sum")}')
+            lines.append(f'{name}_count{{endpoint="{endpoint}"}} {values.get("latency_count")}')
+
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
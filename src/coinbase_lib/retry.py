@@ -0,0 +1,251 @@
+# -*- coding: UTF-8 -*-
+
+from random import uniform
+from threading import Lock
+from time import monotonic
+from typing import Callable, Collection
+
+from requests.exceptions import ConnectionError
+from urllib3.exceptions import MaxRetryError
+from urllib3.util.retry import Retry
+
+from .constants import RETRY
+from .utils import loads
+
+__all__ = ["CircuitOpenError", "CircuitBreaker", "RetryPolicy"]
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised instead of sending a request while the circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker stopping retry storms when the exchange is
+    degraded.
+
+    After `threshold` consecutive failures (connection errors, rate limited
+    or server side error responses) the circuit opens: requests fail fast
+    with :class:`CircuitOpenError` and pending retries are dropped. After
+    `reset` seconds a single trial request is let through (half open), its
+    success closes the circuit and its failure opens it again.
+
+    A breaker can be shared by several sessions, i.e. all the handlers
+    talking to the same API.
+    """
+
+    CLOSED: str = "closed"
+    OPEN: str = "open"
+    HALF_OPEN: str = "half-open"
+
+    def __init__(self, threshold: int = RETRY.THRESHOLD, reset: float = RETRY.RESET):
+        """
+        :param threshold: Consecutive failures opening the circuit
+            (defaults to: `RETRY.THRESHOLD`).
+        :param reset: Seconds the circuit stays open before a trial request
+            (defaults to: `RETRY.RESET`).
+        """
+        self.threshold: int = threshold
+        self.reset: float = reset
+
+        self._failures: int = 0
+        self._opened: float = None
+        self._trial: bool = False
+        self._lock: Lock = Lock()
+
+    def __reduce__(self):
+        # copies start closed, each process tracks its own failures:
+        return self.__class__, (self.threshold, self.reset)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened is None:
+            return self.CLOSED
+
+        if monotonic() - self._opened < self.reset:
+            return self.OPEN
+
+        return self.HALF_OPEN
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now."""
+        with self._lock:
+            state: str = self._state()
+
+            if state == self.CLOSED:
+                return True
+
+            if (state == self.HALF_OPEN) and (not self._trial):
+                self._trial = True
+                return True
+
+            return False
+
+    @property
+    def open(self) -> bool:
+        """Whether requests are currently refused (open, or half open with a trial in flight)."""
+        with self._lock:
+            state: str = self._state()
+            return (state == self.OPEN) or ((state == self.HALF_OPEN) and self._trial)
+
+    def success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened = None
+            self._trial = False
+
+    def failure(self):
+        with self._lock:
+            self._failures += 1
+
+            if self._trial or (self._failures >= self.threshold):
+                self._opened = monotonic()
+                self._trial = False
+
+
+class RetryPolicy(Retry):
+    """
+    Endpoint aware `urllib3` retry policy.
+
+    **Retried:**
+        - idempotent requests (`GET` and `DELETE`, i.e. cancels) on
+          connection and read errors and on `429` and `5xx` responses;
+        - `POST` requests only if their JSON body has a `client_oid`: the
+          exchange rejects the retry of an order already placed as a
+          duplicate, and :meth:`.exchange.endpoints.Orders.create_order`
+          resolves that rejection by looking the order up;
+        - any request on errors raised before it was sent (connection
+          refused, DNS, ...).
+
+    Backoff is exponential with a random jitter and the `Retry-After`
+    header is honoured when sent. When the last attempt fails its response
+    is returned (not raised) so the API error message is kept.
+
+    With a :class:`CircuitBreaker`, failures are reported to it and the
+    pending retries are dropped while it is open. With a `throttle`, every
+    retry takes a rate limit token after its backoff, like the first
+    attempt.
+    """
+
+    def __init__(
+            self,
+            total: int = 3,
+            backoff_factor: float = 1,
+            breaker: CircuitBreaker = None,
+            throttle: Callable[[], None] = None,
+            **kwargs
+    ):
+        """
+        :param total: Total number of retries to allow (defaults to: 3).
+        :param backoff_factor: A backoff factor to apply between attempts
+            after the second try (defaults to: 1).
+        :param breaker: Circuit breaker to report to (defaults to: `None`).
+        :param throttle: Function blocking until a retry may be sent, i.e.
+            taking a :class:`.limiter.RateLimiter` token (defaults to: `None`).
+        :param kwargs: Other :class:`urllib3.util.retry.Retry` arguments.
+        """
+        kwargs.setdefault("status_forcelist", RETRY.STATUS)
+        kwargs.setdefault("allowed_methods", frozenset(RETRY.METHODS))
+        kwargs.setdefault("backoff_jitter", RETRY.JITTER)
+        kwargs.setdefault("backoff_max", RETRY.BACKOFF_MAX)
+        kwargs.setdefault("raise_on_status", False)
+
+        super(RetryPolicy, self).__init__(total=total, backoff_factor=backoff_factor, **kwargs)
+        self.breaker: CircuitBreaker = breaker
+        self.throttle: Callable[[], None] = throttle
+
+    def new(self, **kwargs) -> "RetryPolicy":
+        throttle: Callable[[], None] = kwargs.pop("throttle", self.throttle)
+        retry: RetryPolicy = super(RetryPolicy, self).new(**kwargs)
+        retry.breaker = self.breaker
+        retry.throttle = throttle
+        return retry
+
+    @staticmethod
+    def idempotent(method: str, body: bytes) -> bool:
+        """Whether a `POST` request carries a `client_oid`."""
+        if (method != "POST") or (not isinstance(body, bytes)) or (b"client_oid" not in body):
+            return False
+
+        try:
+            payload = loads(body)
+        except ValueError:
+            return False
+
+        return isinstance(payload, dict) and bool(payload.get("client_oid"))
+
+    def methods(self, method: str, body: bytes) -> Collection[str]:
+        """The methods retried for a request."""
+        if self.idempotent(method, body):
+            return frozenset(self.allowed_methods) | {"POST"}
+        return self.allowed_methods
+
+    def for_request(self, method: str, body: bytes, throttle: Callable[[], None] = None) -> "RetryPolicy":
+        """
+        The policy applying to a request.
+
+        :param throttle: Function called before each retry of the request
+            (defaults to: `None`).
+        """
+        if self.idempotent(method, body):
+            return self.new(allowed_methods=self.methods(method, body), throttle=throttle)
+
+        if throttle is not None:
+            return self.new(throttle=throttle)
+
+        return self
+
+    def failed(self, status: int) -> bool:
+        """Whether a response status counts as a failure for the breaker."""
+        return (status == 429) or (status >= 500)
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if (self.breaker is not None) and self.breaker.open:
+            return False
+        return super(RetryPolicy, self).is_retry(method, status_code, has_retry_after)
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None) -> "RetryPolicy":
+        if self.breaker is not None:
+            if (error is not None) or ((response is not None) and self.failed(response.status)):
+                self.breaker.failure()
+
+            if self.breaker.open:
+                raise MaxRetryError(_pool, url, error or CircuitOpenError("Circuit breaker open"))
+
+        return super(RetryPolicy, self).increment(method, url, response, error, _pool, _stacktrace)
+
+    def sleep(self, response=None):
+        super(RetryPolicy, self).sleep(response)
+
+        if self.throttle is not None:
+            self.throttle()
+
+    def backoff(self, retries: int, retry_after: str = None) -> float:
+        """
+        Seconds to wait before the retry following `retries` failed
+        attempts, for the asynchronous sessions: the `Retry-After` value if
+        given, the jittered exponential backoff otherwise.
+        """
+        if (retry_after is not None) and self.respect_retry_after_header:
+            try:
+                delay: float = self.parse_retry_after(retry_after)
+            except Exception:
+                pass
+            else:
+                # not capped by the older `urllib3` 2.x, like their sync retries:
+                cap: float = getattr(self, "retry_after_max", None)
+                return delay if cap is None else min(delay, cap)
+
+        if retries <= 1:
+            return 0
+
+        delay: float = self.backoff_factor * (2 ** (retries - 1))
+
+        if self.backoff_jitter != 0.0:
+            delay += uniform(0, self.backoff_jitter)
+
+        return max(0, min(self.backoff_max, delay))
@@ -1,29 +1,104 @@
 # -*- coding: UTF-8 -*-
 
-from logging import Logger, getLogger
+from functools import partial
+from logging import DEBUG, Logger, getLogger
+from threading import local
+from time import perf_counter
+from typing import Callable, Tuple, Union
 
-from requests import Session, Response
+from requests import Session, Response, PreparedRequest
 from requests.adapters import HTTPAdapter
-from requests_cache import install_cache
-from urllib3.util.retry import Retry
 
-from .constants import CACHE, HEADERS, NAME
-from .utils import extract_msg
+from .cache import ResponseCache
+from .constants import ENCODING, HEADERS, NAME
+from .limiter import RateLimiter
+from .metrics import Metrics
+from .retry import CircuitBreaker, CircuitOpenError, RetryPolicy
+from .utils import encode, extract_msg
 
 
 class TimeoutHTTPAdapter(HTTPAdapter):
-    """Custom HTTP adapter with timeout capability."""
+    """
+    Custom HTTP adapter with timeout capability.
 
-    def __init__(self, retries: int = 3, backoff: float = 1, timeout: int = 30):
+    Requests are retried following a :class:`.retry.RetryPolicy`: only the
+    ones safe to send twice are retried on errors and `429`/`5xx`
+    responses, with a jittered backoff honouring `Retry-After`. Sent with a
+    `throttle`, every retry takes a rate limit token too.
+    """
+
+    def __init__(
+            self,
+            retries: int = 3,
+            backoff: float = 1,
+            timeout: int = 30,
+            pool_connections: int = 10,
+            pool_maxsize: int = 10,
+            breaker: CircuitBreaker = None
+    ):
+        """
+        :param retries: Total number of retries to allow (defaults to: 3).
+        :param backoff: A backoff factor to apply between attempts after the
+            second try (defaults to: 1).
+        :param timeout: How long to wait for the server to send data before
+            giving up (defaults to: 30).
+        :param pool_connections: Number of hosts with a connection pool kept
+            (defaults to: 10).
+        :param pool_maxsize: Maximum number of connections kept alive per
+            host (defaults to: 10).
+        :param breaker: Circuit breaker failing fast while the exchange is
+            degraded (see :class:`.retry.CircuitBreaker`, defaults to: `None`).
+        """
         self._timeout = timeout
-        max_retries = Retry(
+        # the policy of the request being sent by the current thread:
+        self._local: local = local()
+        max_retries = RetryPolicy(
             total=retries,
-            backoff_factor=backoff
+            backoff_factor=backoff,
+            breaker=breaker
+        )
+        super(TimeoutHTTPAdapter, self).__init__(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries
         )
-        super(TimeoutHTTPAdapter, self).__init__(max_retries=max_retries)
 
-    def send(self, request, **kwargs):
-        return super(TimeoutHTTPAdapter, self).send(request, timeout=self._timeout, **kwargs)
+    @property
+    def max_retries(self) -> RetryPolicy:
+        # read by `HTTPAdapter.send()`, which has no per request argument:
+        return getattr(self._local, "retries", None) or self._retries
+
+    @max_retries.setter
+    def max_retries(self, value: RetryPolicy):
+        self._retries = value
+
+    def send(self, request, throttle: Callable[[], None] = None, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs.update(timeout=self._timeout)
+
+        breaker: CircuitBreaker = getattr(self._retries, "breaker", None)
+
+        if (breaker is not None) and (not breaker.allow()):
+            raise CircuitOpenError(f"Circuit breaker open! URL: {request.url}", request=request)
+
+        body: bytes = request.body.encode() if isinstance(request.body, str) else request.body
+        self._local.retries = self._retries.for_request(request.method, body, throttle)
+
+        try:
+            response: Response = super(TimeoutHTTPAdapter, self).send(request, **kwargs)
+        finally:
+            self._local.retries = None
+
+        if breaker is not None:
+            retries = getattr(response.raw, "retries", None)
+
+            if not self._retries.failed(response.status_code):
+                breaker.success()
+            elif (retries is None) or (len(retries.history) == 0):
+                # not retried, so not reported by the policy yet:
+                breaker.failure()
+
+        return response
 
 
 class BaseSession(Session):
@@ -36,9 +111,15 @@ class BaseSession(Session):
             retries: int = 3,
             backoff: int = 1,
             timeout: int = 30,
-            cache: bool = True,
+            cache: Union[bool, ResponseCache] = True,
             debug: bool = False,
-            logger: Logger = None
+            logger: Logger = None,
+            limiter: RateLimiter = None,
+            pool_connections: int = 10,
+            pool_maxsize: int = 10,
+            adapter: TimeoutHTTPAdapter = None,
+            metrics: Metrics = None,
+            breaker: CircuitBreaker = None
     ):
         """
         :param retries: Total number of retries to allow (defaults to: 3).
@@ -46,39 +127,141 @@ class BaseSession(Session):
             second try (defaults to: 1).
         :param timeout: How long to wait for the server to send data before
             giving up (defaults to: 30).
-        :param cache: Use caching (defaults to: `True`);
+        :param cache: Use caching (defaults to: `True`). Either a boolean
+            or the :class:`ResponseCache` to use; the default cache is kept
+            in memory and scoped to this session.
         :param debug: Set to True to log all requests/responses to/from server
             (defaults to: `False`).
         :param logger: The handler to be used for logging. If given, and level
             is above `DEBUG`, all debug messages will be ignored.
+        :param limiter: Client side rate limiter used to pace requests
+            before every attempt (retries included), for the requests
+            naming their rate limit with `throttle` (defaults to: `None`).
+        :param pool_connections: Number of hosts with a connection pool kept
+            (defaults to: 10).
+        :param pool_maxsize: Maximum number of connections kept alive per
+            host (defaults to: 10).
+        :param adapter: Transport adapter to use instead of a new one, so
+            several sessions share its connection pool (`retries`,
+            `backoff`, `timeout`, the pool sizes and `breaker` are then
+            ignored).
+        :param metrics: Registry collecting the request metrics
+            (defaults to: `None`).
+        :param breaker: Circuit breaker failing fast while the exchange is
+            degraded (see :class:`.retry.CircuitBreaker`, defaults to: `None`).
         """
         if cache is True:
-            install_cache(
-                cache_name=CACHE.NAME,
-                backend=CACHE.BACKEND,
-                expire_after=CACHE.EXPIRE
-            )
+            cache: ResponseCache = ResponseCache()
+
+        if cache is False:
+            cache: ResponseCache = None
 
         if logger is not None:
             self._log = logger
 
         super(BaseSession, self).__init__()
 
+        self.limiter: RateLimiter = limiter
+        self.cache: ResponseCache = cache
+        self.metrics: Metrics = metrics
+        # the rate limit of the request being sent by the current thread:
+        self._local: local = local()
+
         self.headers.update(HEADERS)
 
-        self.mount(
-            "http://",
-            TimeoutHTTPAdapter(retries, backoff, timeout)
-        )
+        if adapter is None:
+            adapter: TimeoutHTTPAdapter = TimeoutHTTPAdapter(
+                retries, backoff, timeout, pool_connections, pool_maxsize, breaker
+            )
 
-        self.mount(
-            "https://",
-            TimeoutHTTPAdapter(retries, backoff, timeout)
-        )
+        self.mount("http://", adapter)
+        self.mount("https://", adapter)
 
         if debug is True:
             self.hooks["response"] = [self.debug]
 
+    def request(self, method: str, url: str, *args, throttle: Tuple[str, str] = None, **kwargs) -> Response:
+        """
+        Send a request.
+
+        :param throttle: The `(name, profile ID)` rate limit taken from
+            :attr:`limiter` if the request goes over the network, not when
+            served from cache (defaults to: `None`, not rate limited).
+        """
+        self._local.throttle = throttle
+
+        try:
+            return super(BaseSession, self).request(method, url, *args, **kwargs)
+        finally:
+            self._local.throttle = None
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        """Send a given `PreparedRequest`, serving `GET` requests from cache."""
+        if (self.cache is None) or (request.method != "GET"):
+            return self._send(request, **kwargs)
+
+        ttl: float = self.cache.ttl(request.url)
+
+        if ttl <= 0:
+            return self._send(request, **kwargs)
+
+        response: Response = self.cache.get(request.url)
+
+        if self.metrics is not None:
+            self.metrics.cache(request.url, hit=response is not None)
+
+        if response is not None:
+            return response
+
+        response: Response = self._send(request, **kwargs)
+
+        if response.status_code == 200:
+            self.cache.set(request.url, response, ttl)
+
+        return response
+
+    def _send(self, request: PreparedRequest, **kwargs) -> Response:
+        """Send a request over the network, recording its metrics if enabled."""
+        throttle: Tuple[str, str] = getattr(self._local, "throttle", None)
+
+        if (self.limiter is not None) and (throttle is not None):
+            self.limiter.acquire(*throttle)
+            # the retries take a token each too:
+            kwargs.update(throttle=partial(self.limiter.acquire, *throttle))
+
+        if self.metrics is None:
+            return super(BaseSession, self).send(request, **kwargs)
+
+        # a `str` body goes out encoded, count its bytes:
+        sent: int = len(encode(request.body or b"", encoding=ENCODING))
+        start: float = perf_counter()
+
+        try:
+            response: Response = super(BaseSession, self).send(request, **kwargs)
+        except Exception:
+            self.metrics.observe(request.method, request.url, None, perf_counter() - start, sent)
+            raise
+
+        retries = getattr(response.raw, "retries", None)
+        history: tuple = retries.history if retries is not None else ()
+
+        self.metrics.observe(
+            request.method,
+            request.url,
+            response.status_code,
+            perf_counter() - start,
+            sent=sent,
+            received=len(response.content),
+            retries=len(history),
+            throttled=sum(item.status == 429 for item in history)
+        )
+
+        return response
+
     def debug(self, response: Response, *args, **kwargs):
+        # the dump is expensive, skip it if it would be discarded:
+        if not self._log.isEnabledFor(DEBUG):
+            return
+
         message: str = extract_msg(response)
         self._log.debug(message)
@@ -2,10 +2,15 @@
 
 from datetime import datetime, timezone
 from logging import getLogger, Logger, StreamHandler, Formatter
-from typing import Union, Any
+from typing import TYPE_CHECKING, Union, Any
 
-from requests import Response
-from requests_toolbelt.utils import dump
+if TYPE_CHECKING:
+    from requests import Response
+
+try:  # optional faster JSON decoder
+    from orjson import loads
+except ImportError:
+    from json import loads
 
 
 def decode(value: Union[bytes, str], **kwargs) -> str:
@@ -32,6 +37,21 @@ def encode(value: Union[str, bytes], **kwargs) -> bytes:
     return value
 
 
+def missing_dependency(feature: str, package: str, extra: str) -> ImportError:
+    """
+    The error raised when an optional dependency is not installed, naming
+    the extra (`requirements-<extra>.txt`) providing it.
+
+    :param feature: What needs the package (i.e. `the asynchronous handlers`).
+    :param package: The missing package.
+    :param extra: The extra to install.
+    """
+    return ImportError(
+        f"The optional `{package}` package is required by {feature}, install the `{extra}` extra: "
+        f"pip install -r requirements-{extra}.txt"
+    )
+
+
 def get_posix() -> float:
     """
     POSIX timestamp as float.
@@ -46,7 +66,29 @@ def get_utc() -> datetime:
     return datetime.now(timezone.utc)
 
 
-def extract_msg(response: Response, **kwargs) -> str:
+def to_posix(value: Union[datetime, int, float, str]) -> float:
+    """
+    Convert a `datetime`, a number or an ISO 8601 / numeric string to a
+    POSIX timestamp as float. Naive datetime values are assumed to be UTC.
+
+    :param value: Value to be converted.
+    """
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            value: datetime = datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+    if value.tzinfo is None:
+        value: datetime = value.replace(tzinfo=timezone.utc)
+
+    return value.timestamp()
+
+
+def extract_msg(response: "Response", **kwargs) -> str:
     """
     Dump all requests and responses including redirects.
     This takes the response returned by requests and will dump all
@@ -56,6 +98,9 @@ def extract_msg(response: Response, **kwargs) -> str:
     :param response: The response returned by requests.
     :param kwargs: Additional keyword arguments.
     """
+    # imported on first use, only needed for debugging:
+    from requests_toolbelt.utils import dump
+
     return decode(
         dump.dump_all(response),
         **kwargs
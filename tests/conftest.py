@@ -0,0 +1,53 @@
+# -*- coding: UTF-8 -*-
+
+from os.path import dirname, join, realpath
+from sys import path
+
+# run against the source tree:
+path.insert(0, join(dirname(dirname(realpath(__file__))), "src"))
+
+from collections import Counter  # noqa: E402
+
+from pytest import fixture  # noqa: E402
+
+from coinbase_lib.exchange import MockExchange  # noqa: E402
+from coinbase_lib.exchange.constants import RATE_LIMITS  # noqa: E402
+from coinbase_lib.limiter import RateLimiter  # noqa: E402
+
+KEY: str = "key"
+PASSPHRASE: str = "passphrase"
+SECRET: str = "c2VjcmV0"
+
+
+class CountingLimiter(RateLimiter):
+    """Rate limiter counting the tokens taken."""
+
+    def __init__(self, limits: dict):
+        super(CountingLimiter, self).__init__(limits)
+        self.tokens: Counter = Counter()
+
+    def acquire(self, name: str, profile: str = None):
+        self.tokens[name] += 1
+        super(CountingLimiter, self).acquire(name, profile)
+
+    async def wait(self, name: str, profile: str = None):
+        self.tokens[name] += 1
+        await super(CountingLimiter, self).wait(name, profile)
+
+
+@fixture
+def mock():
+    with MockExchange(key=KEY, passphrase=PASSPHRASE, secret=SECRET) as exchange:
+        yield exchange
+
+
+@fixture
+def credentials() -> tuple:
+    """The `(key, passphrase, secret)` accepted by :func:`mock`."""
+    return KEY, PASSPHRASE, SECRET
+
+
+@fixture
+def limiter() -> CountingLimiter:
+    """The documented rate limits, counting the tokens taken by name."""
+    return CountingLimiter(RATE_LIMITS)
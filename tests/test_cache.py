@@ -0,0 +1,103 @@
+# -*- coding: UTF-8 -*-
+
+from asyncio import run
+from time import monotonic
+
+from pytest import fixture, mark
+
+from coinbase_lib.exchange import Products, aio
+from coinbase_lib.exchange.endpoints import cache_ttl
+
+
+@fixture
+def products(mock, limiter) -> Products:
+    with Products(environment=mock.environment, limiter=limiter) as handler:
+        yield handler
+
+
+@mark.parametrize("path, ttl", [
+    ("/products", 3600),
+    ("/products/BTC-USD", 3600),
+    ("/products/BTC-USD/ticker", 1),
+    ("/products/BTC-USD/book?level=2", 0),
+    ("/products/BTC-USD/candles?granularity=60", 60),
+    ("/products/BTC-USD/stats", 30),
+    ("/products/BTC-USD/trades", 0),
+    ("/currencies/BTC", 21600),
+])
+def test_ttl_by_url(path, ttl):
+    assert cache_ttl(f"https://api.exchange.coinbase.com{path}") == ttl
+
+
+def test_cache_hits_bypass_the_limiter(mock, limiter, products):
+    for _ in range(20):
+        products.get_product("BTC-USD")
+
+    assert mock.requests.get("GET products") == 1
+    assert limiter.tokens.get("public") == 1
+
+
+def test_uncached_endpoint(mock, limiter, products):
+    for _ in range(3):
+        products.get_product_book("BTC-USD", level=2)
+
+    assert mock.requests.get("GET products") == 3
+    assert limiter.tokens.get("public") == 3
+
+
+def test_entries_expire(mock, limiter, products, monkeypatch):
+    products.get_product_ticker("BTC-USD")
+    products.get_product_ticker("BTC-USD")
+
+    assert mock.requests.get("GET products") == 1
+
+    now: float = monotonic()
+    monkeypatch.setattr("coinbase_lib.cache.monotonic", lambda: now + 2)
+    products.get_product_ticker("BTC-USD")
+    products.get_product("BTC-USD")
+    products.get_product("BTC-USD")
+
+    # the ticker expired after a second, the product is cached for an hour:
+    assert mock.requests.get("GET products") == 3
+    assert limiter.tokens.get("public") == 3
+
+
+def test_async_cache_hits_bypass_the_limiter(mock, limiter):
+    async def main():
+        async with aio.Products(environment=mock.environment, limiter=limiter) as products:
+            for _ in range(20):
+                await products.get_product("BTC-USD")
+
+            for _ in range(3):
+                await products.get_product_book("BTC-USD", level=2)
+
+    run(main())
+
+    assert mock.requests.get("GET products") == 1 + 3
+    assert limiter.tokens.get("public") == 1 + 3
+
+
+def test_async_cache_disabled(mock, limiter):
+    async def main():
+        async with aio.Products(environment=mock.environment, limiter=limiter, cache=False) as products:
+            for _ in range(3):
+                await products.get_product("BTC-USD")
+
+    run(main())
+
+    assert mock.requests.get("GET products") == 3
+
+
+def test_async_client_shares_the_cache(mock, credentials):
+    async def main():
+        async with aio.Client(*credentials, environment=mock.environment, limiter=None) as client:
+            await client.products.get_product("BTC-USD")
+            await client.products.get_product("BTC-USD")
+            await client.accounts.get_accounts()
+            await client.accounts.get_accounts()
+
+    run(main())
+
+    # products are cached, the accounts never:
+    assert mock.requests.get("GET products") == 1
+    assert mock.requests.get("GET accounts") == 2
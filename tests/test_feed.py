@@ -0,0 +1,62 @@
+# -*- coding: UTF-8 -*-
+
+from asyncio import Event, run, wait_for
+from json import dumps
+from logging import WARNING
+
+from pytest import importorskip
+
+from coinbase_lib.exchange import Feed, MockExchange
+
+serve = importorskip("websockets.asyncio.server").serve
+
+HEARTBEAT: dict = {"type": "heartbeat", "product_id": "BTC-USD", "sequence": 1, "last_trade_id": 1}
+
+
+def test_failing_callback_keeps_the_feed_running(caplog):
+    received: list = []
+
+    async def main():
+        done: Event = Event()
+
+        def callback(message):
+            received.append(message)
+
+            if len(received) >= 20:
+                done.set()
+
+            if len(received) % 2:
+                raise RuntimeError("callback failure")
+
+        async with Feed(["BTC-USD"], ["ticker"], callback=callback, environment=mock.environment) as feed:
+            await wait_for(done.wait(), 10)
+            assert not feed._closed
+
+    with MockExchange(websocket=True, interval=0.01) as mock, caplog.at_level(WARNING):
+        run(main())
+
+    assert len(received) >= 20
+    assert "Feed callback failed" in caplog.text
+
+
+def test_undecodable_messages_are_skipped(caplog):
+    async def handler(socket):
+        await socket.recv()  # the subscription
+
+        for raw in ("not json", "[1, 2]", dumps(HEARTBEAT)):
+            await socket.send(raw)
+
+        await socket.wait_closed()
+
+    async def main() -> list:
+        async with serve(handler, "127.0.0.1", 0) as server:
+            port: int = server.sockets[0].getsockname()[1]
+
+            async with Feed(["BTC-USD"], ["heartbeat"], url=f"ws://127.0.0.1:{port}") as feed:
+                return [await wait_for(feed.__anext__(), 10)]
+
+    with caplog.at_level(WARNING):
+        messages: list = run(main())
+
+    assert [message.type for message in messages] == ["heartbeat"]
+    assert caplog.text.count("Feed message skipped") == 2
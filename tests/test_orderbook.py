@@ -0,0 +1,162 @@
+# -*- coding: UTF-8 -*-
+
+from decimal import Decimal
+from random import Random
+from sys import getswitchinterval, setswitchinterval
+from threading import Thread
+
+from pytest import fixture, raises
+
+from coinbase_lib.exchange import OrderBook, Products
+from coinbase_lib.exchange.orderbook import BookSide, SequenceGapError
+
+SNAPSHOT: dict = {
+    "sequence": 10,
+    "bids": [["99", "1", "b1"], ["99", "2", "b2"], ["98", "3", "b3"]],
+    "asks": [["101", "1", "a1"], ["102", "2", "a2"]],
+}
+
+
+@fixture
+def book() -> OrderBook:
+    book: OrderBook = OrderBook("BTC-USD", level=3)
+    book.load(SNAPSHOT)
+    return book
+
+
+def test_snapshot(book):
+    assert book.sequence == 10
+    assert book.best_bid() == (Decimal("99"), Decimal("3"))
+    assert book.best_ask() == (Decimal("101"), Decimal("1"))
+    assert book.spread() == Decimal("2")
+
+
+def test_sequenced_messages(book):
+    book.apply({"type": "open", "sequence": 11, "order_id": "b4", "side": "buy", "price": "100", "remaining_size": "4"})
+    book.apply({"type": "match", "sequence": 12, "maker_order_id": "a1", "size": "0.5"})
+    book.apply({"type": "change", "sequence": 13, "order_id": "b2", "new_size": "1"})
+    book.apply({"type": "done", "sequence": 14, "order_id": "b4"})
+
+    assert book.sequence == 14
+    assert book.best_bid() == (Decimal("99"), Decimal("2"))
+    assert book.best_ask() == (Decimal("101"), Decimal("0.5"))
+
+
+def test_stale_messages_are_ignored(book):
+    book.apply({"type": "done", "sequence": 10, "order_id": "b1"})
+    book.apply({"type": "done", "sequence": 3, "order_id": "b1"})
+
+    assert book.sequence == 10
+    assert book.depth("buy", "99") == Decimal("3")
+
+
+def test_gap_without_snapshot(book):
+    with raises(SequenceGapError):
+        book.apply({"type": "done", "sequence": 12, "order_id": "b1"})
+
+
+def test_gap_loads_a_snapshot(mock):
+    with Products(environment=mock.environment, limiter=None) as products:
+        book: OrderBook = OrderBook(
+            "BTC-USD", level=3, snapshot=lambda: products.get_product_book("BTC-USD", level=3).json()
+        )
+        book.load()
+        sequence: int = book.sequence
+
+        book.apply({"type": "done", "sequence": sequence + 5, "order_id": "missing"})
+
+    assert book.resyncs == 1
+    assert mock.requests.get("GET products") == 2
+    assert book.sequence >= sequence
+    assert book.spread() > 0
+
+
+def test_level2_messages_on_a_level3_book(book):
+    with raises(ValueError):
+        book.apply({"type": "snapshot", "product_id": "BTC-USD", "bids": [["99", "1"]], "asks": [["101", "1"]]})
+
+    with raises(ValueError):
+        book.apply({"type": "l2update", "product_id": "BTC-USD", "changes": [["buy", "99", "0"]]})
+
+
+def test_level2_book():
+    book: OrderBook = OrderBook("BTC-USD", level=2)
+    book.apply({"type": "snapshot", "bids": [["99", "1"], ["98", "2"]], "asks": [["101", "1"], ["102", "2"]]})
+    book.apply({"type": "l2update", "changes": [["buy", "99", "0"], ["buy", "100", "5"], ["sell", "101", "3"]]})
+
+    assert book.best_bid() == (Decimal("100"), Decimal("5"))
+    assert book.best_ask() == (Decimal("101"), Decimal("3"))
+    assert book.levels("buy") == [(Decimal("100"), Decimal("5")), (Decimal("98"), Decimal("2"))]
+    assert book.levels("sell", 1) == [(Decimal("101"), Decimal("3"))]
+
+
+def test_book_side_matches_a_sorted_reference():
+    random: Random = Random(42)
+    side: BookSide = BookSide(descending=True)
+    reference: dict = {}
+
+    for _ in range(5000):
+        price: Decimal = Decimal(random.randrange(1000, 1200)) / 10
+        size: Decimal = Decimal(random.choice((0, 0, 1, 2, 3)))
+        side.set(price, size)
+
+        if size > 0:
+            reference[price] = size
+        else:
+            reference.pop(price, None)
+
+        expected: list = sorted(reference.items(), reverse=True)
+
+        assert side.best() == (expected[0] if expected else None)
+
+    assert side.levels() == expected
+    assert side.levels(10) == expected[:10]
+    assert list(side.walk()) == expected
+    assert len(side) == len(expected)
+
+
+def test_concurrent_apply_and_queries():
+    random: Random = Random(7)
+    book: OrderBook = OrderBook("BTC-USD", level=2)
+    book.apply({"type": "snapshot", "bids": [["99", "1"]], "asks": [["101", "1"]]})
+    errors: list = []
+
+    def feed():
+        for _ in range(20000):
+            price: str = str(Decimal(random.randrange(500, 990)) / 10)
+            book.apply({"type": "l2update", "changes": [["buy", price, random.choice(("0", "1", "2"))]]})
+
+    def query():
+        try:
+            while writer.is_alive():
+                levels: list = book.levels("buy")
+                best = book.best_bid()
+
+                assert levels == sorted(levels, reverse=True)
+                assert all(size > 0 for _, size in levels)
+                assert (best is None) or (best[1] > 0)
+                assert book.spread() > 0
+                book.vwap("sell", "1")
+        except Exception as error:
+            errors.append(error)
+
+    writer: Thread = Thread(target=feed)
+    readers: list = [Thread(target=query) for _ in range(3)]
+    # switch threads often, for the readers to run in the middle of updates:
+    interval: float = getswitchinterval()
+    setswitchinterval(1e-6)
+
+    try:
+        writer.start()
+
+        for reader in readers:
+            reader.start()
+
+        writer.join()
+
+        for reader in readers:
+            reader.join()
+    finally:
+        setswitchinterval(interval)
+
+    assert errors == []
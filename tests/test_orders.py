@@ -0,0 +1,115 @@
+# -*- coding: UTF-8 -*-
+
+from asyncio import run
+
+from httpx import HTTPStatusError
+from pytest import fixture, raises
+from requests import HTTPError
+
+from coinbase_lib.exchange import Orders, aio
+
+ORDER: dict = {"product_id": "BTC-USD", "side": "buy", "type": "limit", "price": "100", "size": "0.01"}
+
+
+@fixture
+def orders(mock, credentials) -> Orders:
+    with Orders(*credentials, environment=mock.environment, backoff=0, limiter=None) as handler:
+        yield handler
+
+
+def test_client_oid_is_set(mock, orders):
+    order: dict = orders.create_order(**ORDER).json()
+
+    assert order.get("client_oid")
+    assert len(orders.in_flight) == 0
+
+
+def test_lost_response_is_retried(mock, orders):
+    mock.fail(503)
+
+    assert orders.create_order(**ORDER).status_code == 200
+    assert mock.statuses.get(503) == 1
+    assert len(mock._orders) == 1
+
+
+def test_duplicate_after_lost_response(mock, orders):
+    # placed by the first attempt, the retry is rejected as a duplicate:
+    mock.fail(503, processed=True)
+    order: dict = orders.create_order(client_oid="e0f6b2a4-3d1c-4e5f-8a9b-0c1d2e3f4a5b", **ORDER).json()
+
+    assert order.get("client_oid") == "e0f6b2a4-3d1c-4e5f-8a9b-0c1d2e3f4a5b"
+    assert mock.statuses.get(400) == 1
+    assert mock.requests.get("GET orders") == 1
+    assert len(mock._orders) == 1
+    assert len(orders.in_flight) == 0
+
+
+def test_rejection_is_raised(mock, orders):
+    mock.fail(400, message="Insufficient funds")
+
+    with raises(HTTPError, match="Insufficient funds"):
+        orders.create_order(**ORDER)
+
+    # not ambiguous, so not looked up:
+    assert mock.requests.get("GET orders") is None
+    assert len(orders.in_flight) == 0
+
+
+def test_rejection_after_retry_is_resolved(mock, orders):
+    mock.fail(503)
+    mock.fail(400, message="Insufficient funds")
+
+    with raises(HTTPError, match="Insufficient funds"):
+        orders.create_order(**ORDER)
+
+    # not placed by the first attempt either, the lookup found nothing:
+    assert mock.requests.get("GET orders") == 1
+    assert len(orders.in_flight) == 0
+
+
+def test_async_duplicate_after_lost_response(mock, credentials):
+    async def main():
+        async with aio.Orders(*credentials, environment=mock.environment, backoff=0, limiter=None) as handler:
+            mock.fail(503, processed=True)
+            order: dict = (await handler.create_order(**ORDER)).json()
+            return order, len(handler.in_flight)
+
+    order, in_flight = run(main())
+
+    assert order.get("client_oid")
+    assert mock.statuses.get(400) == 1
+    assert len(mock._orders) == 1
+    assert in_flight == 0
+
+
+def test_async_rejection_is_raised(mock, credentials):
+    async def main():
+        async with aio.Orders(*credentials, environment=mock.environment, backoff=0, limiter=None) as handler:
+            mock.fail(400, message="Insufficient funds")
+
+            with raises(HTTPStatusError, match="Insufficient funds") as error:
+                await handler.create_order(**ORDER)
+
+            return error.value.response, len(handler.in_flight)
+
+    response, in_flight = run(main())
+
+    assert response.status_code == 400
+    assert response.json().get("message") == "Insufficient funds"
+    assert mock.requests.get("GET orders") is None
+    assert in_flight == 0
+
+
+def test_async_rejection_after_retry_is_resolved(mock, credentials):
+    async def main():
+        async with aio.Orders(*credentials, environment=mock.environment, backoff=0, limiter=None) as handler:
+            mock.fail(503)
+            mock.fail(400, message="Insufficient funds")
+
+            with raises(HTTPStatusError, match="Insufficient funds"):
+                await handler.create_order(**ORDER)
+
+    run(main())
+
+    # ambiguous after the retry, the lookup found nothing:
+    assert mock.requests.get("GET orders") == 1
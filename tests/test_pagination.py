@@ -0,0 +1,63 @@
+# -*- coding: UTF-8 -*-
+
+from asyncio import run
+from itertools import islice
+
+from pytest import fixture
+
+from coinbase_lib.exchange import Accounts, aio
+
+
+@fixture
+def accounts(mock, credentials) -> Accounts:
+    with Accounts(*credentials, environment=mock.environment, limiter=None) as handler:
+        yield handler
+
+
+@fixture
+def account_id(accounts) -> str:
+    return accounts.get_accounts().json()[0].get("id")
+
+
+def test_follows_the_cursors(mock, accounts, account_id):
+    entries: list = list(accounts.iter_account_ledger(account_id, limit=40))
+
+    # 250 entries: 7 pages of 40 and a last, empty one:
+    assert len(entries) == 250
+    assert len({entry.get("id") for entry in entries}) == 250
+    assert mock.requests.get("GET accounts") == 1 + 7 + 1
+    assert [entry.get("created_at") for entry in entries] == sorted((entry.get("created_at") for entry in entries), reverse=True)
+
+
+def test_pages_are_fetched_lazily(mock, accounts, account_id):
+    entries: list = list(islice(accounts.iter_account_ledger(account_id, limit=40), 50))
+
+    assert len(entries) == 50
+    assert mock.requests.get("GET accounts") == 1 + 2
+
+
+def test_watermark_stops_iteration(accounts, account_id):
+    entries: list = list(accounts.iter_account_ledger(account_id, limit=40))
+    seen: str = entries[99].get("created_at")
+
+    new: list = list(accounts.iter_account_ledger(account_id, limit=40, before=seen))
+
+    assert new == entries[:99]
+
+
+def test_models(mock, credentials, account_id):
+    with Accounts(*credentials, environment=mock.environment, limiter=None, models=True) as accounts:
+        entry = next(iter(accounts.iter_account_ledger(account_id, limit=10)))
+
+    assert entry.__class__.__name__ == "LedgerEntry"
+
+
+def test_async_follows_the_cursors(mock, credentials, account_id):
+    async def main() -> list:
+        async with aio.Accounts(*credentials, environment=mock.environment, limiter=None) as accounts:
+            return [entry async for entry in accounts.iter_account_ledger(account_id, limit=100)]
+
+    entries: list = run(main())
+
+    assert len(entries) == 250
+    assert len({entry.get("id") for entry in entries}) == 250
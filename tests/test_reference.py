@@ -0,0 +1,70 @@
+# -*- coding: UTF-8 -*-
+
+from typing import List
+
+from pytest import fixture, raises
+
+from coinbase_lib.exchange import ReferenceData
+from coinbase_lib.exchange.mock import _Market
+from coinbase_lib.exchange.reference import Change
+
+
+@fixture
+def changes() -> List[Change]:
+    return []
+
+
+@fixture
+def reference(mock, changes) -> ReferenceData:
+    return ReferenceData(callback=changes.append, environment=mock.environment).load()
+
+
+def test_lookups(reference):
+    assert reference.product("BTC-USD").quote_currency == "USD"
+    assert reference.currency("BTC").id == "BTC"
+    assert reference.updated("products") is not None
+
+    with raises(KeyError):
+        reference.product("XYZ-USD")
+
+
+def test_unchanged_refresh(mock, reference, changes):
+    assert reference.refresh("products") == []
+    assert changes == []
+
+
+def test_change_events(mock, reference, changes):
+    mock._markets.pop("LTC-USD")
+    mock._markets.update({"ADA-USD": _Market("ADA-USD", 0.5, "0.0001", "0.01", "1")})
+    mock._markets.get("BTC-USD").quote_increment = "0.1"
+
+    events: List[Change] = reference.refresh("products")
+
+    assert {(change.id, change.type) for change in events} == {
+        ("LTC-USD", "removed"), ("ADA-USD", "added"), ("BTC-USD", "changed")
+    }
+    assert events == changes
+
+    change: Change = next(change for change in events if change.type == "changed")
+
+    assert str(change.old.quote_increment) == "0.01"
+    assert str(change.new.quote_increment) == "0.1"
+    assert reference.product("ADA-USD").id == "ADA-USD"
+
+    with raises(KeyError):
+        reference.product("LTC-USD")
+
+
+def test_failing_callback(mock, changes):
+    def callback(change: Change):
+        raise RuntimeError(change)
+
+    reference: ReferenceData = ReferenceData(callback=callback, environment=mock.environment).load()
+    mock._markets.pop("LTC-USD")
+
+    assert len(reference.refresh("products")) == 1
+
+
+def test_unknown_kind(reference):
+    with raises(ValueError):
+        reference.refresh("fees")
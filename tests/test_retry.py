@@ -0,0 +1,111 @@
+# -*- coding: UTF-8 -*-
+
+from asyncio import run
+
+from pytest import fixture, raises
+from requests import HTTPError
+
+from coinbase_lib.exchange import Accounts, Conversions, Products, aio
+from coinbase_lib.metrics import Metrics
+
+
+@fixture
+def metrics() -> Metrics:
+    return Metrics()
+
+
+@fixture
+def products(mock, metrics) -> Products:
+    with Products(environment=mock.environment, backoff=0, limiter=None, cache=False, metrics=metrics) as handler:
+        yield handler
+
+
+def test_get_is_retried(mock, products, metrics):
+    mock.fail(503, count=2)
+
+    assert products.get_product_ticker("BTC-USD").status_code == 200
+    assert mock.statuses.get(503) == 2
+    assert metrics.snapshot().get("products/ticker").get("retries") == 2
+
+
+def test_last_response_is_returned(mock, products):
+    mock.fail(503, count=10)
+
+    with raises(HTTPError) as error:
+        products.get_product_ticker("BTC-USD")
+
+    # the first attempt and 3 retries:
+    assert error.value.response.status_code == 503
+    assert mock.statuses.get(503) == 4
+
+
+def test_post_without_client_oid_is_not_retried(mock, credentials):
+    mock.fail(503)
+
+    with Conversions(*credentials, environment=mock.environment, backoff=0, limiter=None) as conversions:
+        with raises(HTTPError):
+            conversions.convert_currency("USD", "USDC", "10")
+
+    assert mock.statuses.get(503) == 1
+    assert mock.requests.get("POST conversions") == 1
+
+
+def test_retried_429_are_throttled(mock, products, metrics):
+    mock.fail(429, count=2)
+    products.get_product_ticker("BTC-USD")
+
+    counters: dict = metrics.snapshot().get("products/ticker")
+
+    assert counters.get("throttled") == 2
+    assert counters.get("errors") == 0
+
+
+def test_async_get_is_retried(mock, metrics):
+    async def main() -> int:
+        async with aio.Products(environment=mock.environment, backoff=0, limiter=None, metrics=metrics) as products:
+            return (await products.get_product_ticker("BTC-USD")).status_code
+
+    mock.fail(429)
+    mock.fail(503)
+
+    assert run(main()) == 200
+    assert metrics.snapshot().get("products/ticker").get("retries") == 2
+    assert metrics.snapshot().get("products/ticker").get("throttled") == 1
+
+
+def test_private_get_is_retried(mock, credentials):
+    mock.fail(502)
+
+    with Accounts(*credentials, environment=mock.environment, backoff=0, limiter=None) as accounts:
+        assert accounts.get_accounts().status_code == 200
+
+    assert mock.statuses.get(502) == 1
+
+
+def test_every_attempt_takes_a_token(mock, limiter):
+    mock.fail(429, count=2)
+
+    with Products(environment=mock.environment, backoff=0, limiter=limiter, cache=False) as products:
+        assert products.get_product_ticker("BTC-USD").status_code == 200
+
+    assert mock.requests.get("GET products") == 3
+    assert limiter.tokens.get("public") == 3
+
+
+def test_async_every_attempt_takes_a_token(mock, limiter):
+    async def main() -> int:
+        async with aio.Products(environment=mock.environment, backoff=0, limiter=limiter, cache=False) as products:
+            return (await products.get_product_ticker("BTC-USD")).status_code
+
+    mock.fail(429, count=2)
+
+    assert run(main()) == 200
+    assert mock.requests.get("GET products") == 3
+    assert limiter.tokens.get("public") == 3
+
+
+def test_str_body_is_counted_in_bytes(products, metrics):
+    # 3 bytes once encoded, the body is sent as is:
+    products._session.post(url=products._url.join("products"), data="€")
+
+    assert metrics.snapshot().get("products").get("bytes_sent") == 3
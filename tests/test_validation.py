@@ -0,0 +1,101 @@
+# -*- coding: UTF-8 -*-
+
+from pytest import fixture, mark, raises
+
+from coinbase_lib.exchange import OrderError, OrderValidator, ReferenceData
+from coinbase_lib.exchange.models import Product
+
+
+@fixture
+def reference(mock) -> ReferenceData:
+    return ReferenceData(environment=mock.environment)
+
+
+@fixture
+def validator(reference) -> OrderValidator:
+    return OrderValidator(reference)
+
+
+def product(**changes) -> Product:
+    payload: dict = {
+        "id": "BTC-USD",
+        "base_currency": "BTC",
+        "quote_currency": "USD",
+        "quote_increment": "0.01",
+        "base_increment": "0.00000001",
+        "min_market_funds": "1",
+        "status": "online",
+    }
+    payload.update(changes)
+    return Product(payload)
+
+
+@mark.parametrize("side, price", [("buy", "100.12"), ("sell", "100.13")])
+def test_price_rounded_away_from_the_book(validator, side, price):
+    order: dict = validator.validate({"product_id": "BTC-USD", "side": side, "price": 100.123, "size": "0.5"})
+
+    assert order.get("price") == price
+
+
+def test_size_and_funds_rounded_down(validator):
+    limit: dict = validator.validate({"product_id": "BTC-USD", "side": "buy", "price": "100", "size": "0.123456789"})
+    market: dict = validator.validate({"product_id": "BTC-USD", "side": "buy", "type": "market", "funds": "10.019"})
+
+    assert limit.get("size") == "0.12345678"
+    assert market.get("funds") == "10.01"
+
+
+def test_stop_price_rounded_to_the_nearest(validator):
+    order: dict = validator.validate({
+        "product_id": "BTC-USD", "side": "sell", "price": "100", "size": "1", "stop": "loss", "stop_price": "100.006"
+    })
+
+    assert order.get("stop_price") == "100.01"
+
+
+def test_order_is_copied(validator):
+    order: dict = {"product_id": "BTC-USD", "side": "buy", "price": "100.123", "size": "1"}
+
+    assert validator.validate(order) is not order
+    assert order.get("price") == "100.123"
+
+
+def test_off_increment_rejected_without_rounding(reference):
+    validator: OrderValidator = OrderValidator(reference, rounding=False)
+
+    with raises(OrderError, match="not a multiple"):
+        validator.validate({"product_id": "BTC-USD", "side": "buy", "price": "100.123", "size": "1"})
+
+
+@mark.parametrize("order, message", [
+    ({"side": "buy", "price": "100", "size": "1"}, "Missing product_id"),
+    ({"product_id": "XYZ-USD", "side": "buy", "price": "100", "size": "1"}, "Unknown product"),
+    ({"product_id": "BTC-USD", "side": "buy", "price": "100"}, "need a price and a size"),
+    ({"product_id": "BTC-USD", "side": "buy", "type": "market"}, "need a size or funds"),
+    ({"product_id": "BTC-USD", "side": "buy", "price": "-1", "size": "1"}, "Invalid price"),
+    ({"product_id": "BTC-USD", "side": "buy", "price": "abc", "size": "1"}, "Invalid price"),
+    ({"product_id": "BTC-USD", "side": "buy", "price": "100", "size": "0.000000001"}, "below the minimum"),
+    ({"product_id": "BTC-USD", "side": "buy", "price": "100", "size": "0.001"}, "below the minimum of 1"),
+    ({"product_id": "BTC-USD", "side": "buy", "type": "market", "funds": "0.5"}, "below the minimum of 1"),
+    ({"product_id": "BTC-USD", "side": "buy", "price": "100", "size": "1", "post_only": True, "time_in_force": "IOC"},
+     "Post only"),
+])
+def test_rejections(validator, order, message):
+    with raises(OrderError, match=message) as error:
+        validator.validate(order)
+
+    assert error.value.order is not None
+
+
+@mark.parametrize("changes, order, message", [
+    ({"trading_disabled": True}, {"price": "100", "size": "1"}, "Trading is disabled"),
+    ({"status": "delisted"}, {"price": "100", "size": "1"}, "Trading is disabled"),
+    ({"cancel_only": True}, {"price": "100", "size": "1"}, "only accepts cancel"),
+    ({"limit_only": True}, {"type": "market", "size": "1"}, "doesn't accept market"),
+    ({"max_market_funds": "1000"}, {"type": "market", "funds": "1001"}, "above the maximum"),
+])
+def test_product_constraints(changes, order, message):
+    validator: OrderValidator = OrderValidator({"BTC-USD": product(**changes)})
+
+    with raises(OrderError, match=message):
+        validator.validate({"product_id": "BTC-USD", "side": "buy", **order})